@@ -1,6 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import analyze, report
+from fastapi.responses import Response
+from api.response_cache import get_response_cache
+from api.routers import admin, analyze, backtest, live, report
+from core.data_loader import get_provider
+from core.llm import get_llm
+from core.metrics import CONTENT_TYPE, REGISTRY, CallbackMetric
+from core.model_registry import get_registry
+from core.report_jobs import get_report_jobs
+from core import config
 
 app = FastAPI(title="StockGuard AI API")
 
@@ -14,7 +22,51 @@ app.add_middleware(
 
 app.include_router(analyze.router, prefix="/api")
 app.include_router(report.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(live.router, prefix="/api")
+app.include_router(backtest.router, prefix="/api")
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+def _provider_stat(name: str):
+    provider = get_provider()
+    stats = provider.stats() if hasattr(provider, 'stats') else {}
+    return [({}, stats[name])] if name in stats else []
+
+
+# Existing counters, read at scrape time
+REGISTRY.register(CallbackMetric(
+    'stockguard_model_fits_total', 'Isolation Forest fits and score-only reuses by the model registry.', 'counter',
+    lambda: [({'kind': 'fit'}, get_registry().stats()['fits']),
+             ({'kind': 'score_only'}, get_registry().stats()['score_only'])]))
+REGISTRY.register(CallbackMetric(
+    'stockguard_provider_bytes_total', 'Bytes downloaded by the data provider (OHLCV cache misses and gaps).', 'counter',
+    lambda: _provider_stat('bytes_fetched')))
+REGISTRY.register(CallbackMetric(
+    'stockguard_provider_rows_total', 'Rows downloaded by the data provider (OHLCV cache misses and gaps).', 'counter',
+    lambda: _provider_stat('rows_fetched')))
+REGISTRY.register(CallbackMetric(
+    'stockguard_report_jobs_active', 'Report jobs currently queued or rendering.', 'gauge',
+    lambda: [({'state': name}, get_report_jobs().stats()[name]) for name in ('queued', 'running')]))
+REGISTRY.register(CallbackMetric(
+    'stockguard_report_jobs_finished_total', 'Report jobs finished, by outcome.', 'counter',
+    lambda: [({'state': name}, get_report_jobs().stats()[name]) for name in ('completed', 'failed')]))
+REGISTRY.register(CallbackMetric(
+    'stockguard_response_cache_lookups_total', 'Response cache lookups by result.', 'counter',
+    lambda: [({'result': name}, get_response_cache().stats()[name]) for name in ('hits', 'disk_hits', 'misses')]))
+
+REGISTRY.register(CallbackMetric(
+    'stockguard_llm_answers_total', 'Analyst texts by source: model, response cache, coalesced or algorithmic fallback.', 'counter',
+    lambda: [({'source': 'model'}, get_llm().stats()['generated']),
+             ({'source': 'cache'}, get_llm().stats()['cache']['hits']),
+             ({'source': 'coalesced'}, get_llm().stats()['coalesced']),
+             ({'source': 'fallback'}, get_llm().stats()['fallbacks'])]))
+
+@app.get("/metrics")
+def metrics():
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import time
+import joblib
+import pandas as pd
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi.responses import Response
+from core.ttl_cache import TTLCache
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag of a response body (the encoded bytes, so each encoding gets its own tag).
+    """
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 requires for this header).
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    if '*' in tags:
+        return True
+    return any(tag[2:] == etag if tag.startswith('W/') else tag == etag for tag in tags)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    media_type: str
+    etag: str
+    expires_at: float  # wall-clock time
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: Response, ttl: float) -> "CachedResponse":
+        headers = {k: v for k, v in response.headers.items() if k.lower() == 'content-encoding'}
+        return cls(body=bytes(response.body), media_type=response.media_type, etag=make_etag(response.body),
+                   expires_at=time.time() + ttl, headers=headers)
+
+    def to_response(self, if_none_match: Optional[str] = None, cache_status: str = 'MISS') -> Response:
+        """
+        The cached response, or an empty 304 when the client already holds this ETag.
+        """
+        max_age = max(0, int(self.expires_at - time.time()))
+        headers = {'ETag': self.etag, 'Cache-Control': f"private, max-age={max_age}", 'X-Cache': cache_status}
+        if etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers={**self.headers, **headers})
+
+
+class ResponseCache:
+    """
+    Bounded cache of rendered /analyze responses, in memory with an optional disk tier.
+
+    Ranges that end before the current session cannot change and are kept for
+    `ttl_historical` seconds; ranges that include today expire after `ttl_live`.
+    Memory is bounded by entry count and total body bytes (LRU eviction).
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 ttl_historical: float = 86400.0, ttl_live: float = 60.0, persist_dir: Optional[str] = None,
+                 today: Optional[Callable[[], date]] = None):
+        self.cache = TTLCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=lambda entry: len(entry.body))
+        self.ttl_historical = ttl_historical
+        self.ttl_live = ttl_live
+        self.persist_dir = persist_dir
+        self._today = today or date.today
+        self.disk_hits = 0
+        self.disk_writes = 0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def ttl_for(self, end_date: str) -> float:
+        """
+        Historical TTL when the range ends before today, live TTL otherwise.
+        """
+        try:
+            historical = pd.Timestamp(end_date).date() < self._today()
+        except (ValueError, TypeError):
+            historical = False
+        return self.ttl_historical if historical else self.ttl_live
+
+    def _path(self, key: Hashable) -> str:
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.persist_dir, f"{name}.joblib")
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self.cache.get(key)
+        if entry is not None or not self.persist_dir:
+            return entry
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        entry = joblib.load(path)
+        remaining = entry.expires_at - time.time()
+        if remaining <= 0:
+            os.remove(path)
+            return None
+        self.cache.set(key, entry, ttl=remaining)
+        self.disk_hits += 1
+        return entry
+
+    def put(self, key: Hashable, response: Response, end_date: str) -> CachedResponse:
+        """
+        Stores a rendered response with the TTL for its range; returns the cache entry.
+        """
+        ttl = self.ttl_for(end_date)
+        entry = CachedResponse.from_response(response, ttl)
+        self.cache.set(key, entry, ttl=ttl)
+        if self.persist_dir:
+            path = self._path(key)
+            joblib.dump(entry, path + '.tmp')
+            os.replace(path + '.tmp', path)
+            self.disk_writes += 1
+        return entry
+
+    def clear(self) -> None:
+        self.cache.clear()
+        if self.persist_dir:
+            for name in os.listdir(self.persist_dir):
+                if name.endswith('.joblib'):
+                    os.remove(os.path.join(self.persist_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        # Memory misses served from disk count as hits overall
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + self.disk_hits) / lookups if lookups else 0.0
+        stats.update({'disk_hits': self.disk_hits, 'disk_writes': self.disk_writes,
+                      'ttl_historical': self.ttl_historical, 'ttl_live': self.ttl_live})
+        return stats
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Returns the process-wide response cache, built from configuration on first use.
+    """
+    global _cache
+    if _cache is None:
+        from core import config
+        _cache = ResponseCache(
+            max_entries=config.RESPONSE_CACHE_SIZE,
+            max_bytes=int(config.RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+            ttl_historical=config.RESPONSE_CACHE_TTL_HISTORICAL,
+            ttl_live=config.RESPONSE_CACHE_TTL_LIVE,
+            persist_dir=config.RESPONSE_CACHE_DIR or None,
+        )
+    return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """
+    Replaces the process-wide response cache (None rebuilds it from configuration).
+    """
+    global _cache
+    _cache = cache
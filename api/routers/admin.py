@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from api.response_cache import get_response_cache
+from api.routers.analyze import analysis_flight
+from core.analysis_store import get_analysis_store
+from core.data_loader import get_provider
+from core.live import get_monitor
+from core.llm import get_llm
+from core.model_registry import get_registry
+from core.report_jobs import get_report_jobs
+from core import config
+
+router = APIRouter()
+
+
+@router.get("/admin/stats")
+def cache_stats():
+    """
+    Cache and coalescing counters: response cache size, hit ratio and evictions,
+    in-flight request coalescing, the anomaly model registry, the OHLCV cache and
+    the report job queue (depth, render times), the analysis handle store, the
+    live monitor (warm tickers, subscribers, events published) and the LLM service
+    (calls, cache hits, timeouts and fallbacks).
+    """
+    provider = get_provider()
+    return {
+        "response_cache": dict(get_response_cache().stats(), enabled=config.RESPONSE_CACHE_ENABLED),
+        "coalescing": analysis_flight.stats(),
+        "model_registry": dict(get_registry().stats(), enabled=config.MODEL_CACHE_ENABLED),
+        "data_cache": provider.stats() if hasattr(provider, 'stats') else None,
+        "report_jobs": get_report_jobs().stats(),
+        "analysis_store": get_analysis_store().stats(),
+        "live": get_monitor().stats(),
+        "llm": get_llm().stats(),
+    }
+
+
+@router.delete("/admin/response-cache")
+def clear_response_cache():
+    cache = get_response_cache()
+    removed = len(cache.cache)
+    cache.clear()
+    return {"cleared": removed}
@@ -1,30 +1,255 @@
-from fastapi import APIRouter, HTTPException
-from api.schemas import AnalysisRequest, AnalysisResponse
-from core.data_loader import fetch_data
-from core.features import add_technical_indicators
-from core.anomaly import detect_anomalies
-from core.llm import MockLLM
-from core.llm import MockLLM
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from api.response_cache import CachedResponse, get_response_cache
+from api.serialization import prepare_frame, render_analysis, select_fields, to_columns, validate_options, widen_float32
+from api.streaming import STREAM_PROTOCOLS, encode_events
+from api.schemas import AnalysisRequest, AnalysisResponse, BatchAnalysisRequest, BatchAnalysisResponse, BatchAnalysisItem
+from api.schemas import UniverseAnalysisRequest, UniverseAnalysisResponse, UniverseTickerResult, UniversePoint
+from api.schemas import IndicatorsRequest, IndicatorsResponse, StreamAnalysisRequest
+from core.data_loader import afetch_data, fetch_data_many, get_provider
+from core.features import INDICATOR_COLUMNS, SIGNAL_COLUMNS, add_technical_indicators
+from core.intervals import DAILY, get_interval
+from core.anomaly import detect_anomalies, detect_universe_anomalies
+from core.walk_forward import MODES, detect_anomalies_walk_forward
+from core.detectors import ISOLATION_FOREST, METHODS, contamination_thresholds
+from core.llm import get_llm, market_context
+from core.pipeline import ANALYSIS_OUTPUTS, analyze_frames, compute_features, map_frames
+from core.planner import RangePlan, plan_range
+from core.singleflight import SingleFlight
+from core.analysis_store import StoredAnalysis, get_analysis_store, handle_for
+from core.metrics import FRAME_BYTES, ROWS_PROCESSED, StageTimer
+from core import config
 import json
 import pandas as pd
 
 router = APIRouter()
-llm = MockLLM()
-
-from core.utils import get_lookback_date
+# Coalesces identical in-flight /analyze requests (ticker, range, contamination, mode, interval, method)
+analysis_flight = SingleFlight()
+# Stand-in for callers that are not instrumented (batch endpoint)
+_untimed = StageTimer('analyze', enabled=False)
+# Most contamination levels one request can ask thresholds for
+MAX_LEVELS = 100
 
 @router.post("/analyze", response_model=AnalysisResponse)
-def analyze_stock(request: AnalysisRequest):
-    # 1. Fetch Data with Lookback Buffer (365 days for MA200 stability)
-    buffered_start_date = get_lookback_date(request.start_date, 365)
-    
-    df = fetch_data(request.ticker, buffered_start_date, request.end_date)
+async def analyze_stock(request: AnalysisRequest, if_none_match: Optional[str] = Header(None)):
+    try:
+        validate_options(request.format, request.compression, request.precision)
+        if request.fields:
+            select_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    _check_mode(request.mode, request.method)
+    _check_interval(request.interval)
+    _check_levels(request.levels, request.mode)
+
+    timer = StageTimer('analyze')
+
+    # 0. Rendered responses are cached per normalized request
+    ticker, start_date, end_date, contamination, mode, interval, method = key = _analysis_key(
+        request.ticker, request.start_date, request.end_date, request.contamination, request.mode, request.interval,
+        request.method)
+    cache = get_response_cache() if config.RESPONSE_CACHE_ENABLED else None
+    response_key = key + (request.language, request.format, tuple(request.fields or ()), request.precision, request.compression,
+                          tuple(request.levels or ()))
+    with timer.stage('cache'):
+        cached = cache.get(response_key) if cache is not None else None
+    # A cached body is only valid while the analysis handle it carries is still stored
+    if cached is not None and handle_for(key + (request.language,)) in get_analysis_store():
+        response = cached.to_response(if_none_match, cache_status='HIT')
+        timer.apply(response)
+        return response
+
+    # 1-3. Identical concurrent requests share one fetch and model run
+    started = time.perf_counter()
+    df = await analysis_flight.do(key, lambda: _run_analysis(ticker, start_date, end_date, contamination, timer, mode, interval,
+                                                                    method))
+    if 'fetch' not in timer.stages:
+        # Waited on another request's run
+        timer.record('coalesced', time.perf_counter() - started)
+
+    # 4-6. Per request (language, format); the shared frame is not modified
+    response, fallback = await asyncio.to_thread(_respond, request, df, timer)
+    # A timed-out model's canned text is not cached, so the next request asks the model again
+    if cache is not None and not fallback:
+        entry = cache.put(response_key, response, end_date)
+    else:
+        entry = CachedResponse.from_response(response, ttl=0)
+    response = entry.to_response(if_none_match)
+    timer.apply(response)
+    return response
+
+
+@router.post("/analyze/stream")
+async def analyze_stock_stream(request: StreamAnalysisRequest):
+    """
+    Streaming /analyze: a 'meta' event, 'progress' events as the pipeline advances
+    (fetched, features, anomalies), the rows in 'rows' events of `chunk_size` rows
+    (columnar), then the 'summary'. Only one chunk is serialized at a time, so the
+    response never exists as a whole. Failures after the stream started arrive as an
+    'error' event carrying the status code the plain endpoint would have returned.
+    """
+    try:
+        validate_options('columnar', None, request.precision)
+        fields = select_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    _check_mode(request.mode, request.method)
+    _check_interval(request.interval)
+    _check_levels(request.levels, request.mode)
+    if request.protocol not in STREAM_PROTOCOLS:
+        raise HTTPException(status_code=422, detail=f"Unknown protocol '{request.protocol}'. Use one of: {', '.join(STREAM_PROTOCOLS)}.")
+    if not 1 <= request.chunk_size <= config.STREAM_MAX_CHUNK_ROWS:
+        raise HTTPException(status_code=422, detail=f"chunk_size must be between 1 and {config.STREAM_MAX_CHUNK_ROWS}.")
+
+    events = _analysis_events(request, fields, StageTimer('analyze_stream'))
+    return StreamingResponse(encode_events(events, request.protocol), media_type=STREAM_PROTOCOLS[request.protocol],
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+async def _analysis_events(request: StreamAnalysisRequest, fields: List[str], timer: StageTimer):
+    ticker, start_date, end_date, contamination, mode, interval, method = key = _analysis_key(
+        request.ticker, request.start_date, request.end_date, request.contamination, request.mode, request.interval,
+        request.method)
+    yield 'meta', {'ticker': request.ticker, 'start_date': start_date, 'end_date': end_date, 'interval': interval,
+                   'mode': mode, 'method': method, 'fields': fields, 'chunk_size': request.chunk_size}
+    try:
+        df = await _fetch_history(ticker, start_date, end_date, timer, mode, interval)
+        yield 'progress', {'stage': 'fetched', 'rows': len(df)}
+        df = await asyncio.to_thread(_add_features, df, timer)
+        yield 'progress', {'stage': 'features', 'rows': len(df)}
+        df = await asyncio.to_thread(_detect, _model_key(ticker, interval), df, contamination, timer, mode, method)
+        yield 'progress', {'stage': 'anomalies', 'rows': len(df), 'anomalies': int((df['anomaly'] == -1).sum())}
+
+        df_filtered, anomalies, llm_result, handle = await asyncio.to_thread(
+            _summarize, request.ticker, df, request.start_date, request.end_date, request.language,
+            key + (request.language,), timer)
+    except HTTPException as e:
+        yield 'error', {'status_code': e.status_code, 'detail': e.detail}
+        return
+
+    # One chunk at a time: prepared, encoded and handed to the server before the next
+    total, serialize = len(df_filtered), 0.0
+    for offset in range(0, total, request.chunk_size):
+        started = time.perf_counter()
+        chunk = widen_float32(prepare_frame(df_filtered.iloc[offset:offset + request.chunk_size], fields, request.precision),
+                              request.precision)
+        payload = {'offset': offset, 'total': total, 'data': to_columns(chunk)}
+        serialize += time.perf_counter() - started
+        yield 'rows', payload
+    timer.record('serialize', serialize)
+
+    yield 'summary', {
+        'ticker': request.ticker,
+        'handle': handle,
+        'rows': total,
+        'anomalies_count': len(anomalies),
+        'llm_analysis': llm_result['text'],
+        'sentiment': llm_result['sentiment'],
+        'action': llm_result['action'],
+        'thresholds': _thresholds(df, request.levels),
+    }
+    timer.finish()
+
+
+def _check_mode(mode: str, method: str = ISOLATION_FOREST) -> None:
+    if mode not in MODES:
+        raise HTTPException(status_code=422, detail=f"Unknown mode '{mode}'. Use one of: {', '.join(MODES)}.")
+    _check_method(method)
+    if mode == 'walk_forward' and method != ISOLATION_FOREST:
+        raise HTTPException(status_code=422, detail="Walk-forward mode refits Isolation Forests; use method 'isolation_forest'.")
+
+
+def _check_method(method: str) -> None:
+    if method not in METHODS:
+        raise HTTPException(status_code=422, detail=f"Unknown method '{method}'. Use one of: {', '.join(METHODS)}.")
+
+
+def _check_levels(levels: Optional[List[float]], mode: str) -> None:
+    if not levels:
+        return
+    if mode == 'walk_forward':
+        raise HTTPException(status_code=422, detail="Walk-forward mode fits a model per window; levels need one fit over the range.")
+    if len(levels) > MAX_LEVELS:
+        raise HTTPException(status_code=422, detail=f"Too many levels ({len(levels)}). Maximum is {MAX_LEVELS}.")
+    if not all(0 < level <= 0.5 for level in levels):
+        raise HTTPException(status_code=422, detail="Contamination levels must be in (0, 0.5].")
+
+
+def _thresholds(df: pd.DataFrame, levels: Optional[List[float]]) -> Optional[dict]:
+    # Over every scored row (also those before start_date), as the model's own threshold
+    if not levels:
+        return None
+    thresholds = contamination_thresholds(df['anomaly_raw'], [round(float(level), 6) for level in levels])
+    return {f"{level:g}": threshold for level, threshold in thresholds.items()}
+
+
+def _normalize_date(value: str) -> str:
+    try:
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    except (ValueError, TypeError):
+        return value
+
+
+def _analysis_key(ticker: str, start_date: str, end_date: str, contamination: float, mode: str = 'full',
+                  interval: str = DAILY, method: str = ISOLATION_FOREST) -> Tuple[str, str, str, float, str, str, str]:
+    return (ticker.strip().upper(), _normalize_date(start_date), _normalize_date(end_date), round(float(contamination), 6),
+            mode, interval, method)
+
+
+def _check_interval(interval: str) -> None:
+    try:
+        get_interval(interval)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if interval not in get_provider().intervals:
+        raise HTTPException(status_code=422, detail=f"Interval '{interval}' is not available from the configured data provider.")
+
+
+async def _run_analysis(ticker: str, start_date: str, end_date: str, contamination: float,
+                        timer: Optional[StageTimer] = None, mode: str = 'full', interval: str = DAILY,
+                        method: str = ISOLATION_FOREST) -> pd.DataFrame:
+    df = await _fetch_history(ticker, start_date, end_date, timer, mode, interval)
+    # 2-3. CPU-bound, kept off the event loop
+    return await asyncio.to_thread(_compute_analysis, _model_key(ticker, interval), df, contamination, timer, mode, method)
+
+
+def _model_key(ticker: str, interval: str) -> str:
+    # Fitted models are kept per ticker and interval
+    return ticker if interval == DAILY else f"{ticker}@{interval}"
+
+
+async def _fetch_history(ticker: str, start_date: str, end_date: str, timer: Optional[StageTimer] = None,
+                         mode: str = 'full', interval: str = DAILY) -> pd.DataFrame:
+    timer = timer or _untimed
+    # 1. Fetch Data with the warm-up the analysis indicators need (in bars of the interval);
+    # walk-forward also needs a training window before the first scored bar
+    extra = config.WALK_FORWARD_WINDOW if mode == 'walk_forward' else 0
+    plan = plan_range(start_date, end_date, ANALYSIS_OUTPUTS, extra=extra, interval=interval)
+
+    with timer.stage('fetch'):
+        df = await afetch_data(ticker, plan.fetch_start, end_date, interval=interval)
     if df is None:
         raise HTTPException(status_code=404, detail="Stock data not found")
-    
+    if timer.enabled:
+        timer.count(FRAME_BYTES, int(df.memory_usage(deep=False).sum()))
+        timer.count(ROWS_PROCESSED, len(df))
+    return df
+
+
+def _compute_analysis(ticker: str, df: pd.DataFrame, contamination: float, timer: Optional[StageTimer] = None,
+                      mode: str = 'full', method: str = ISOLATION_FOREST) -> pd.DataFrame:
+    return _detect(ticker, _add_features(df, timer), contamination, timer, mode, method)
+
+
+def _add_features(df: pd.DataFrame, timer: Optional[StageTimer] = None) -> pd.DataFrame:
+    timer = timer or _untimed
     # 2. Add Features
     try:
-        df = add_technical_indicators(df)
+        with timer.stage('features'):
+            df = add_technical_indicators(df, outputs=ANALYSIS_OUTPUTS)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
@@ -32,47 +257,279 @@ def analyze_stock(request: AnalysisRequest):
         
     if df.empty:
         raise HTTPException(status_code=422, detail="Starting data was insufficient to generate technical indicators (requires > 200 days of history).")
-        
+    return df
+
+
+def _detect(ticker: str, df: pd.DataFrame, contamination: float, timer: Optional[StageTimer] = None,
+            mode: str = 'full', method: str = ISOLATION_FOREST) -> pd.DataFrame:
+    timer = timer or _untimed
     # 3. Detect Anomalies
     try:
-        df = detect_anomalies(df, contamination=request.contamination)
+        with timer.stage('anomalies'):
+            if mode == 'walk_forward':
+                return detect_anomalies_walk_forward(df, contamination=contamination)
+            return detect_anomalies(df, contamination=contamination, ticker=ticker, method=method)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Anomaly detection failed: {str(e)}")
-    
-    # 4. Filter Anomalies for LLM
-    # FIRST, filter data back to the requested user range
-    # Ensure date column is datetime for comparison
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-        
-    mask = (df['date'] >= pd.to_datetime(request.start_date)) & (df['date'] <= pd.to_datetime(request.end_date))
+
+
+def _respond(request: AnalysisRequest, df: pd.DataFrame, timer: Optional[StageTimer] = None) -> Tuple[Response, bool]:
+    """
+    Renders the response; the flag tells whether the analyst text is the fallback one.
+    """
+    timer = timer or _untimed
+    handle_key = _analysis_key(request.ticker, request.start_date, request.end_date, request.contamination,
+                               request.mode, request.interval, request.method) + (request.language,)
+
+    thresholds = _thresholds(df, request.levels)
+    df_filtered, anomalies, llm_result, handle = _summarize(request.ticker, df, request.start_date, request.end_date,
+                                                            request.language, handle_key, timer)
+    fallback = llm_result.get('fallback', False)
+
+    # Default shape goes through the response model unchanged
+    if request.format == 'records' and not (request.fields or request.precision is not None or request.compression):
+        result = _response_model(request.ticker, df_filtered, anomalies, llm_result, handle, thresholds, timer)
+        with timer.stage('serialize'):
+            return Response(content=result.model_dump_json(), media_type='application/json'), fallback
+
+    summary = {
+        'ticker': request.ticker,
+        'handle': handle,
+        'anomalies_count': len(anomalies),
+        'llm_analysis': llm_result['text'],
+        'sentiment': llm_result['sentiment'],
+        'action': llm_result['action'],
+    }
+    if thresholds is not None:
+        summary['thresholds'] = thresholds
+    with timer.stage('serialize'):
+        return render_analysis(df_filtered, summary, fmt=request.format, fields=request.fields,
+                               precision=request.precision, compression=request.compression), fallback
+
+
+def _filter_range(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    # Ensure date column is datetime for comparison (without modifying df, which may be shared)
+    dates = pd.to_datetime(df['date'])
+    mask = (dates >= pd.to_datetime(start_date)) & (dates <= pd.to_datetime(end_date))
     df_filtered = df.loc[mask].copy()
-    
+    df_filtered['date'] = dates[mask]
+
     if df_filtered.empty:
          # Fallback if filtering removed everything (e.g. data ends before start date)
          raise HTTPException(status_code=422, detail="No data available for the requested specific period (after processing).")
+    return df_filtered
+
+
+def _summarize(ticker: str, df: pd.DataFrame, start_date: str, end_date: str, language: str,
+               handle_key: Optional[Tuple] = None, timer: Optional[StageTimer] = None,
+               llm_result: Optional[dict] = None):
+    timer = timer or _untimed
+    # 4. Filter Anomalies for LLM
+    # FIRST, filter data back to the requested user range
+    with timer.stage('filter'):
+        df_filtered = _filter_range(df, start_date, end_date)
 
     # Use filtered data for LLM and Response
     anomalies = df_filtered[df_filtered['anomaly'] == -1]
     
-    # 5. Generate Analysis
+    # 5. Generate Analysis (unless generated already, e.g. batched with other tickers)
     # Get latest data point for context
     latest_data = df_filtered.iloc[-1]
     
-    llm_result = llm.generate_analysis(request.ticker, anomalies, latest_data, language=request.language)
-    
-    # 6. Prepare Response
+    if llm_result is None:
+        with timer.stage('llm'):
+            llm_result = get_llm().analyze(market_context(ticker, anomalies, latest_data, language))
+
     # Convert date to string for JSON serialization
     df_filtered['date'] = df_filtered['date'].astype(str)
-    
+
+    # Keep the result server-side so follow-up calls (reports) can reference it by handle
+    handle = None
+    if handle_key is not None:
+        handle = get_analysis_store().put(handle_key, StoredAnalysis(
+            ticker=handle_key[0], data=df_filtered, llm_analysis=llm_result['text'],
+            sentiment=llm_result['sentiment'], action=llm_result['action'],
+        ))
+    return df_filtered, anomalies, llm_result, handle
+
+
+def _build_response(ticker: str, df: pd.DataFrame, start_date: str, end_date: str, language: str,
+                    handle_key: Optional[Tuple] = None, timer: Optional[StageTimer] = None,
+                    thresholds: Optional[dict] = None, llm_result: Optional[dict] = None) -> AnalysisResponse:
+    timer = timer or _untimed
+    df_filtered, anomalies, llm_result, handle = _summarize(ticker, df, start_date, end_date, language, handle_key, timer,
+                                                            llm_result)
+    return _response_model(ticker, df_filtered, anomalies, llm_result, handle, thresholds, timer)
+
+
+def _response_model(ticker: str, df_filtered: pd.DataFrame, anomalies: pd.DataFrame, llm_result: dict,
+                    handle: Optional[str] = None, thresholds: Optional[dict] = None,
+                    timer: Optional[StageTimer] = None) -> AnalysisResponse:
+    timer = timer or _untimed
+    # 6. Prepare Response
     # Convert dataframe to list of dicts
-    data_points = df_filtered.to_dict(orient='records')
+    with timer.stage('serialize'):
+        data_points = widen_float32(df_filtered).to_dict(orient='records')
     
     return AnalysisResponse(
-        ticker=request.ticker,
+        ticker=ticker,
         data=data_points,
         anomalies_count=len(anomalies),
         llm_analysis=llm_result['text'],
         sentiment=llm_result['sentiment'],
-        action=llm_result['action']
+        action=llm_result['action'],
+        handle=handle,
+        thresholds=thresholds
+    )
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+def analyze_batch(request: BatchAnalysisRequest):
+    tickers = list(dict.fromkeys(request.tickers))
+    if not tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(tickers) > config.BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"Too many tickers ({len(tickers)}). Maximum is {config.BATCH_MAX_TICKERS}.")
+    _check_method(request.method)
+
+    # 1. One grouped fetch for the whole watchlist (same warm-up as /analyze)
+    plan = plan_range(request.start_date, request.end_date, ANALYSIS_OUTPUTS)
+    frames = fetch_data_many(tickers, plan.fetch_start, request.end_date)
+
+    # 2-3. Features and anomalies fanned out across the process pool
+    available = {t: df for t, df in frames.items() if df is not None}
+    analyzed = analyze_frames(available, contamination=request.contamination, method=request.method)
+
+    # 4. Analyst texts for the whole watchlist, several tickers per prompt
+    contexts = {}
+    for ticker, outcome in analyzed.items():
+        if isinstance(outcome, Exception):
+            continue
+        try:
+            df_filtered = _filter_range(outcome, request.start_date, request.end_date)
+        except HTTPException:
+            # Reported with the ticker's response below
+            continue
+        contexts[ticker] = market_context(ticker, df_filtered[df_filtered['anomaly'] == -1], df_filtered.iloc[-1],
+                                          request.language)
+    llm_results = dict(zip(contexts, get_llm().analyze_many(list(contexts.values()))))
+
+    # 5-6. Per-ticker responses or errors
+    items = []
+    for ticker in tickers:
+        if ticker not in analyzed:
+            items.append(BatchAnalysisItem(ticker=ticker, status_code=404, error="Stock data not found"))
+            continue
+        outcome = analyzed[ticker]
+        if isinstance(outcome, ValueError):
+            items.append(BatchAnalysisItem(ticker=ticker, status_code=422, error=str(outcome)))
+            continue
+        if isinstance(outcome, Exception):
+            items.append(BatchAnalysisItem(ticker=ticker, status_code=500, error=f"Analysis failed: {str(outcome)}"))
+            continue
+        try:
+            handle_key = _analysis_key(ticker, request.start_date, request.end_date, request.contamination,
+                                       method=request.method) + (request.language,)
+            result = _build_response(ticker, outcome, request.start_date, request.end_date, request.language, handle_key,
+                                     llm_result=llm_results.get(ticker))
+            items.append(BatchAnalysisItem(ticker=ticker, result=result))
+        except HTTPException as e:
+            items.append(BatchAnalysisItem(ticker=ticker, status_code=e.status_code, error=e.detail))
+
+    return BatchAnalysisResponse(results=items)
+
+
+@router.post("/analyze/universe", response_model=UniverseAnalysisResponse)
+def analyze_universe(request: UniverseAnalysisRequest):
+    tickers = list(dict.fromkeys(request.tickers))
+    if not tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(tickers) > config.BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"Too many tickers ({len(tickers)}). Maximum is {config.BATCH_MAX_TICKERS}.")
+
+    # 1. One grouped fetch (same warm-up as /analyze)
+    plan = plan_range(request.start_date, request.end_date, ANALYSIS_OUTPUTS)
+    frames = fetch_data_many(tickers, plan.fetch_start, request.end_date)
+
+    # 2. Features per ticker across the process pool (no per-ticker model fits)
+    available = {t: df for t, df in frames.items() if df is not None}
+    featured = map_frames(compute_features, available)
+    usable = {t: df for t, df in featured.items() if isinstance(df, pd.DataFrame)}
+
+    # 3. One cross-sectional model for the whole universe
+    n_jobs = request.n_jobs if request.n_jobs is not None else config.UNIVERSE_N_JOBS
+    try:
+        scored = detect_universe_anomalies(usable, contamination=request.contamination, n_jobs=n_jobs)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Anomaly detection failed: {str(e)}")
+
+    # 4. Back to the requested range, grouped per ticker
+    scored['date'] = pd.to_datetime(scored['date'])
+    mask = (scored['date'] >= pd.to_datetime(request.start_date)) & (scored['date'] <= pd.to_datetime(request.end_date))
+    in_range = scored.loc[mask]
+    in_range = in_range.assign(date=in_range['date'].astype(str))
+    grouped = {ticker: group for ticker, group in in_range.groupby('ticker', sort=False)}
+
+    results = []
+    for ticker in tickers:
+        if ticker not in featured:
+            results.append(UniverseTickerResult(ticker=ticker, status_code=404, error="Stock data not found"))
+        elif ticker not in usable:
+            error = featured[ticker]
+            status = 422 if isinstance(error, ValueError) else 500
+            results.append(UniverseTickerResult(ticker=ticker, status_code=status, error=str(error)))
+        elif ticker not in grouped:
+            results.append(UniverseTickerResult(ticker=ticker, status_code=422, error="No data available for the requested specific period (after processing)."))
+        else:
+            group = grouped[ticker]
+            points = [UniversePoint(**p) for p in group[['date', 'anomaly', 'anomaly_score']].to_dict(orient='records')]
+            results.append(UniverseTickerResult(ticker=ticker, anomalies_count=int((group['anomaly'] == -1).sum()), points=points))
+
+    return UniverseAnalysisResponse(
+        results=results,
+        rows_fitted=len(scored),
+        anomalies_count=int((in_range['anomaly'] == -1).sum()),
     )
+
+
+@router.post("/indicators", response_model=IndicatorsResponse)
+async def compute_indicators(request: IndicatorsRequest, response: Response):
+    """
+    Requested indicators only: the fetch covers just their warm-up and nothing else is
+    computed (no anomaly model, no LLM text).
+    """
+    timer = StageTimer('indicators')
+    _check_interval(request.interval)
+    start_date, end_date = _normalize_date(request.start_date), _normalize_date(request.end_date)
+    try:
+        plan = plan_range(start_date, end_date, request.indicators, interval=request.interval)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    with timer.stage('fetch'):
+        df = await afetch_data(request.ticker, plan.fetch_start, end_date, interval=request.interval)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+    timer.count(ROWS_PROCESSED, len(df))
+
+    with timer.stage('features'):
+        data = await asyncio.to_thread(_indicator_columns, df, plan)
+    timer.apply(response)
+    return IndicatorsResponse(ticker=request.ticker, warmup_bars=plan.warmup_bars, data=data)
+
+
+def _indicator_columns(df: pd.DataFrame, plan: RangePlan) -> dict:
+    try:
+        df = add_technical_indicators(df, outputs=plan.outputs)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    dates = pd.to_datetime(df['date'])
+    df = df.loc[(dates >= pd.to_datetime(plan.start_date)) & (dates <= pd.to_datetime(plan.end_date))]
+    if df.empty:
+        raise HTTPException(status_code=422, detail="No data available for the requested specific period (after processing).")
+
+    computed = [c for c in INDICATOR_COLUMNS + SIGNAL_COLUMNS if c in df.columns]
+    data = {'date': df['date'].astype(str).tolist()}
+    data.update({c: df[c].tolist() for c in computed})
+    return data
@@ -0,0 +1,124 @@
+import asyncio
+import math
+import time
+from fastapi import APIRouter, HTTPException
+from api.routers.analyze import _check_interval
+from api.schemas import BacktestRequest, BacktestResponse, BacktestSweepRequest, BacktestSweepResponse, BacktestSweepResult
+from core.backtest import BACKTEST_OUTPUTS, DEFAULT_PARAMS, METRICS, SIGNALS, backtest, sweep
+from core.data_loader import afetch_data, fetch_data_many
+from core.features import add_technical_indicators
+from core.intervals import DAILY, get_interval
+from core.pipeline import compute_features, map_frames
+from core.planner import plan_range
+from core import config
+import pandas as pd
+
+router = APIRouter()
+
+# Metrics where lower is better when ranking a sweep
+_ASCENDING = ('max_drawdown', 'turnover', 'trades', 'fees')
+
+
+def _check_signal(signal: str) -> None:
+    if signal not in SIGNALS:
+        raise HTTPException(status_code=422, detail=f"Unknown signal '{signal}'. Use one of: {', '.join(SIGNALS)}.")
+
+
+def _fee(fee_bps) -> float:
+    return (fee_bps if fee_bps is not None else config.BACKTEST_FEE_BPS) / 10_000
+
+
+def _in_range(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    return df.loc[(df['date'] >= pd.to_datetime(start_date)) & (df['date'] <= pd.to_datetime(end_date))]
+
+
+@router.post("/backtest", response_model=BacktestResponse)
+async def backtest_signals(request: BacktestRequest):
+    """
+    Backtests the strategy's signals for one ticker: positions, equity curve and metrics.
+    Without params the 'action' signal is exactly the action column /analyze returns.
+    """
+    _check_signal(request.signal)
+    _check_interval(request.interval)
+    unknown = set(request.params or {}) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown parameters: {', '.join(sorted(unknown))}.")
+
+    outputs = BACKTEST_OUTPUTS + ('action',)
+    plan = plan_range(request.start_date, request.end_date, outputs, interval=request.interval)
+    df = await afetch_data(request.ticker, plan.fetch_start, request.end_date, interval=request.interval)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+
+    def run():
+        featured = _in_range(add_technical_indicators(df, outputs=outputs), request.start_date, request.end_date)
+        if len(featured) < 2:
+            raise HTTPException(status_code=422, detail="Not enough bars in the requested range to backtest.")
+        return backtest(featured, params=request.params, signal=request.signal, fee=_fee(request.fee_bps),
+                        allow_short=request.allow_short, periods_per_year=get_interval(request.interval).bars_per_year)
+
+    metrics, curve = await asyncio.to_thread(run)
+    return BacktestResponse(
+        ticker=request.ticker,
+        signal=request.signal,
+        metrics=metrics,
+        data={'date': curve['date'].astype(str).tolist(), 'position': curve['position'].tolist(),
+              'returns': curve['returns'].tolist(), 'equity': curve['equity'].tolist()},
+    )
+
+
+@router.post("/backtest/sweep", response_model=BacktestSweepResponse)
+def backtest_sweep(request: BacktestSweepRequest):
+    """
+    Evaluates a grid of signal parameters on daily bars of several tickers and returns the
+    best parameter sets by the mean of `sort_by` over the tickers.
+    """
+    tickers = list(dict.fromkeys(request.tickers))
+    if not tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(tickers) > config.BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"Too many tickers ({len(tickers)}). Maximum is {config.BATCH_MAX_TICKERS}.")
+    _check_signal(request.signal)
+    if request.sort_by not in METRICS:
+        raise HTTPException(status_code=422, detail=f"Unknown metric '{request.sort_by}'. Use one of: {', '.join(METRICS)}.")
+    unknown = set(request.grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown parameters: {', '.join(sorted(unknown))}.")
+    param_sets = math.prod(len(values) for values in request.grid.values())
+    if not 1 <= param_sets <= config.BACKTEST_MAX_PARAM_SETS:
+        raise HTTPException(status_code=422, detail=f"The grid must hold between 1 and {config.BACKTEST_MAX_PARAM_SETS} parameter sets (got {param_sets}).")
+
+    # 1. One grouped fetch, indicators per ticker across the process pool
+    plan = plan_range(request.start_date, request.end_date, BACKTEST_OUTPUTS)
+    frames = fetch_data_many(tickers, plan.fetch_start, request.end_date)
+    available = {t: df for t, df in frames.items() if df is not None}
+    featured = map_frames(compute_features, available, outputs=BACKTEST_OUTPUTS)
+
+    errors, usable = {}, {}
+    for ticker in tickers:
+        outcome = featured.get(ticker)
+        if outcome is None:
+            errors[ticker] = "Stock data not found"
+        elif isinstance(outcome, Exception):
+            errors[ticker] = str(outcome)
+        elif len(in_range := _in_range(outcome, request.start_date, request.end_date)) < 2:
+            errors[ticker] = "Not enough bars in the requested range to backtest."
+        else:
+            usable[ticker] = in_range
+    if not usable:
+        raise HTTPException(status_code=404, detail="No ticker has data to backtest.")
+
+    # 2. Every parameter set on every ticker, over the shared indicator arrays
+    started = time.perf_counter()
+    table = sweep(usable, request.grid, signal=request.signal, fee=_fee(request.fee_bps),
+                  allow_short=request.allow_short, periods_per_year=get_interval(DAILY).bars_per_year)
+    seconds = time.perf_counter() - started
+
+    # 3. Ranked by the mean over tickers
+    names = list(DEFAULT_PARAMS)
+    summary = table.groupby(names, sort=False)[list(METRICS)].mean().reset_index()
+    summary = summary.sort_values(request.sort_by, ascending=request.sort_by in _ASCENDING).head(max(request.top, 1))
+    results = [BacktestSweepResult(params={n: row[n] for n in names}, metrics={m: row[m] for m in METRICS})
+               for row in summary.to_dict(orient='records')]
+    return BacktestSweepResponse(param_sets=param_sets, tickers=list(usable), errors=errors, seconds=seconds,
+                                 results=results)
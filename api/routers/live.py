@@ -0,0 +1,90 @@
+import asyncio
+from typing import Optional, Set
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocketState
+from core.live import get_monitor
+from core import config
+
+router = APIRouter()
+
+
+@router.websocket("/live")
+async def live(websocket: WebSocket, tickers: Optional[str] = None):
+    """
+    Live monitoring of a watchlist.
+
+    Subscribe with `?tickers=AAPL,MSFT` and/or by sending
+    {"action": "subscribe" | "unsubscribe", "tickers": [...]}. The server answers each
+    subscription with a 'subscribed' event (last bar's sentiment and action), then pushes
+    'signal', 'sentiment' and 'anomaly' events only for bars that produce them, and 'end'
+    once the feed for a ticker is exhausted. Problems arrive as 'error' events.
+    """
+    await websocket.accept()
+    monitor = get_monitor()
+    queue = monitor.queue()
+    subscribed: Set[str] = set()
+
+    async def subscribe(names) -> None:
+        for name in names:
+            ticker = str(name).strip().upper()
+            if not ticker or ticker in subscribed:
+                continue
+            if len(subscribed) >= config.LIVE_MAX_SUBSCRIPTIONS:
+                monitor.notify(queue, {'event': 'error', 'ticker': ticker,
+                                       'detail': f"At most {config.LIVE_MAX_SUBSCRIPTIONS} tickers per connection."})
+                continue
+            try:
+                await monitor.subscribe(ticker, queue)
+            except Exception as e:
+                # No data, or seeding failed: reported for this ticker, the connection stays open
+                if not isinstance(e, LookupError):
+                    print(f"Live subscription to {ticker} failed: {e}")
+                monitor.notify(queue, {'event': 'error', 'ticker': ticker, 'detail': str(e)})
+                continue
+            subscribed.add(ticker)
+
+    async def receive() -> None:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except WebSocketDisconnect:
+                raise
+            except Exception:
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    raise
+                # Malformed frame (not JSON, binary): answered like any other bad message
+                message = None
+            action = message.get('action') if isinstance(message, dict) else None
+            names = message.get('tickers') if isinstance(message, dict) else None
+            if action not in ('subscribe', 'unsubscribe') or not isinstance(names, list):
+                monitor.notify(queue, {'event': 'error',
+                                       'detail': "Send {\"action\": \"subscribe\" | \"unsubscribe\", \"tickers\": [...]}."})
+            elif action == 'subscribe':
+                await subscribe(names)
+            else:
+                for name in names:
+                    ticker = str(name).strip().upper()
+                    monitor.unsubscribe(ticker, queue)
+                    subscribed.discard(ticker)
+
+    async def send() -> None:
+        # The only writer on the socket
+        while True:
+            await websocket.send_text(await queue.get())
+
+    sender = asyncio.create_task(send())
+    receiver = None
+    try:
+        await subscribe((tickers or '').split(','))
+        receiver = asyncio.create_task(receive())
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                print(f"Live connection failed: {error}")
+    finally:
+        for task in (sender, receiver):
+            if task is not None:
+                task.cancel()
+        for ticker in subscribed:
+            monitor.unsubscribe(ticker, queue)
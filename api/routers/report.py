@@ -1,30 +1,89 @@
+import asyncio
+from typing import Optional, Tuple
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from api.schemas import ReportRequest
-from core.report import create_pdf_report
+from fastapi.responses import Response
+from api.schemas import ReportRequest, ReportJobStatus
+from core.analysis_store import get_analysis_store
+from core.metrics import StageTimer
+from core.report_jobs import QueueFullError, ReportJob, get_report_jobs
 import pandas as pd
 import json
-import os
-import uuid
 
 router = APIRouter()
 
-@router.post("/report")
-def generate_report(request: ReportRequest):
+
+def _report_inputs(request: ReportRequest) -> Tuple[str, str, pd.DataFrame]:
+    if request.handle:
+        # Stored by /analyze: nothing to upload or parse
+        stored = get_analysis_store().get(request.handle)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Analysis handle not found or expired")
+        return stored.ticker, stored.llm_analysis, stored.anomalies
+
+    if request.ticker is None or request.analysis is None or request.anomalies_json is None:
+        raise HTTPException(status_code=422, detail="Provide either a handle or ticker, analysis and anomalies_json.")
     try:
         # Parse anomalies
         anomalies_data = json.loads(request.anomalies_json)
-        anomalies_df = pd.DataFrame(anomalies_data)
-        
-        # Generate temporary filename
-        filename = f"report_{uuid.uuid4()}.pdf"
-        file_path = os.path.join("temp_reports", filename)
-        os.makedirs("temp_reports", exist_ok=True)
-        
-        # Create PDF
-        create_pdf_report(request.ticker, request.analysis, anomalies_df, file_path)
-        
-        return FileResponse(file_path, media_type='application/pdf', filename=f"{request.ticker}_Analysis_Report.pdf")
-        
+        return request.ticker, request.analysis, pd.DataFrame(anomalies_data)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
+        raise HTTPException(status_code=422, detail=f"Invalid anomalies_json: {str(e)}")
+
+
+def _submit(request: ReportRequest, timer: Optional[StageTimer] = None) -> ReportJob:
+    timer = timer or StageTimer('report', enabled=False)
+    with timer.stage('inputs'):
+        ticker, analysis, anomalies_df = _report_inputs(request)
+    try:
+        return get_report_jobs().submit(ticker, analysis, anomalies_df)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+def _pdf_response(job: ReportJob) -> Response:
+    if job.status == 'failed':
+        raise HTTPException(status_code=500, detail=f"Report generation failed: {job.error}")
+    try:
+        content = job.read()
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Report expired")
+    return Response(content=content, media_type='application/pdf',
+                    headers={"Content-Disposition": f'attachment; filename="{job.ticker}_Analysis_Report.pdf"'})
+
+
+@router.post("/report")
+async def generate_report(request: ReportRequest):
+    timer = StageTimer('report')
+    # Rendered on the report pool; the event loop only waits for the result
+    job = _submit(request, timer)
+    await asyncio.wrap_future(job.future)
+    if job.started_at is not None and job.finished_at is not None:
+        timer.record('queue', job.started_at - job.created_at)
+        timer.record('render', job.finished_at - job.started_at)
+    with timer.stage('read'):
+        response = _pdf_response(job)
+    timer.apply(response)
+    return response
+
+
+@router.post("/report/jobs", response_model=ReportJobStatus, status_code=202)
+def submit_report(request: ReportRequest):
+    return ReportJobStatus(**_submit(request).to_dict())
+
+
+@router.get("/report/jobs/{job_id}", response_model=ReportJobStatus)
+def report_status(job_id: str):
+    job = get_report_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return ReportJobStatus(**job.to_dict())
+
+
+@router.get("/report/jobs/{job_id}/download")
+def download_report(job_id: str):
+    job = get_report_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job.status in ('queued', 'running'):
+        raise HTTPException(status_code=409, detail=f"Report is still {job.status}", headers={"Retry-After": "1"})
+    return _pdf_response(job)
@@ -1,12 +1,35 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class AnalysisRequest(BaseModel):
     ticker: str
     start_date: str
     end_date: str
     contamination: float = 0.05
+    mode: str = 'full'  # 'full' (one fit over the range) or 'walk_forward' (trailing-window refits, no look-ahead)
+    method: str = 'isolation_forest'  # or linear-time 'robust_z', 'hbos', 'hst' (same anomaly/anomaly_score output)
+    interval: str = '1d'  # bar interval: '1d', '1h', '30m', '15m', '5m', '2m' or '1m'
+    levels: Optional[List[float]] = None  # contamination levels to return anomaly_raw thresholds for (one fit)
     language: str = 'pl'
+    format: str = 'records'  # 'records', 'columnar' (one array per field) or 'arrow' (IPC stream)
+    fields: Optional[List[str]] = None  # subset of StockDataPoint fields, defaults to all
+    precision: Optional[int] = None  # decimal places for float fields, anomaly_raw excepted
+    compression: Optional[str] = None  # 'gzip' for any format; 'zstd' or 'lz4' for arrow
+
+class StreamAnalysisRequest(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: str
+    contamination: float = 0.05
+    mode: str = 'full'
+    method: str = 'isolation_forest'
+    interval: str = '1d'
+    levels: Optional[List[float]] = None
+    language: str = 'pl'
+    fields: Optional[List[str]] = None  # subset of StockDataPoint fields, defaults to all
+    precision: Optional[int] = None  # decimal places for float fields, anomaly_raw excepted
+    chunk_size: int = 1000  # rows per 'rows' event
+    protocol: str = 'ndjson'  # 'ndjson' (one JSON object per line) or 'sse' (text/event-stream)
 
 class StockDataPoint(BaseModel):
     date: str
@@ -27,6 +50,7 @@ class StockDataPoint(BaseModel):
     obv: Optional[float] = None
     action: Optional[str] = None
     anomaly: int  # -1 or 1
+    anomaly_raw: Optional[float] = None  # model score before thresholding, lower is more anomalous
 
 class AnalysisResponse(BaseModel):
     ticker: str
@@ -35,8 +59,112 @@ class AnalysisResponse(BaseModel):
     llm_analysis: str
     sentiment: str
     action: str
+    handle: Optional[str] = None  # server-side reference to this result for follow-up calls (e.g. /report)
+    thresholds: Optional[Dict[str, float]] = None  # level -> anomaly_raw threshold (anomaly below it), for `levels`
 
 class ReportRequest(BaseModel):
+    # Either a handle returned by /analyze, or the full ticker/analysis/anomalies payload
+    handle: Optional[str] = None
+    ticker: Optional[str] = None
+    analysis: Optional[str] = None
+    anomalies_json: Optional[str] = None # JSON string or we can accept list of objects, but simplified for PDF generation
+
+class ReportJobStatus(BaseModel):
+    job_id: str
+    ticker: str
+    status: str  # queued, running, done, failed
+    size: int = 0  # PDF size in bytes once done
+    error: Optional[str] = None
+    queued_seconds: float = 0.0
+    render_seconds: Optional[float] = None
+
+class BatchAnalysisRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: str
+    contamination: float = 0.05
+    method: str = 'isolation_forest'  # see AnalysisRequest.method
+    language: str = 'pl'
+
+class BatchAnalysisItem(BaseModel):
     ticker: str
-    analysis: str
-    anomalies_json: str # JSON string or we can accept list of objects, but simplified for PDF generation
+    status_code: int = 200
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchAnalysisItem]
+
+class UniverseAnalysisRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: str
+    contamination: float = 0.05
+    n_jobs: Optional[int] = None  # forest fit/score parallelism, defaults to server config
+
+class UniversePoint(BaseModel):
+    date: str
+    anomaly: int  # -1 or 1
+    anomaly_score: float
+
+class UniverseTickerResult(BaseModel):
+    ticker: str
+    status_code: int = 200
+    anomalies_count: int = 0
+    points: List[UniversePoint] = []
+    error: Optional[str] = None
+
+class UniverseAnalysisResponse(BaseModel):
+    results: List[UniverseTickerResult]
+    rows_fitted: int
+    anomalies_count: int
+
+class IndicatorsRequest(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: str
+    indicators: List[str] = ['rsi']  # indicator columns and/or 'sentiment'/'action'; no anomaly model is run
+    interval: str = '1d'
+
+class IndicatorsResponse(BaseModel):
+    ticker: str
+    warmup_bars: int  # bars fetched before start_date for the requested indicators
+    data: Dict[str, List[Any]]  # columnar: 'date' plus one array per computed column
+
+class BacktestRequest(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: str
+    interval: str = '1d'
+    signal: str = 'action'  # 'action' (RSI BUY/SELL) or 'sentiment' (long while BULLISH)
+    params: Optional[Dict[str, float]] = None  # rsi_buy, rsi_sell, w_trend, w_macd, w_rsi, bullish, bearish
+    fee_bps: Optional[float] = None  # cost per trade in basis points, defaults to server config
+    allow_short: bool = False  # SELL/BEARISH goes short instead of flat
+
+class BacktestResponse(BaseModel):
+    ticker: str
+    signal: str
+    metrics: Dict[str, float]  # total_return, cagr, sharpe, max_drawdown, turnover, trades, fees, exposure
+    data: Dict[str, List[Any]]  # columnar: date, position, returns, equity
+
+class BacktestSweepRequest(BaseModel):
+    tickers: List[str]
+    start_date: str
+    end_date: str
+    grid: Dict[str, List[float]]  # parameter -> values, combined as a cartesian product
+    signal: str = 'action'
+    fee_bps: Optional[float] = None
+    allow_short: bool = False
+    sort_by: str = 'sharpe'  # metric the parameter sets are ranked by (mean over tickers)
+    top: int = 20
+
+class BacktestSweepResult(BaseModel):
+    params: Dict[str, float]
+    metrics: Dict[str, float]  # mean over the tickers
+
+class BacktestSweepResponse(BaseModel):
+    param_sets: int
+    tickers: List[str]  # tickers the grid was evaluated on
+    errors: Dict[str, str] = {}  # tickers left out and why
+    seconds: float  # sweep time, excluding the fetch and indicators
+    results: List[BacktestSweepResult]
@@ -0,0 +1,151 @@
+import gzip
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from fastapi.responses import Response
+from api.schemas import StockDataPoint
+
+RESPONSE_FORMATS = ('records', 'columnar', 'arrow')
+COMPRESSIONS = ('gzip', 'zstd', 'lz4')
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+# Columns of a data point, in response order
+DATA_FIELDS = list(StockDataPoint.model_fields)
+
+# Decimals kept when float32 columns (intraday bars) are written to JSON without a
+# precision; as float64 they would show their representation error ('101.2300033569336')
+FLOAT32_DECIMALS = 6
+
+# Never rounded: clients compare them against the unrounded thresholds of other levels,
+# and a score rounded onto the wrong side of a threshold flips its label
+EXACT_FIELDS = ('anomaly_raw',)
+
+
+def select_fields(fields: Optional[List[str]]) -> List[str]:
+    """
+    Validates a `fields=` selector against the data point fields (None selects all).
+    """
+    if not fields:
+        return DATA_FIELDS
+    unknown = [f for f in fields if f not in DATA_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(DATA_FIELDS)}.")
+    return list(dict.fromkeys(fields))
+
+
+def validate_options(fmt: str, compression: Optional[str], precision: Optional[int]) -> None:
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Expected one of {RESPONSE_FORMATS}.")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Expected one of {COMPRESSIONS}.")
+    if compression in ('zstd', 'lz4') and fmt != 'arrow':
+        raise ValueError(f"Compression '{compression}' is only available for the arrow format; use gzip for JSON.")
+    if precision is not None and not 0 <= precision <= 15:
+        raise ValueError("precision must be between 0 and 15.")
+
+
+def prepare_frame(df: pd.DataFrame, fields: List[str], precision: Optional[int] = None) -> pd.DataFrame:
+    """
+    Selects the response columns (missing optional ones become null) and rounds floats.
+    """
+    out = df.reindex(columns=fields)
+    if precision is not None:
+        float_cols = out.select_dtypes(include='float').columns.difference(EXACT_FIELDS, sort=False)
+        if len(float_cols):
+            out[float_cols] = out[float_cols].round(precision)
+    return out
+
+
+def widen_float32(df: pd.DataFrame, precision: Optional[int] = None) -> pd.DataFrame:
+    """
+    Converts float32 columns to float64 rounded to `precision` (default FLOAT32_DECIMALS) for JSON output.
+    """
+    columns = df.select_dtypes(include=np.float32).columns
+    if not len(columns):
+        return df
+    decimals = precision if precision is not None else FLOAT32_DECIMALS
+    return df.assign(**{col: df[col].astype(np.float64) if col in EXACT_FIELDS else df[col].astype(np.float64).round(decimals)
+                        for col in columns})
+
+
+def to_columns(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    """
+    Column-oriented JSON data: one array per field, NaN as null.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+            values = series.astype(object).where(series.notna(), None).tolist()
+        else:
+            values = series.to_numpy()
+            if values.dtype.kind == 'f' and np.isnan(values).any():
+                values = np.where(np.isnan(values), None, values)
+            values = values.tolist()
+        columns[col] = values
+    return columns
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    columns = to_columns(df)
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def encode_json(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def to_arrow_ipc(df: pd.DataFrame, metadata: Dict[str, str], compression: Optional[str] = None) -> bytes:
+    """
+    Serializes the data as an Arrow IPC stream; response-level values go in the schema metadata.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata.update({k.encode(): v.encode() for k, v in metadata.items()})
+    table = table.replace_schema_metadata(schema_metadata)
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render_analysis(df: pd.DataFrame, summary: Dict[str, Any], fmt: str = 'records',
+                    fields: Optional[List[str]] = None, precision: Optional[int] = None,
+                    compression: Optional[str] = None) -> Response:
+    """
+    Builds the /analyze response body in the requested format.
+
+    Args:
+        df: Filtered analysis rows ('date' already as string).
+        summary: Response-level values (ticker, anomalies_count, llm_analysis, sentiment, action).
+        fmt: 'records' (list of objects), 'columnar' (one array per field) or 'arrow' (IPC stream).
+        fields: Data fields to return (default: all StockDataPoint fields).
+        precision: Decimal places for float fields (anomaly_raw is always sent unrounded).
+        compression: 'gzip' (HTTP Content-Encoding, any format), or 'zstd'/'lz4' (Arrow buffers).
+    """
+    data = prepare_frame(df, select_fields(fields), precision)
+    headers = {}
+
+    if fmt == 'arrow':
+        metadata = {k: json.dumps(v) if isinstance(v, dict) else str(v) for k, v in summary.items()}
+        body = to_arrow_ipc(data, metadata, compression=compression if compression != 'gzip' else None)
+        media_type = ARROW_MEDIA_TYPE
+    else:
+        data = widen_float32(data, precision)
+        payload = dict(summary)
+        payload['format'] = fmt
+        payload['data'] = to_columns(data) if fmt == 'columnar' else to_records(data)
+        body = encode_json(payload)
+        media_type = 'application/json'
+
+    if compression == 'gzip':
+        body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(content=body, media_type=media_type, headers=headers)
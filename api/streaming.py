@@ -0,0 +1,22 @@
+"""
+Event framing for streamed responses.
+
+An event is a name plus a JSON object. As NDJSON each event is one line, the object
+with an added "event" key; as Server-Sent Events it is an 'event:' line naming it and
+a 'data:' line holding the object.
+"""
+from typing import Any, AsyncIterator, Dict, Tuple
+from api.serialization import encode_json
+
+STREAM_PROTOCOLS = {'ndjson': 'application/x-ndjson', 'sse': 'text/event-stream'}
+
+
+def encode_event(name: str, payload: Dict[str, Any], protocol: str = 'ndjson') -> bytes:
+    if protocol == 'sse':
+        return b'event: ' + name.encode() + b'\ndata: ' + encode_json(payload) + b'\n\n'
+    return encode_json({'event': name, **payload}) + b'\n'
+
+
+async def encode_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]], protocol: str = 'ndjson') -> AsyncIterator[bytes]:
+    async for name, payload in events:
+        yield encode_event(name, payload, protocol)
@@ -0,0 +1,103 @@
+"""
+Benchmark: labels at every sensitivity slider level, refit per level vs one fit.
+
+In-process: an Isolation Forest fitted per contamination level against one fit whose raw
+scores are thresholded at every level (contamination_labels); the labels are checked to
+be identical. Over HTTP (in-process uvicorn, synthetic provider, model and response caches
+off): moving the dashboard slider through all levels as one POST /analyze per move, against
+one POST /analyze with `levels` and a local reclassification per move.
+
+Usage:
+    python -m benchmarks.bench_contamination_levels [--sizes 250 2500 20000] [--years 5]
+"""
+import argparse
+import threading
+import time
+import numpy as np
+import pandas as pd
+import requests
+from core import config
+from core.anomaly import contamination_labels, detect_anomalies
+from core.data_loader import set_provider
+from core.features import add_technical_indicators
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+LEVELS = [round(0.01 * k, 2) for k in range(1, 11)]
+
+
+def in_process(n_rows: int) -> tuple:
+    df = add_technical_indicators(generate_ohlcv(n_rows + 200, seed=3))
+    started = time.perf_counter()
+    refits = {level: detect_anomalies(df.copy(), contamination=level)['anomaly'] for level in LEVELS}
+    refit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    labels = contamination_labels(detect_anomalies(df.copy(), contamination=0.05), LEVELS)
+    one_fit_seconds = time.perf_counter() - started
+    identical = all((labels[level] == refits[level]).all() for level in LEVELS)
+    return len(df), refit_seconds, one_fit_seconds, identical
+
+
+def over_http(url: str, body: dict) -> tuple:
+    session = requests.Session()
+    # Warm-up: connection and the provider's first fetch of the range
+    session.post(f"{url}/analyze", json=body).raise_for_status()
+    started = time.perf_counter()
+    for level in LEVELS:
+        session.post(f"{url}/analyze", json=dict(body, contamination=level)).raise_for_status()
+    per_move = (time.perf_counter() - started) / len(LEVELS)
+
+    started = time.perf_counter()
+    res = session.post(f"{url}/analyze", json=dict(body, levels=LEVELS))
+    res.raise_for_status()
+    result = res.json()
+    data = pd.DataFrame(result['data'])
+    first = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for level in LEVELS:
+        data.assign(anomaly=np.where(data['anomaly_raw'] < result['thresholds'][f"{level:g}"], -1, 1))
+    local = (time.perf_counter() - started) / len(LEVELS)
+    return len(data), per_move, first, local
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 2_500, 20_000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    print(f"{len(LEVELS)} levels, in-process")
+    print(f"{'rows':>7} {'refit per level [s]':>20} {'one fit [s]':>12} {'speedup':>8} {'identical':>10}")
+    for n_rows in args.sizes:
+        rows, refit, one_fit, identical = in_process(n_rows)
+        print(f"{rows:>7} {refit:>20.3f} {one_fit:>12.3f} {refit / one_fit:>7.1f}x {str(identical):>10}")
+
+    import uvicorn
+    from api.main import app
+
+    config.MODEL_CACHE_ENABLED = False
+    config.RESPONSE_CACHE_ENABLED = False
+    set_provider(SyntheticProvider())
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    end = pd.Timestamp('2024-12-31')
+    body = {'ticker': 'BENCH', 'start_date': str((end - pd.DateOffset(years=args.years)).date()),
+            'end_date': str(end.date()), 'language': 'en', 'format': 'columnar', 'precision': 6}
+    try:
+        rows, per_move, first, local = over_http(f"http://127.0.0.1:{args.port}/api", body)
+    finally:
+        server.should_exit = True
+
+    print(f"\nSlider move over HTTP, {args.years} years of daily bars ({rows} rows)")
+    print(f"{'POST /analyze per move':<34} {per_move * 1000:>9.1f} ms")
+    print(f"{'first request with levels':<34} {first * 1000:>9.1f} ms")
+    print(f"{'local reclassification per move':<34} {local * 1000:>9.3f} ms  ({per_move / local:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: dashboard chart cost per rerun for large synthetic analyses.
+
+Compares the former figures (every point as SVG Scatter/Candlestick/Bar, RSI drawn twice)
+with ui/charts.py (LTTB downsampling that keeps anomaly and signal rows, Scattergl above
+the size threshold, one RSI/signal figure): build time, Plotly JSON serialization time
+(done by st.plotly_chart on every rerun) and the JSON size sent to the browser.
+
+With --app the Streamlit script itself is run with streamlit.testing against an
+in-process API on port 8000 (synthetic provider): first analysis, plain rerun and
+repeated click with identical inputs.
+
+Usage:
+    python -m benchmarks.bench_dashboard [--sizes 1000 10000 100000] [--app]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import date
+import pandas as pd
+import plotly.graph_objects as go
+from core.pipeline import analyze_frame
+from core.synthetic import generate_ohlcv
+
+UI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ui')
+sys.path.insert(0, UI_DIR)
+from charts import build_figures  # noqa: E402
+
+RSI_TITLE = "RSI with Algo Signals"
+
+
+def legacy_figures(data: pd.DataFrame) -> list:
+    fig = go.Figure(go.Candlestick(x=data['date'], open=data['open'], high=data['high'],
+                                   low=data['low'], close=data['close'], name='Price'))
+    anomalies = data[data['anomaly'] == -1]
+    fig.add_trace(go.Scatter(x=anomalies['date'], y=anomalies['close'], mode='markers', name='Anomaly'))
+    fig_rsi = go.Figure(go.Scatter(x=data['date'], y=data['rsi'], name='RSI'))
+    fig_macd = go.Figure(go.Bar(x=data['date'], y=data['macd'], name='MACD Hist'))
+    fig_adx = go.Figure(go.Scatter(x=data['date'], y=data['adx'], name='ADX'))
+    fig_sig = go.Figure(go.Scatter(x=data['date'], y=data['rsi'], name='RSI'))
+    for action in ('BUY', 'SELL'):
+        rows = data[data['action'] == action]
+        fig_sig.add_trace(go.Scatter(x=rows['date'], y=rows['rsi'], mode='markers', name=action))
+    return [fig, fig_rsi, fig_macd, fig_adx, fig_sig]
+
+
+def analysis_data(n_rows: int) -> pd.DataFrame:
+    # Shaped like the /analyze payload: features, anomalies, string dates
+    df = analyze_frame(generate_ohlcv(n_rows + 220, seed=3, freq='h'), contamination=0.02).tail(n_rows)
+    df = df.assign(date=df['date'].astype(str), action=df['action'].astype(str))
+    return df.reset_index(drop=True)
+
+
+def time_figures(build, data) -> tuple:
+    t0 = time.perf_counter()
+    figures = build(data)
+    t1 = time.perf_counter()
+    size = sum(len(fig.to_json()) for fig in figures)
+    return t1 - t0, time.perf_counter() - t1, size
+
+
+def bench_figures(sizes):
+    print(f"{'rows':>8} {'version':>8} {'build [s]':>10} {'to_json [s]':>12} {'JSON [MB]':>10}")
+    for n_rows in sizes:
+        data = analysis_data(n_rows)
+        for name, build in (('legacy', legacy_figures), ('charts', lambda d: list(build_figures(d, RSI_TITLE).values()))):
+            build_s, json_s, size = time_figures(build, data)
+            print(f"{n_rows:>8} {name:>8} {build_s:>10.3f} {json_s:>12.3f} {size / 1e6:>10.2f}")
+
+
+def bench_app():
+    import uvicorn
+    from streamlit.testing.v1 import AppTest
+    from api.main import app
+    from core.data_loader import set_provider
+    from core.synthetic import SyntheticProvider
+
+    set_provider(SyntheticProvider())
+
+    server = uvicorn.Server(uvicorn.Config(app, port=8000, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        at = AppTest.from_file(os.path.join(UI_DIR, 'app.py'), default_timeout=300)
+        at.run()
+        at.sidebar.radio[0].set_value('English')
+        at.sidebar.date_input[0].set_value(date(2000, 1, 3))
+        at.run()
+        for label in ('first analysis', 'rerun', 'same request'):
+            t0 = time.perf_counter()
+            if label == 'rerun':
+                at.run()
+            else:
+                at.sidebar.button[0].click().run()
+            print(f"{label:>16}: {time.perf_counter() - t0:.3f} s")
+    finally:
+        server.should_exit = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--app', action='store_true', help="Also time reruns of ui/app.py (needs port 8000)")
+    args = parser.parse_args()
+
+    bench_figures(args.sizes)
+    if args.app:
+        print()
+        bench_app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark: `ta` reference engine vs fused NumPy engine in add_technical_indicators.
+
+Usage:
+    python -m benchmarks.bench_features [--sizes 1000 10000 100000] [--max-reference-rows N]
+"""
+import argparse
+import time
+from core.features import add_technical_indicators
+from core.synthetic import generate_ohlcv
+
+
+def time_engine(df, engine: str) -> float:
+    start = time.perf_counter()
+    add_technical_indicators(df, engine=engine)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--max-reference-rows', type=int, default=None,
+                        help="Skip the ta engine above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'ta [s]':>10} {'numpy [s]':>11} {'speedup':>9}")
+    for n_rows in args.sizes:
+        df = generate_ohlcv(n_rows, freq='h')
+        fused = time_engine(df, 'numpy')
+        if args.max_reference_rows is not None and n_rows > args.max_reference_rows:
+            print(f"{n_rows:>10} {'skipped':>10} {fused:>11.4f} {'-':>9}")
+            continue
+        reference = time_engine(df, 'ta')
+        print(f"{n_rows:>10} {reference:>10.4f} {fused:>11.4f} {reference / fused:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: a month of 1-minute bars (synthetic, around the clock) through the pipeline.
+
+Compares float64 frames with the compact intraday dtypes (float32 prices and indicators)
+for memory held after each stage and time per stage, then times the /analyze response
+formats on the compact result. Also lists the upstream requests a month of 1m bars is
+split into.
+
+Usage:
+    python -m benchmarks.bench_intraday [--ticker BTC-USD] [--start 2024-01-01] [--end 2024-02-01] [--interval 1m]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from api.serialization import render_analysis
+from core.anomaly import detect_anomalies
+from core.data_loader import PRICE_COLUMNS, compact_ohlcv
+from core.features import add_technical_indicators
+from core.intervals import split_range
+from core.pipeline import ANALYSIS_OUTPUTS
+from core.planner import plan_range
+from core.synthetic import SyntheticProvider
+
+SUMMARY = {'ticker': 'BENCH', 'handle': '', 'anomalies_count': 0, 'llm_analysis': '', 'sentiment': '', 'action': ''}
+
+
+def megabytes(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def run(raw: pd.DataFrame, start: str) -> dict:
+    t0 = time.perf_counter()
+    featured = add_technical_indicators(raw, outputs=ANALYSIS_OUTPUTS)
+    t1 = time.perf_counter()
+    scored = detect_anomalies(featured, contamination=0.01)
+    t2 = time.perf_counter()
+    in_range = scored.loc[scored['date'] >= start]
+    return {'frame': in_range, 'raw_mb': megabytes(raw), 'features_mb': megabytes(featured),
+            'features_s': t1 - t0, 'anomalies_s': t2 - t1}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2024-02-01')
+    parser.add_argument('--interval', default='1m')
+    args = parser.parse_args()
+
+    plan = plan_range(args.start, args.end, ANALYSIS_OUTPUTS, interval=args.interval)
+    t0 = time.perf_counter()
+    raw = SyntheticProvider().fetch(args.ticker, plan.fetch_start, args.end, interval=args.interval)
+    fetch_s = time.perf_counter() - t0
+    chunks = split_range(args.start, args.end, args.interval, today=pd.Timestamp(args.end))
+    print(f"{len(raw)} {args.interval} bars fetched from {plan.fetch_start} ({fetch_s:.2f} s synthetic); "
+          f"Yahoo would take {len(chunks)} requests: {', '.join(f'{s}..{e}' for s, e in chunks)}\n")
+
+    results = {'float64': run(raw.astype({c: np.float64 for c in PRICE_COLUMNS}), args.start),
+               'compact': run(compact_ohlcv(raw), args.start)}
+    print(f"{'dtypes':>8} {'OHLCV [MB]':>11} {'features [MB]':>14} {'features [s]':>13} {'anomalies [s]':>14}")
+    for name, r in results.items():
+        print(f"{name:>8} {r['raw_mb']:>11.2f} {r['features_mb']:>14.2f} {r['features_s']:>13.3f} {r['anomalies_s']:>14.3f}")
+
+    frame = results['compact']['frame'].assign(date=lambda d: d['date'].astype(str), action=lambda d: d['action'].astype(str))
+    print(f"\n{len(frame)} rows in range")
+    print(f"{'format':>10} {'encode [s]':>11} {'size [MB]':>10}")
+    for fmt, precision in (('records', None), ('columnar', 6), ('arrow', None)):
+        t0 = time.perf_counter()
+        body = render_analysis(frame, SUMMARY, fmt=fmt, precision=precision).body
+        print(f"{fmt:>10} {time.perf_counter() - t0:>11.3f} {len(body) / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
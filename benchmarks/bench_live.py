@@ -0,0 +1,73 @@
+"""
+Benchmark: polling /analyze per new bar vs pushing events from warm per-ticker state.
+
+Polling recomputes the features and the anomaly model over the whole history for every
+new bar (model registry off, as for a range that moved). The live monitor updates one
+IndicatorState per ticker and fans the resulting events out to every subscriber. Bars are
+replayed as fast as they are consumed.
+
+Usage:
+    python -m benchmarks.bench_live [--tickers 10] [--subscribers 100] [--bars 60]
+"""
+import argparse
+import asyncio
+import time
+from core.data_loader import fetch_data
+from core.live import LiveMonitor, ReplayFeed
+from core.pipeline import analyze_frame
+from core.planner import plan_range
+from core.synthetic import SyntheticProvider
+
+START, END = '2024-01-02', '2024-07-01'
+
+
+def time_polling(ticker: str, feed: ReplayFeed, bars: int) -> float:
+    plan = plan_range(START, feed.end_date, extra=feed.history_bars)
+    df = fetch_data(ticker, plan.fetch_start, feed.end_date, provider=feed.provider)
+    history = len(feed.history(ticker))
+    started = time.perf_counter()
+    for n in range(history + 1, history + bars + 1):
+        analyze_frame(df.iloc[:n], contamination=0.05)
+    return (time.perf_counter() - started) / bars
+
+
+async def time_push(feed: ReplayFeed, tickers: int, subscribers: int) -> dict:
+    monitor = LiveMonitor(feed, queue_size=100_000)
+    names = [f"T{i}" for i in range(tickers)]
+    queues = [monitor.queue() for _ in range(subscribers)]
+
+    started = time.perf_counter()
+    for i, queue in enumerate(queues):
+        await monitor.subscribe(names[i % tickers], queue)
+    seeded = time.perf_counter() - started
+
+    started = time.perf_counter()
+    while any(stream.task is not None for stream in monitor.streams.values()):
+        await asyncio.sleep(0.01)
+    stats = monitor.stats()
+    stats.update(seed_seconds=seeded, run_seconds=time.perf_counter() - started)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=10)
+    parser.add_argument('--subscribers', type=int, default=100)
+    parser.add_argument('--bars', type=int, default=60)
+    args = parser.parse_args()
+
+    feed = ReplayFeed(START, END, speed=0, provider=SyntheticProvider())
+
+    poll = time_polling('T0', feed, args.bars)
+    push = asyncio.run(time_push(feed, args.tickers, args.subscribers))
+    per_bar = push['run_seconds'] / push['bars']
+
+    print(f"Polling: {poll * 1000:.1f} ms per ticker per bar (full history recomputed)")
+    print(f"Push:    {per_bar * 1000:.2f} ms per ticker per bar over {push['bars']} bars "
+          f"({args.tickers} tickers, {args.subscribers} subscribers), seeding {push['seed_seconds']:.2f} s")
+    print(f"         {push['events']} events -> {push['messages']} messages "
+          f"({push['events'] / push['bars']:.2f} events per bar), {poll / per_bar:.0f}x less work per bar")
+
+
+if __name__ == "__main__":
+    main()
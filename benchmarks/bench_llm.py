@@ -0,0 +1,72 @@
+"""
+Benchmark: analyst texts for a watchlist from a slow model, served by the stub LLM server.
+
+The stub answers after `--latency` seconds plus `--per-ticker` seconds per ticker in the
+prompt. Compared: one blocking call per ticker (a synchronous provider in the request
+path), the LLMService with calls in parallel up to the concurrency limit, the same with
+several tickers per prompt, the same watchlist again (response cache), and a model slower
+than the timeout (algorithmic fallback).
+
+Usage:
+    python -m benchmarks.bench_llm [--tickers 20] [--latency 0.5] [--per-ticker 0.1] [--concurrency 4] [--batch 8]
+"""
+import argparse
+import time
+from core.anomaly import detect_anomalies
+from core.features import add_technical_indicators
+from core.llm import HTTPLLM, LLMService, market_context
+from core.llm_stub import StubLLMServer
+from core.synthetic import generate_ohlcv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--per-ticker', type=float, default=0.1)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=8)
+    args = parser.parse_args()
+
+    frame = detect_anomalies(add_technical_indicators(generate_ohlcv(600, seed=1)))
+    anomalies = frame[frame['anomaly'] == -1]
+    contexts = [market_context(f"T{i:02d}", anomalies, frame.iloc[-1 - i], 'en') for i in range(args.tickers)]
+
+    print(f"{args.tickers} tickers, model latency {args.latency}s + {args.per_ticker}s per ticker in the prompt\n")
+    print(f"{'':<36} {'seconds':>8} {'model calls':>12} {'ms/ticker':>10}")
+
+    def report(label: str, seconds: float, calls: int) -> None:
+        print(f"{label:<36} {seconds:>8.2f} {calls:>12} {seconds / args.tickers * 1000:>10.1f}")
+
+    with StubLLMServer(latency=args.latency, per_ticker=args.per_ticker) as stub:
+        provider = HTTPLLM(stub.url)
+        started = time.perf_counter()
+        for context in contexts:
+            provider.generate(context)
+        report("blocking, one call per ticker", time.perf_counter() - started, stub.requests)
+
+        runs = [(f"service, {args.concurrency} in flight", 1), (f"service, {args.batch} tickers per prompt", args.batch)]
+        for label, batch in runs:
+            service = LLMService(HTTPLLM(stub.url, max_concurrency=args.concurrency, max_batch=batch), timeout=60)
+            before = stub.requests
+            started = time.perf_counter()
+            service.analyze_many(contexts)
+            report(label, time.perf_counter() - started, stub.requests - before)
+            before = stub.requests
+            started = time.perf_counter()
+            service.analyze_many(contexts)
+            report("  same watchlist again (cached)", time.perf_counter() - started, stub.requests - before)
+            service.close()
+
+        # A model slower than the timeout: every ticker still gets a text, bounded in time
+        stub.latency = 5.0
+        timeout = 1.0
+        service = LLMService(HTTPLLM(stub.url, max_concurrency=args.concurrency, max_batch=args.batch), timeout=timeout)
+        started = time.perf_counter()
+        service.analyze_many(contexts)
+        report(f"model stalls, {timeout:g}s timeout (fallback)", time.perf_counter() - started, service.stats()['calls'])
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: date-slice latency of the memory-mapped local store vs a yfinance-shaped stub
+and the Parquet OHLCV cache, over decades of history.
+
+The stub keeps the full history in yfinance's download shape (Date index, (Price, Ticker)
+column MultiIndex) and answers each fetch like YFinanceProvider: slice, then normalize_ohlcv.
+`--latency-ms` adds a simulated network round trip to it.
+
+Usage:
+    python -m benchmarks.bench_local_store [--years 40] [--freq B] [--repeat 20] [--latency-ms 0]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+import pandas as pd
+from core.cache import OHLCVCache
+from core.data_loader import DataProvider, normalize_ohlcv
+from core.local_store import LocalStore
+from core.synthetic import generate_ohlcv
+
+TICKER = 'SYN'
+
+
+class YFinanceShapedStub(DataProvider):
+    def __init__(self, history: pd.DataFrame, latency: float = 0.0):
+        raw = history.set_index('date').rename_axis('Date')
+        raw.columns = pd.MultiIndex.from_product([[c.capitalize() for c in raw.columns], [TICKER]], names=['Price', 'Ticker'])
+        self.raw = raw
+        self.latency = latency
+
+    def fetch(self, ticker, start_date, end_date):
+        if self.latency:
+            time.sleep(self.latency)
+        end = pd.Timestamp(end_date) - pd.Timedelta(1)
+        return normalize_ohlcv(self.raw.loc[pd.Timestamp(start_date):end].copy())
+
+
+def median_ms(provider: DataProvider, start: str, end: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        provider.fetch(TICKER, start, end)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--freq', default='B', help="Bar frequency: B (daily) or h (hourly)")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    periods = {'B': 252, 'h': 24 * 365}.get(args.freq, 252)
+    history = generate_ohlcv(args.years * periods, seed=1, start='1985-01-02', freq=args.freq)
+    first, last = history['date'].iloc[0], history['date'].iloc[-1]
+    print(f"{len(history):,} bars ({args.freq}) from {first.date()} to {last.date()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = YFinanceShapedStub(history, latency=args.latency_ms / 1000)
+
+        store = LocalStore(f"{tmp}/store")
+        store.write(TICKER, history)
+        t0 = time.perf_counter()
+        store.fetch(TICKER, str(last.date()), str(last.date()))
+        print(f"Local store first open (memory map): {(time.perf_counter() - t0) * 1000:.3f} ms")
+
+        cache = OHLCVCache(stub, f"{tmp}/cache", today=lambda: last.date())
+        cache.fetch(TICKER, str(first.date()), str((last + pd.Timedelta(days=1)).date()))
+
+        print(f"\n{'slice':>10} {'rows':>9} {'yf stub [ms]':>13} {'parquet [ms]':>13} {'local [ms]':>11} {'vs stub':>8}")
+        end = last + pd.Timedelta(days=1)
+        for label, span in [('1 month', pd.DateOffset(months=1)), ('1 year', pd.DateOffset(years=1)),
+                            ('10 years', pd.DateOffset(years=10)), ('full', None)]:
+            start = first if span is None else end - span
+            s, e = str(start.date()), str(end.date())
+            rows = len(store.fetch(TICKER, s, e))
+            stub_ms = median_ms(stub, s, e, args.repeat)
+            parquet_ms = median_ms(cache, s, e, args.repeat)
+            local_ms = median_ms(store, s, e, args.repeat)
+            print(f"{label:>10} {rows:>9,} {stub_ms:>13.3f} {parquet_ms:>13.3f} {local_ms:>11.3f} {stub_ms / local_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
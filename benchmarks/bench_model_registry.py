@@ -0,0 +1,35 @@
+"""
+Benchmark: full Isolation Forest fit vs the registry's score-only path when one bar is appended.
+
+Usage:
+    python -m benchmarks.bench_model_registry [--sizes 500 2500 10000] [--repeats 5]
+"""
+import argparse
+from core.anomaly import FEATURE_COLUMNS
+from core.features import add_technical_indicators
+from core.model_registry import ModelRegistry
+from core.synthetic import generate_ohlcv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2_500, 10_000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'fit [s]':>10} {'score-only [s]':>15} {'speedup':>9}")
+    for n_rows in args.sizes:
+        X = add_technical_indicators(generate_ohlcv(n_rows + 200 + args.repeats, seed=3))[FEATURE_COLUMNS]
+        base = len(X) - args.repeats
+        registry = ModelRegistry(refit_every=args.repeats)
+
+        for i in range(args.repeats + 1):
+            registry.score("BENCH", X.iloc[:base + i], 0.05)
+
+        stats = registry.stats()
+        fit, score = stats['avg_fit_seconds'], stats['avg_score_seconds']
+        print(f"{base:>8} {fit:>10.4f} {score:>15.4f} {fit / score:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
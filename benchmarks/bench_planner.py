@@ -0,0 +1,49 @@
+"""
+Benchmark: former fixed 365-day lookback with every indicator vs the warm-up planner
+(analysis indicators, and RSI alone) for short and long requested ranges.
+
+Reports bars fetched before computing and the indicator time on them.
+
+Usage:
+    python -m benchmarks.bench_planner [--repeat 50]
+"""
+import argparse
+import statistics
+import time
+from core.features import add_technical_indicators
+from core.pipeline import ANALYSIS_OUTPUTS
+from core.planner import plan_range
+from core.synthetic import generate_ohlcv
+from core.utils import get_lookback_date
+
+END = '2024-06-28'
+
+
+def median_ms(df, outputs, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        add_technical_indicators(df, outputs=outputs)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    history = generate_ohlcv(6_500, seed=1, start='2000-01-03')
+    print(f"{'range':>8} {'mode':>16} {'fetch start':>12} {'bars':>6} {'features [ms]':>14}")
+    for label, start in (('1 month', '2024-06-03'), ('1 year', '2023-06-30')):
+        modes = [('fixed 365d, all', get_lookback_date(start, 365), None)]
+        for name, outputs in (('planned', ANALYSIS_OUTPUTS), ('planned, rsi', ('rsi',))):
+            modes.append((name, plan_range(start, END, outputs).fetch_start, outputs))
+        for name, fetch_start, outputs in modes:
+            df = history[(history['date'] >= fetch_start) & (history['date'] <= END)].reset_index(drop=True)
+            ms = median_ms(df, outputs, args.repeat)
+            print(f"{label:>8} {name:>16} {fetch_start:>12} {len(df):>6} {ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
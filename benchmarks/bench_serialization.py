@@ -0,0 +1,74 @@
+"""
+Benchmark: /analyze payload size and serialization time per response format.
+
+The baseline is the current records response (AnalysisResponse validated and dumped by
+pydantic, as FastAPI does); the others go through api.serialization.render_analysis.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 250 2500 25000] [--repeat 5] [--precision 4]
+"""
+import argparse
+import time
+from api.schemas import AnalysisResponse
+from api.serialization import render_analysis
+from core.anomaly import detect_anomalies
+from core.features import add_technical_indicators
+from core.synthetic import generate_ohlcv
+
+SUMMARY = {'ticker': 'SYN', 'anomalies_count': 0, 'llm_analysis': 'x' * 400, 'sentiment': 'NEUTRAL', 'action': 'HOLD'}
+
+
+def make_analysis_frame(n_rows: int):
+    # Warm-up rows are dropped by the indicators, as in the real pipeline
+    df = add_technical_indicators(generate_ohlcv(n_rows + 200, seed=7))
+    df = detect_anomalies(df).tail(n_rows).reset_index(drop=True)
+    df['date'] = df['date'].astype(str)
+    return df
+
+
+def baseline(df) -> bytes:
+    return AnalysisResponse(data=df.to_dict(orient='records'), **SUMMARY).model_dump_json().encode()
+
+
+def timed(func, repeat: int):
+    best, body = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[250, 2_500, 25_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--precision', type=int, default=4)
+    args = parser.parse_args()
+
+    variants = [
+        ('records (current)', None),
+        ('records', dict(fmt='records')),
+        ('columnar', dict(fmt='columnar')),
+        (f'columnar p={args.precision}', dict(fmt='columnar', precision=args.precision)),
+        (f'columnar p={args.precision} gzip', dict(fmt='columnar', precision=args.precision, compression='gzip')),
+        ('arrow', dict(fmt='arrow')),
+        ('arrow zstd', dict(fmt='arrow', compression='zstd')),
+    ]
+
+    for n_rows in args.rows:
+        df = make_analysis_frame(n_rows)
+        print(f"\n{n_rows} rows")
+        print(f"{'format':>24} {'bytes':>12} {'time [ms]':>11} {'size vs current':>16}")
+        reference_size = None
+        for name, options in variants:
+            if options is None:
+                seconds, size = timed(lambda: baseline(df), args.repeat)
+                reference_size = size
+            else:
+                seconds, size = timed(lambda: render_analysis(df, SUMMARY, **options).body, args.repeat)
+            print(f"{name:>24} {size:>12,} {seconds * 1000:>11.2f} {size / reference_size:>15.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: row-wise evaluate_market_condition vs column-wise compute_signals.
+
+Usage:
+    python -m benchmarks.bench_signals [--sizes 1000 100000 1000000] [--max-reference-rows N]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from core.strategy import compute_signals, evaluate_market_condition
+
+
+def make_indicator_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    return pd.DataFrame({
+        'close': close,
+        'ma_50': close * (1 + rng.normal(0, 0.02, n_rows)),
+        'macd': rng.normal(0, 1, n_rows),
+        'rsi': rng.uniform(0, 100, n_rows),
+    })
+
+
+def run_reference(df: pd.DataFrame):
+    signals = df.apply(lambda row: evaluate_market_condition(row), axis=1)
+    return [x[0] for x in signals], [x[1] for x in signals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--max-reference-rows', type=int, default=None,
+                        help="Skip the row-wise reference above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'row-wise [s]':>14} {'vectorized [s]':>16} {'speedup':>9}")
+    for n_rows in args.sizes:
+        df = make_indicator_frame(n_rows)
+
+        start = time.perf_counter()
+        compute_signals(df)
+        vectorized = time.perf_counter() - start
+
+        if args.max_reference_rows is not None and n_rows > args.max_reference_rows:
+            print(f"{n_rows:>10} {'skipped':>14} {vectorized:>16.4f} {'-':>9}")
+            continue
+
+        start = time.perf_counter()
+        run_reference(df)
+        reference = time.perf_counter() - start
+        print(f"{n_rows:>10} {reference:>14.4f} {vectorized:>16.4f} {reference / vectorized:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: streamed vs plain /analyze for a long intraday range.
+
+Over HTTP (in-process uvicorn, synthetic provider, model and response caches off):
+time to the first byte, to the first data rows and to the end of the response, for
+POST /analyze (columnar) and POST /analyze/stream (NDJSON). In-process: peak memory
+allocated while serializing the rows, the whole columnar document vs one chunk at a time.
+
+Usage:
+    python -m benchmarks.bench_streaming [--start 2024-01-01] [--end 2024-02-01] [--interval 1m] [--chunk-size 2000]
+"""
+import argparse
+import threading
+import time
+import tracemalloc
+import requests
+from api.serialization import prepare_frame, render_analysis, select_fields, to_columns, widen_float32
+from api.streaming import encode_event
+from core import config
+from core.data_loader import compact_ohlcv, set_provider
+from core.pipeline import analyze_frame
+from core.synthetic import SyntheticProvider
+
+SUMMARY = {'ticker': 'BENCH', 'handle': '', 'anomalies_count': 0, 'llm_analysis': '', 'sentiment': '', 'action': ''}
+
+
+def time_plain(url: str, body: dict) -> dict:
+    t0 = time.perf_counter()
+    with requests.post(f"{url}/analyze", json=dict(body, format='columnar'), stream=True) as res:
+        res.raise_for_status()
+        chunks = res.iter_content(chunk_size=65536)
+        first = next(chunks)
+        first_byte = time.perf_counter() - t0
+        size = len(first) + sum(len(c) for c in chunks)
+    # Nothing can be drawn before the whole document is parsed
+    total = time.perf_counter() - t0
+    return {'first byte': first_byte, 'first rows': total, 'complete': total, 'MB': size / 1e6}
+
+
+def time_stream(url: str, body: dict, chunk_size: int) -> dict:
+    times, size = {}, 0
+    t0 = time.perf_counter()
+    with requests.post(f"{url}/analyze/stream", json=dict(body, chunk_size=chunk_size), stream=True) as res:
+        res.raise_for_status()
+        for line in res.iter_lines(chunk_size=65536):
+            size += len(line) + 1
+            if 'first byte' not in times:
+                times['first byte'] = time.perf_counter() - t0
+            if 'first rows' not in times and line.startswith(b'{"event":"rows"'):
+                times['first rows'] = time.perf_counter() - t0
+    times['complete'] = time.perf_counter() - t0
+    times['MB'] = size / 1e6
+    return times
+
+
+def serialization_peak(frame, chunk_size: int) -> tuple:
+    fields = select_fields(None)
+    tracemalloc.start()
+    render_analysis(frame, SUMMARY, fmt='columnar', precision=6)
+    whole = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    for offset in range(0, len(frame), chunk_size):
+        chunk = widen_float32(prepare_frame(frame.iloc[offset:offset + chunk_size], fields, 6), 6)
+        encode_event('rows', {'offset': offset, 'data': to_columns(chunk)})
+    chunked = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return whole, chunked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2024-02-01')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    import uvicorn
+    from api.main import app
+
+    config.MODEL_CACHE_ENABLED = False
+    config.RESPONSE_CACHE_ENABLED = False
+    set_provider(SyntheticProvider())
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    url = f"http://127.0.0.1:{args.port}/api"
+    body = {'ticker': args.ticker, 'start_date': args.start, 'end_date': args.end, 'interval': args.interval,
+            'language': 'en', 'precision': 6}
+    try:
+        results = {'plain': time_plain(url, body), 'stream': time_stream(url, body, args.chunk_size)}
+    finally:
+        server.should_exit = True
+
+    print(f"{'endpoint':>8} {'first byte [s]':>15} {'first rows [s]':>15} {'complete [s]':>13} {'size [MB]':>10}")
+    for name, r in results.items():
+        print(f"{name:>8} {r['first byte']:>15.3f} {r['first rows']:>15.3f} {r['complete']:>13.3f} {r['MB']:>10.2f}")
+
+    raw = compact_ohlcv(SyntheticProvider().fetch(args.ticker, args.start, args.end, interval=args.interval))
+    frame = analyze_frame(raw).assign(date=lambda d: d['date'].astype(str), action=lambda d: d['action'].astype(str))
+    whole, chunked = serialization_peak(frame, args.chunk_size)
+    print(f"\nSerialization peak for {len(frame)} rows: whole document {whole / 1e6:.1f} MB, "
+          f"{args.chunk_size}-row chunks {chunked / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
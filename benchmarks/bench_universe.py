@@ -0,0 +1,37 @@
+"""
+Benchmark: one cross-sectional Isolation Forest for a universe vs one fit per ticker.
+
+Usage:
+    python -m benchmarks.bench_universe [--tickers 50 200 500] [--rows 500] [--n-jobs -1]
+"""
+import argparse
+import time
+from core.anomaly import detect_anomalies, detect_universe_anomalies
+from core.features import add_technical_indicators
+from core.synthetic import generate_ohlcv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--rows', type=int, default=500, help="Feature rows per ticker")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+
+    print(f"{'tickers':>8} {'N fits [s]':>11} {'universe [s]':>13} {'speedup':>9}")
+    for n_tickers in args.tickers:
+        frames = {f"T{i}": add_technical_indicators(generate_ohlcv(args.rows + 200, seed=i)) for i in range(n_tickers)}
+
+        start = time.perf_counter()
+        for df in frames.values():
+            detect_anomalies(df, contamination=0.05)
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detect_universe_anomalies(frames, contamination=0.05, n_jobs=args.n_jobs)
+        universe = time.perf_counter() - start
+        print(f"{n_tickers:>8} {separate:>11.2f} {universe:>13.2f} {separate / universe:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Benchmark suite: every pipeline stage on seeded synthetic OHLCV histories
+(geometric Brownian motion with volume bursts and price shocks).
+
+Stages: features (add_technical_indicators), signals (compute_signals), signals_rowwise
+(evaluate_market_condition per row), anomalies (detect_anomalies), llm
+(MockLLM.generate_analysis), serialize_records / serialize_columnar (the /analyze
+response body) and pdf (render_pdf_report).
+
+Usage:
+    python -m benchmarks.suite run [--sizes 1000 10000 100000 1000000] [--stages ...] [--repeat 3] [--output results.json]
+    python -m benchmarks.suite compare BASELINE.json [--current results.json] [--threshold 0.25]
+
+`compare` without --current re-runs the (stage, size) pairs of the baseline. It exits with
+status 1 when any stage is slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from api.schemas import AnalysisResponse
+from api.serialization import render_analysis
+from core.anomaly import detect_anomalies
+from core.features import add_technical_indicators
+from core.llm import MockLLM
+from core.report import render_pdf_report
+from core.strategy import compute_signals, evaluate_market_condition
+from core.synthetic import generate_ohlcv
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'latest.json')
+# evaluate_market_condition is the row-wise reference; above this size it only adds minutes
+ROWWISE_MAX_ROWS = 100_000
+
+
+def make_history(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Benchmark input: hourly GBM bars with occasional volume bursts and price shocks,
+    so the anomaly detector and strategy rules see realistic outliers.
+    """
+    return generate_ohlcv(n_rows, seed=seed, freq='h', shock_prob=0.005, shock_scale=0.06,
+                          burst_prob=0.01, burst_scale=6.0)
+
+
+class Context:
+    """
+    Inputs for one history size, computed once outside the timed sections.
+    """
+
+    def __init__(self, n_rows: int):
+        self.ohlcv = make_history(n_rows)
+        self.features = add_technical_indicators(self.ohlcv.copy())
+        self.analyzed = detect_anomalies(self.features.copy(), contamination=0.05)
+        self.anomalies = self.analyzed[self.analyzed['anomaly'] == -1]
+        self.latest = self.analyzed.iloc[-1]
+        self.llm_result = MockLLM().generate_analysis('SYN', self.anomalies, self.latest, language='en')
+        self.response_frame = self.analyzed.assign(date=self.analyzed['date'].astype(str))
+        self.summary = {
+            'ticker': 'SYN',
+            'anomalies_count': len(self.anomalies),
+            'llm_analysis': self.llm_result['text'],
+            'sentiment': self.llm_result['sentiment'],
+            'action': self.llm_result['action'],
+        }
+
+
+def _serialize_records(ctx: Context) -> bytes:
+    # What analyze_stock does for the default response
+    return AnalysisResponse(data=ctx.response_frame.to_dict(orient='records'), **ctx.summary).model_dump_json().encode()
+
+
+# name -> (prepare(ctx) -> argument, run(argument)); prepare is not timed
+STAGES: Dict[str, Tuple[Callable[[Context], Any], Callable[[Any], Any]]] = {
+    'features': (lambda ctx: ctx.ohlcv.copy(), add_technical_indicators),
+    'signals': (lambda ctx: ctx.features, compute_signals),
+    'signals_rowwise': (lambda ctx: ctx.features, lambda df: df.apply(evaluate_market_condition, axis=1)),
+    'anomalies': (lambda ctx: ctx.features.copy(), lambda df: detect_anomalies(df, contamination=0.05)),
+    'llm': (lambda ctx: ctx, lambda ctx: MockLLM().generate_analysis('SYN', ctx.anomalies, ctx.latest, language='en')),
+    'serialize_records': (lambda ctx: ctx, _serialize_records),
+    'serialize_columnar': (lambda ctx: ctx, lambda ctx: render_analysis(ctx.response_frame, ctx.summary, fmt='columnar').body),
+    'pdf': (lambda ctx: ctx, lambda ctx: render_pdf_report('SYN', ctx.llm_result['text'], ctx.anomalies)),
+}
+
+
+def time_stage(name: str, ctx: Context, repeat: int) -> Dict[str, float]:
+    prepare, run = STAGES[name]
+    timings = []
+    for _ in range(repeat):
+        arg = prepare(ctx)
+        start = time.perf_counter()
+        run(arg)
+        timings.append(time.perf_counter() - start)
+    return {'min_s': min(timings), 'median_s': statistics.median(timings), 'mean_s': statistics.fmean(timings)}
+
+
+def run_suite(sizes: List[int], stages: Optional[List[str]] = None, repeat: int = 3,
+              max_rowwise_rows: Optional[int] = ROWWISE_MAX_ROWS, verbose: bool = True,
+              pairs: Optional[Set[Tuple[str, int]]] = None) -> Dict[str, Any]:
+    """
+    Runs the selected stages at every size and returns the machine-readable result document.
+    With `pairs`, only those (stage, rows) combinations run.
+    """
+    stages = stages or list(STAGES)
+    results = []
+    for n_rows in sizes:
+        ctx = Context(n_rows)
+        for name in stages:
+            if name == 'signals_rowwise' and max_rowwise_rows is not None and n_rows > max_rowwise_rows:
+                continue
+            if pairs is not None and (name, n_rows) not in pairs:
+                continue
+            timing = time_stage(name, ctx, repeat)
+            results.append({'stage': name, 'rows': n_rows, 'repeat': repeat, **timing})
+            if verbose:
+                print(f"{name:>20} {n_rows:>10} {timing['median_s'] * 1000:>12.3f} ms", flush=True)
+    return {'meta': environment(), 'results': results}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.25,
+            metric: str = 'median_s', min_delta: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Matches results on (stage, rows). A stage regresses when it is slower than the baseline
+    by more than `threshold` (relative) and `min_delta` seconds (to ignore timer noise).
+    """
+    reference = {(r['stage'], r['rows']): r[metric] for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        key = (result['stage'], result['rows'])
+        if key not in reference:
+            continue
+        before, after = reference[key], result[metric]
+        ratio = after / before if before > 0 else float('inf')
+        regression = ratio > 1 + threshold and after - before > min_delta
+        rows.append({'stage': key[0], 'rows': key[1], 'baseline_s': before, 'current_s': after,
+                     'ratio': ratio, 'regression': regression})
+    return rows
+
+
+def _save(document: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"Saved {len(document['results'])} results to {path}")
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the suite and save the results")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--max-rowwise-rows', type=int, default=ROWWISE_MAX_ROWS,
+                            help="Skip signals_rowwise above this size (0 = never skip)")
+    run_parser.add_argument('--output', default=DEFAULT_OUTPUT)
+
+    compare_parser = commands.add_parser('compare', help="Flag regressions against a stored baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('--current', default=None, help="Saved results (default: run the baseline's stages now)")
+    compare_parser.add_argument('--repeat', type=int, default=3)
+    compare_parser.add_argument('--threshold', type=float, default=0.25, help="Allowed relative slowdown")
+    compare_parser.add_argument('--metric', choices=['min_s', 'median_s', 'mean_s'], default='median_s')
+    compare_parser.add_argument('--output', default=None, help="Also save the fresh run here")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        print(f"{'stage':>20} {'rows':>10} {'median':>15}")
+        document = run_suite(args.sizes, args.stages, args.repeat, args.max_rowwise_rows or None)
+        _save(document, args.output)
+        return 0
+
+    baseline = _load(args.baseline)
+    if args.current:
+        current = _load(args.current)
+    else:
+        # Only what the baseline measured: no 1M-row signals_rowwise run without anything to compare to
+        pairs = {(r['stage'], r['rows']) for r in baseline['results'] if r['stage'] in STAGES}
+        sizes = sorted({rows for _, rows in pairs})
+        stages = list(dict.fromkeys(r['stage'] for r in baseline['results'] if r['stage'] in STAGES))
+        print(f"{'stage':>20} {'rows':>10} {'median':>15}")
+        current = run_suite(sizes, stages, args.repeat, max_rowwise_rows=None, pairs=pairs)
+        if args.output:
+            _save(current, args.output)
+
+    rows = compare(baseline, current, threshold=args.threshold, metric=args.metric)
+    print(f"\n{'stage':>20} {'rows':>10} {'baseline [ms]':>14} {'current [ms]':>13} {'ratio':>7}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['stage']:>20} {row['rows']:>10} {row['baseline_s'] * 1000:>14.3f} "
+              f"{row['current_s'] * 1000:>13.3f} {row['ratio']:>6.2f}x{flag}")
+    regressions = [r for r in rows if r['regression']]
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} out of {len(rows)} comparisons.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import hashlib
+import time
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional
+from core.ttl_cache import TTLCache
+
+
+@dataclass
+class StoredAnalysis:
+    ticker: str
+    data: pd.DataFrame  # analysis rows for the requested range
+    llm_analysis: str
+    sentiment: str
+    action: str
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def anomalies(self) -> pd.DataFrame:
+        return self.data[self.data['anomaly'] == -1]
+
+    def nbytes(self) -> int:
+        return int(self.data.memory_usage(deep=True).sum()) + len(self.llm_analysis)
+
+
+def handle_for(key: Hashable) -> str:
+    """
+    Handle of an analysis, derived from its normalized request so that identical
+    requests (and cached responses) map to the same handle.
+    """
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:24]
+
+
+class AnalysisStore:
+    """
+    Short-lived server-side store of analysis results, addressed by handle, so
+    follow-up calls (e.g. PDF reports) reference a result instead of uploading it again.
+    Bounded by entry count and DataFrame memory; entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 256 * 1024 * 1024, ttl: Optional[float] = 1800.0):
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes, sizeof=lambda entry: entry.nbytes())
+
+    def put(self, key: Hashable, result: StoredAnalysis) -> str:
+        handle = handle_for(key)
+        self.cache.set(handle, result)
+        return handle
+
+    def get(self, handle: str) -> Optional[StoredAnalysis]:
+        return self.cache.get(handle)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self.cache
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+_store: Optional[AnalysisStore] = None
+
+
+def get_analysis_store() -> AnalysisStore:
+    """
+    Returns the process-wide analysis store, built from configuration on first use.
+    """
+    global _store
+    if _store is None:
+        from core import config
+        _store = AnalysisStore(
+            max_entries=config.ANALYSIS_STORE_SIZE,
+            max_bytes=int(config.ANALYSIS_STORE_MAX_MB * 1024 * 1024),
+            ttl=config.ANALYSIS_STORE_TTL,
+        )
+    return _store
+
+
+def set_analysis_store(store: Optional[AnalysisStore]) -> None:
+    """
+    Replaces the process-wide analysis store (None rebuilds it from configuration).
+    """
+    global _store
+    _store = store
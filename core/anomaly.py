@@ -1,29 +1,48 @@
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
-from typing import List
+from typing import Dict, Iterable, List, Optional
+from core.detectors import ISOLATION_FOREST, contamination_thresholds, labels_at, raw_scores
 
-def detect_anomalies(df: pd.DataFrame, contamination: float = 0.05) -> pd.DataFrame:
+# Features for the model
+# We exclude Date and OHLC raw values usually, focusing on derived features (returns, indicators)
+FEATURE_COLUMNS = [
+    'returns', 'log_returns', 'volatility_14', 
+    'rsi', 'macd', 
+    'vol_spike',
+    'atr', 'adx', 'stoch_k', 'dist_ma_50', 'dist_ma_200'
+]
+
+# Features measured in price units; divided by close so tickers are comparable
+SCALE_DEPENDENT_COLUMNS = ['atr', 'macd']
+
+def build_model(contamination: float = 0.05, n_jobs: Optional[int] = None) -> IsolationForest:
     """
-    Detects anomalies in stock data using Isolation Forest.
-    
+    Returns an unfitted Isolation Forest with the settings used across the app.
+    """
+    return IsolationForest(contamination=contamination, random_state=42, n_jobs=n_jobs)
+
+def detect_anomalies(df: pd.DataFrame, contamination: float = 0.05, ticker: Optional[str] = None,
+                     method: str = ISOLATION_FOREST) -> pd.DataFrame:
+    """
+    Detects anomalies in stock data using Isolation Forest (or a linear-time detector).
+
     Args:
         df: DataFrame with features.
         contamination: The proportion of outliers in the data set.
+        ticker: When given (and the model cache is enabled), a fitted model for this
+            ticker is reused through the model registry and only new rows are scored.
+        method: 'isolation_forest' or one of the detectors in core.detectors
+            ('robust_z', 'hbos', 'hst'); all return the same columns.
         
     Returns:
-        DataFrame with an 'anomaly' column (-1 for anomaly, 1 for normal).
-    """
-    # Select features for the model
-    # We exclude Date and OHLC raw values usually, focusing on derived features (returns, indicators)
-    feature_cols = [
-        'returns', 'log_returns', 'volatility_14', 
-        'rsi', 'macd', 
-        'vol_spike',
-        'atr', 'adx', 'stoch_k', 'dist_ma_50', 'dist_ma_200'
-    ]
-    
+        DataFrame with an 'anomaly' column (-1 for anomaly, 1 for normal), 'anomaly_score'
+        (lower is more anomalous, negative for anomalies) and 'anomaly_raw', the model's
+        score before thresholding: it does not depend on contamination, so labels at other
+        levels come from quantiles of it (contamination_labels) without refitting.
+    """
     # Filter only columns that exist
-    features_to_use = [c for c in feature_cols if c in df.columns]
+    features_to_use = [c for c in FEATURE_COLUMNS if c in df.columns]
     
     if not features_to_use:
         print("No features available for anomaly detection.")
@@ -36,14 +55,92 @@ def detect_anomalies(df: pd.DataFrame, contamination: float = 0.05) -> pd.DataFr
         print("Not enough data points for reliable anomaly detection.")
         df['anomaly'] = 1
         df['anomaly_score'] = 0.0
+        df['anomaly_raw'] = 0.0
         return df
 
-    # Initialize and fit
-    iso_forest = IsolationForest(contamination=contamination, random_state=42)
-    df['anomaly'] = iso_forest.fit_predict(X)
-    df['anomaly_score'] = iso_forest.decision_function(X) # lower is more anomalous
-    
-    # Map -1 to True (Anomaly) and 1 to False (Normal) for easier handling if preferred
-    # But usually keeping -1/1 is standard Scikit-learn
-    
+    from core import config
+    if method != ISOLATION_FOREST:
+        raw = raw_scores(method, X)
+    elif ticker is not None and config.MODEL_CACHE_ENABLED:
+        # Reuse a cached model when possible
+        from core.model_registry import get_registry
+        raw = get_registry().score_samples(ticker, X, contamination)
+    else:
+        # Initialize and fit
+        raw = build_model(contamination).fit(X).score_samples(X)
+
+    # Same rule as IsolationForest.predict: the offset is the contamination quantile of the
+    # raw scores, and the decision function is the raw score minus the offset
+    threshold = contamination_thresholds(raw, [contamination])[float(contamination)]
+    df['anomaly'] = labels_at(raw, threshold)
+    df['anomaly_score'] = raw - threshold
+    df['anomaly_raw'] = raw
     return df
+
+def contamination_labels(df: pd.DataFrame, levels: Iterable[float]) -> pd.DataFrame:
+    """
+    Labels of a detect_anomalies result at several contamination levels, from its one fit:
+    each column equals the 'anomaly' column detect_anomalies returns at that level.
+
+    Returns:
+        DataFrame indexed like df with one column of labels (-1/1) per level.
+    """
+    thresholds = contamination_thresholds(df['anomaly_raw'], levels)
+    return pd.DataFrame({level: labels_at(df['anomaly_raw'], threshold) for level, threshold in thresholds.items()},
+                        index=df.index)
+
+
+def universe_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the model features of one ticker with scale-dependent columns
+    (see SCALE_DEPENDENT_COLUMNS) expressed relative to the close price.
+    """
+    X = df[[c for c in FEATURE_COLUMNS if c in df.columns]].copy()
+    for col in SCALE_DEPENDENT_COLUMNS:
+        if col in X.columns:
+            X[col] = X[col] / df['close']
+    return X
+
+def detect_universe_anomalies(frames: Dict[str, pd.DataFrame], contamination: float = 0.05,
+                              n_jobs: Optional[int] = None) -> pd.DataFrame:
+    """
+    Fits one Isolation Forest across many tickers ("unusual compared with the market").
+
+    Per-ticker feature matrices are normalized (universe_features), stacked and scored
+    by a single model, instead of one fit per ticker.
+
+    Args:
+        frames: Ticker -> DataFrame with features (output of add_technical_indicators).
+        contamination: The proportion of outliers across the whole universe.
+        n_jobs: Parallel jobs for fitting and scoring the forest (-1 for all cores).
+
+    Returns:
+        Long DataFrame with columns ticker, date, anomaly, anomaly_score.
+    """
+    parts = []
+    for ticker, df in frames.items():
+        X = universe_features(df)
+        X.insert(0, 'date', df['date'].to_numpy())
+        X.insert(0, 'ticker', ticker)
+        parts.append(X)
+
+    if not parts:
+        return pd.DataFrame(columns=['ticker', 'date', 'anomaly', 'anomaly_score'])
+
+    stacked = pd.concat(parts, ignore_index=True)
+    features = [c for c in FEATURE_COLUMNS if c in stacked.columns]
+    X = stacked[features].replace([np.inf, -np.inf], np.nan)
+    valid = X.notna().all(axis=1).to_numpy()
+
+    result = stacked[['ticker', 'date']].copy()
+    result['anomaly'] = 1
+    result['anomaly_score'] = 0.0
+
+    if valid.sum() < 50:
+        print("Not enough data points for reliable anomaly detection.")
+        return result
+
+    model = build_model(contamination, n_jobs=n_jobs)
+    result.loc[valid, 'anomaly'] = model.fit_predict(X[valid])
+    result.loc[valid, 'anomaly_score'] = model.decision_function(X[valid])
+    return result
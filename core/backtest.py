@@ -0,0 +1,252 @@
+"""
+Vectorized backtests of the strategy signals.
+
+Signals become positions: BUY goes long, SELL goes flat (short with `allow_short`) and HOLD
+keeps the previous position. A position taken at a bar's close earns the next bar's return,
+and every change of position pays `fee` per unit of capital traded.
+
+`backtest` runs the action column of one analysis. `evaluate` recomputes the signals for a
+whole grid of parameter sets at once from (parameter sets x bars) matrices: the RSI
+thresholds of the action and the weights and cut-offs of the sentiment score in
+evaluate_market_condition. `sweep` spreads a grid over tickers and the shared process pool;
+the indicator arrays are placed once in shared memory and mapped by every worker.
+"""
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from core.strategy import ACTION_LABELS
+
+# Parameters of evaluate_market_condition, with its hard-coded values as defaults
+DEFAULT_PARAMS = {
+    'rsi_buy': 30.0,    # action BUY below
+    'rsi_sell': 70.0,   # action SELL above
+    'w_trend': 1.0,     # sentiment weight of close vs ma_50
+    'w_macd': 1.0,      # sentiment weight of the MACD histogram's sign
+    'w_rsi': 0.5,       # sentiment weight of RSI vs 50
+    'bullish': 1.0,     # sentiment BULLISH above
+    'bearish': -1.0,    # sentiment BEARISH below
+}
+# 'action': trade the RSI action; 'sentiment': long while BULLISH, out (or short) while BEARISH
+SIGNALS = ('action', 'sentiment')
+METRICS = ('total_return', 'cagr', 'sharpe', 'max_drawdown', 'turnover', 'trades', 'fees', 'exposure')
+# Indicator columns the signals are computed from
+BACKTEST_OUTPUTS = ('rsi', 'macd', 'ma_50')
+ARRAY_COLUMNS = ('close',) + BACKTEST_OUTPUTS
+
+# Parameter sets evaluated per matrix pass (bounds memory at about 10 x chunk x bars floats)
+CHUNK_SIZE = 256
+
+
+def signal_arrays(df: pd.DataFrame) -> np.ndarray:
+    """
+    The columns the signals need (close, rsi, macd, ma_50) as one (4, bars) float64 array.
+    """
+    return np.ascontiguousarray(np.vstack([df[c].to_numpy(dtype=np.float64) for c in ARRAY_COLUMNS]))
+
+
+def parameter_grid(grid: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of the given values; parameters not in `grid` keep their defaults.
+    Raises ValueError for unknown parameter names.
+
+    Returns:
+        Parameter name -> (P,) array, one entry per parameter set.
+    """
+    unknown = set(grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}. Use: {', '.join(DEFAULT_PARAMS)}.")
+    names = list(DEFAULT_PARAMS)
+    values = [list(grid[name]) if name in grid else [DEFAULT_PARAMS[name]] for name in names]
+    combos = np.array(list(itertools.product(*values)), dtype=np.float64).reshape(-1, len(names))
+    return {name: combos[:, i] for i, name in enumerate(names)}
+
+
+def _targets(arrays: np.ndarray, params: Dict[str, np.ndarray], signal: str, allow_short: bool) -> np.ndarray:
+    # Target position per (parameter set, bar); NaN where the signal says hold
+    close, rsi, macd, ma_50 = arrays
+    if signal == 'action':
+        buy = rsi[None, :] < params['rsi_buy'][:, None]
+        sell = rsi[None, :] > params['rsi_sell'][:, None]
+    else:
+        # Same terms as compute_signals (comparisons against NaN are False)
+        trend = np.where(close > ma_50, 1.0, -1.0)
+        momentum = np.where(macd > 0, 1.0, -1.0)
+        strength = np.where(rsi > 50, 1.0, np.where(rsi < 50, -1.0, 0.0))
+        score = (params['w_trend'][:, None] * trend + params['w_macd'][:, None] * momentum
+                 + params['w_rsi'][:, None] * strength)
+        buy = score > params['bullish'][:, None]
+        sell = score < params['bearish'][:, None]
+    target = np.full(buy.shape, np.nan)
+    target[sell] = -1.0 if allow_short else 0.0
+    # BUY is checked first in evaluate_market_condition
+    target[buy] = 1.0
+    return target
+
+
+def _hold(target: np.ndarray) -> np.ndarray:
+    # Forward-fills the last target along the bars; flat before the first one
+    index = np.where(np.isnan(target), 0, np.arange(target.shape[1]))
+    np.maximum.accumulate(index, axis=1, out=index)
+    positions = np.take_along_axis(target, index, axis=1)
+    return np.nan_to_num(positions, nan=0.0)
+
+
+def _returns(close: np.ndarray, positions: np.ndarray, fee: float) -> Tuple[np.ndarray, np.ndarray]:
+    # (units traded, net strategy return) per (parameter set, bar)
+    trades = np.abs(np.diff(positions, axis=1, prepend=0.0))
+    net = -fee * trades
+    net[:, 1:] += positions[:, :-1] * (close[1:] / close[:-1] - 1)[None, :]
+    return trades, net
+
+
+def _metrics(close: np.ndarray, positions: np.ndarray, fee: float, periods_per_year: float) -> Dict[str, np.ndarray]:
+    n_bars = positions.shape[1]
+    trades, net = _returns(close, positions, fee)
+    equity = np.cumprod(1 + net, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    years = n_bars / periods_per_year
+    final = equity[:, -1]
+    std = net.std(axis=1)
+    return {
+        'total_return': final - 1,
+        'cagr': np.where(final > 0, np.abs(final) ** (1 / years) - 1, -1.0),
+        'sharpe': np.divide(net.mean(axis=1), std, out=np.zeros_like(std), where=std > 0) * np.sqrt(periods_per_year),
+        'max_drawdown': (1 - equity / peak).max(axis=1),
+        'turnover': trades.sum(axis=1) / years,
+        'trades': np.count_nonzero(trades, axis=1).astype(np.float64),
+        'fees': fee * trades.sum(axis=1),
+        'exposure': np.count_nonzero(positions, axis=1) / n_bars,
+    }
+
+
+def evaluate(arrays: np.ndarray, params: Dict[str, np.ndarray], signal: str = 'action', fee: float = 0.001,
+             allow_short: bool = False, periods_per_year: float = 252, chunk_size: int = CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Backtests every parameter set on one ticker's signal arrays.
+
+    Args:
+        arrays: Output of signal_arrays.
+        params: Output of parameter_grid (P parameter sets).
+        signal: 'action' or 'sentiment' (see SIGNALS).
+        fee: Cost per unit of capital traded (0.001 = 10 bps).
+        allow_short: SELL (or BEARISH) goes short instead of flat.
+        periods_per_year: Bars per year, for the annualized metrics.
+
+    Returns:
+        Metric name -> (P,) array (see METRICS).
+    """
+    if signal not in SIGNALS:
+        raise ValueError(f"Unknown signal '{signal}'. Use one of: {', '.join(SIGNALS)}.")
+    n_sets = len(next(iter(params.values())))
+    if arrays.shape[1] < 2:
+        return {name: np.zeros(n_sets) for name in METRICS}
+    parts = []
+    for lo in range(0, n_sets, chunk_size):
+        chunk = {name: values[lo:lo + chunk_size] for name, values in params.items()}
+        positions = _hold(_targets(arrays, chunk, signal, allow_short))
+        parts.append(_metrics(arrays[0], positions, fee, periods_per_year))
+    return {name: np.concatenate([part[name] for part in parts]) for name in METRICS}
+
+
+def positions_from_actions(actions, allow_short: bool = False) -> np.ndarray:
+    """
+    Positions held after each bar for a BUY/SELL/HOLD column.
+    """
+    actions = np.asarray(actions, dtype=object)
+    target = np.full(len(actions), np.nan)
+    target[actions == ACTION_LABELS[0]] = -1.0 if allow_short else 0.0
+    target[actions == ACTION_LABELS[2]] = 1.0
+    return _hold(target[None, :])[0]
+
+
+def backtest(df: pd.DataFrame, params: Optional[Dict[str, float]] = None, signal: str = 'action',
+             fee: float = 0.001, allow_short: bool = False,
+             periods_per_year: float = 252) -> Tuple[Dict[str, float], pd.DataFrame]:
+    """
+    Backtests one analysis (output of add_technical_indicators).
+
+    Args:
+        params: Signal parameters (see DEFAULT_PARAMS). Without them the 'action' signal is
+            the frame's action column as computed; otherwise the signal is recomputed.
+
+    Returns:
+        (metrics, frame with date, position, strategy return and equity per bar).
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    if params is None and signal == 'action':
+        positions = positions_from_actions(df['action'], allow_short)[None, :]
+    else:
+        if signal not in SIGNALS:
+            raise ValueError(f"Unknown signal '{signal}'. Use one of: {', '.join(SIGNALS)}.")
+        grid = parameter_grid({name: [value] for name, value in (params or {}).items()})
+        positions = _hold(_targets(signal_arrays(df), grid, signal, allow_short))
+    metrics = {name: float(values[0]) for name, values in _metrics(close, positions, fee, periods_per_year).items()}
+    net = _returns(close, positions, fee)[1][0]
+    curve = pd.DataFrame({'date': df['date'].to_numpy(), 'position': positions[0], 'returns': net,
+                          'equity': np.cumprod(1 + net)})
+    return metrics, curve
+
+
+# --- Sweeps ---
+
+def _evaluate_chunk(arrays: np.ndarray, offsets: Dict[str, Tuple[int, int]], params: Dict[str, np.ndarray],
+                    kwargs: Dict) -> Dict[str, Dict[str, np.ndarray]]:
+    # Pool task of a sweep (see map_shared)
+    return _evaluate_frames(arrays, offsets, params, **kwargs)
+
+
+def _evaluate_frames(arrays: np.ndarray, offsets: Dict[str, Tuple[int, int]], params: Dict[str, np.ndarray],
+                     **kwargs) -> Dict[str, Dict[str, np.ndarray]]:
+    return {ticker: evaluate(arrays[:, lo:hi], params, **kwargs) for ticker, (lo, hi) in offsets.items()}
+
+
+def sweep(frames: Dict[str, pd.DataFrame], grid: Dict[str, Sequence[float]], signal: str = 'action',
+          fee: float = 0.001, allow_short: bool = False, periods_per_year: float = 252,
+          max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Backtests every parameter set of `grid` on every ticker.
+
+    Args:
+        frames: Ticker -> DataFrame with close, rsi, macd and ma_50 (BACKTEST_OUTPUTS).
+        grid: Parameter name -> values (see DEFAULT_PARAMS), combined as a cartesian product.
+        max_workers: Pool size; defaults to config.BATCH_MAX_WORKERS (1 runs in-process).
+
+    Returns:
+        Long DataFrame: ticker, the parameters and the METRICS, one row per (ticker, parameter set).
+    """
+    if max_workers is None:
+        from core import config
+        max_workers = config.BATCH_MAX_WORKERS
+    params = parameter_grid(grid)
+    if signal not in SIGNALS:
+        raise ValueError(f"Unknown signal '{signal}'. Use one of: {', '.join(SIGNALS)}.")
+    n_sets = len(params['rsi_buy'])
+    kwargs = {'signal': signal, 'fee': fee, 'allow_short': allow_short, 'periods_per_year': periods_per_year}
+
+    # All tickers side by side in one array
+    parts = [signal_arrays(df) for df in frames.values()]
+    bounds = np.cumsum([0] + [part.shape[1] for part in parts])
+    offsets = {ticker: (int(bounds[i]), int(bounds[i + 1])) for i, ticker in enumerate(frames)}
+    arrays = np.ascontiguousarray(np.hstack(parts)) if parts else np.empty((len(ARRAY_COLUMNS), 0))
+
+    n_tasks = min(max_workers * 2, -(-n_sets // CHUNK_SIZE))
+    if max_workers <= 1 or n_tasks <= 1:
+        results = [(0, _evaluate_frames(arrays, offsets, params, **kwargs))]
+    else:
+        from core.pipeline import map_shared
+        size = -(-n_sets // n_tasks)
+        starts = range(0, n_sets, size)
+        parts = map_shared(arrays, _evaluate_chunk,
+                           [(offsets, {k: v[lo:lo + size] for k, v in params.items()}, kwargs) for lo in starts],
+                           max_workers)
+        results = list(zip(starts, parts))
+
+    tables: List[pd.DataFrame] = []
+    for ticker in frames:
+        metrics = {name: np.concatenate([part[ticker][name] for _, part in results]) for name in METRICS}
+        table = pd.DataFrame({'ticker': ticker, **params, **metrics})
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame(columns=['ticker', *DEFAULT_PARAMS, *METRICS])
+    return pd.concat(tables, ignore_index=True)
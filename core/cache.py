@@ -0,0 +1,258 @@
+import json
+import os
+import re
+import threading
+import pandas as pd
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from core.data_loader import DataProvider, REQUIRED_COLUMNS, interval_kwargs
+from core.intervals import DAILY
+from core.ttl_cache import TTLCache
+from core.utils import TRADING_DAY, trades_around_the_clock
+
+DateRange = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """
+    Sorts half-open [start, end) ranges and coalesces overlapping or touching ones.
+    """
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(start: pd.Timestamp, end: pd.Timestamp, held: List[DateRange]) -> List[DateRange]:
+    """
+    Returns the parts of [start, end) not covered by the (merged) held ranges.
+    """
+    gaps: List[DateRange] = []
+    cursor = start
+    for held_start, held_end in held:
+        if held_end <= cursor:
+            continue
+        if held_start >= end:
+            break
+        if held_start > cursor:
+            gaps.append((cursor, held_start))
+        cursor = max(cursor, held_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def has_session(start: pd.Timestamp, end: pd.Timestamp, ticker: str = '') -> bool:
+    """
+    True if [start, end) contains a trading session on the ticker's calendar (every day
+    for markets trading around the clock, the exchange calendar otherwise).
+    """
+    if trades_around_the_clock(ticker):
+        return start < end
+    return len(pd.date_range(start.normalize(), end, freq=TRADING_DAY, inclusive='left')) > 0
+
+
+class OHLCVCache(DataProvider):
+    """
+    Persistent on-disk OHLCV cache in front of another provider.
+
+    Each ticker is stored as '<ticker>.parquet' plus a '<ticker>.json' sidecar that lists the
+    [start, end) date ranges already fetched ('<ticker>@<interval>.*' for intraday bars). A request only sends its missing gaps upstream,
+    merges them into the file and serves the rest from disk. Coverage is never recorded for
+    the current day, so a still-open session is always refreshed.
+
+    An empty answer is recorded as held when the gap holds no trading session (weekends,
+    holidays) or ends before the ticker's first bar (before the listing). Any other empty
+    answer may be a failed download: it is only remembered in memory for `empty_ttl`
+    seconds, so unknown or delisted tickers do not go upstream on every request.
+    """
+
+    def __init__(self, upstream: DataProvider, cache_dir: str, today: Optional[Callable[[], date]] = None,
+                 empty_ttl: float = 900.0):
+        self.upstream = upstream
+        self.cache_dir = cache_dir
+        self._today = today or date.today
+        self._empty = TTLCache(max_entries=4096, ttl=empty_ttl)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.gap_fetches = 0
+        self.rows_fetched = 0
+        self.bytes_fetched = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def intervals(self):
+        return self.upstream.intervals
+
+    # --- Storage helpers ---
+
+    def _base_path(self, ticker: str, interval: str = DAILY) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker.upper())
+        if interval != DAILY:
+            safe += '@' + interval
+        return os.path.join(self.cache_dir, safe)
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    def _load_ranges(self, ticker: str, interval: str = DAILY) -> List[DateRange]:
+        path = self._base_path(ticker, interval) + '.json'
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            meta = json.load(f)
+        return merge_ranges([(pd.Timestamp(s), pd.Timestamp(e)) for s, e in meta.get('ranges', [])])
+
+    def _save_ranges(self, ticker: str, ranges: List[DateRange], interval: str = DAILY) -> None:
+        path = self._base_path(ticker, interval) + '.json'
+        meta = {'ticker': ticker.upper(), 'ranges': [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d')] for s, e in ranges]}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def _load_frame(self, ticker: str, interval: str = DAILY) -> pd.DataFrame:
+        path = self._base_path(ticker, interval) + '.parquet'
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+        return pd.read_parquet(path)
+
+    def _save_frame(self, ticker: str, df: pd.DataFrame, interval: str = DAILY) -> None:
+        path = self._base_path(ticker, interval) + '.parquet'
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _first_bar(self, ticker: str, interval: str, fetched: List[pd.DataFrame]) -> Optional[pd.Timestamp]:
+        # Earliest bar stored or just downloaded (None when the ticker has none)
+        firsts = [part['date'].min() for part in fetched]
+        path = self._base_path(ticker, interval) + '.parquet'
+        if os.path.exists(path):
+            stored = pd.read_parquet(path, columns=['date'])['date']
+            if not stored.empty:
+                firsts.append(pd.Timestamp(stored.min()))
+        return min(firsts) if firsts else None
+
+    # --- DataProvider ---
+
+    def fetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        return self.fetch_many([ticker], start_date, end_date, interval)[ticker]
+
+    def fetch_many(self, tickers: List[str], start_date: str, end_date: str,
+                   interval: str = DAILY) -> Dict[str, pd.DataFrame]:
+        """
+        Serves several tickers, sending each distinct missing gap upstream as one
+        grouped call for every ticker that lacks it.
+        """
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        today = pd.Timestamp(self._today())
+        unique = list(dict.fromkeys(tickers))
+
+        # Lock in a fixed order so overlapping batches cannot deadlock
+        locks = [self._lock_for(t) for t in sorted({t.upper() for t in unique})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            held = {t: self._load_ranges(t, interval) for t in unique}
+            gaps = {t: [gap for gap in missing_ranges(start, end, held[t])
+                        if self._empty.get((t.upper(), interval) + gap) is None] for t in unique}
+
+            by_gap: Dict[DateRange, List[str]] = {}
+            for ticker, ticker_gaps in gaps.items():
+                for gap in ticker_gaps:
+                    by_gap.setdefault(gap, []).append(ticker)
+
+            fetched: Dict[str, List[pd.DataFrame]] = {t: [] for t in unique}
+            empty: Dict[str, List[DateRange]] = {t: [] for t in unique}
+            for (gap_start, gap_end), group in by_gap.items():
+                parts = self.upstream.fetch_many(group, gap_start.strftime('%Y-%m-%d'), gap_end.strftime('%Y-%m-%d'),
+                                                 **interval_kwargs(interval))
+                with self._stats_lock:
+                    self.gap_fetches += 1
+                for ticker in group:
+                    part = parts.get(ticker)
+                    if part is not None and not part.empty:
+                        part = part.copy()
+                        part['date'] = pd.to_datetime(part['date'])
+                        fetched[ticker].append(part)
+                        with self._stats_lock:
+                            self.rows_fetched += len(part)
+                            self.bytes_fetched += int(part.memory_usage(deep=True).sum())
+                    elif has_session(gap_start, gap_end, ticker):
+                        # Before the listing or a failed download, told apart below
+                        empty[ticker].append((gap_start, gap_end))
+                        continue
+                    # Empty answers (weekends, holidays) still count as held, except for today
+                    held[ticker].append((gap_start, min(gap_end, today)))
+
+            for ticker, ticker_empty in empty.items():
+                first = self._first_bar(ticker, interval, fetched[ticker]) if ticker_empty else None
+                for gap_start, gap_end in ticker_empty:
+                    if first is not None and gap_end <= first:
+                        held[ticker].append((gap_start, min(gap_end, today)))
+                    else:
+                        self._empty.set((ticker.upper(), interval, gap_start, gap_end), True)
+
+            result = {}
+            for ticker in unique:
+                df = self._load_frame(ticker, interval)
+                if gaps[ticker]:
+                    if fetched[ticker]:
+                        frames = [df] + fetched[ticker] if not df.empty else fetched[ticker]
+                        df = pd.concat(frames, ignore_index=True)
+                        df['date'] = pd.to_datetime(df['date'])
+                        df = df.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
+                        self._save_frame(ticker, df, interval)
+                    self._save_ranges(ticker, merge_ranges(held[ticker]), interval)
+
+                with self._stats_lock:
+                    if gaps[ticker]:
+                        self.misses += 1
+                    else:
+                        self.hits += 1
+
+                if not df.empty:
+                    mask = (df['date'] >= start) & (df['date'] < end)
+                    df = df.loc[mask].reset_index(drop=True)
+                result[ticker] = df
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+        return result
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """
+        Removes cached files (every interval) for one ticker, or for every ticker if none is given.
+        """
+        names = {os.path.splitext(f)[0] for f in os.listdir(self.cache_dir)}
+        if ticker is not None:
+            prefix = os.path.basename(self._base_path(ticker))
+            names = {n for n in names if n == prefix or n.startswith(prefix + '@')}
+        bases = [os.path.join(self.cache_dir, name) for name in names]
+        for base in bases:
+            for suffix in ('.parquet', '.json'):
+                if os.path.exists(base + suffix):
+                    os.remove(base + suffix)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'gap_fetches': self.gap_fetches,
+                'rows_fetched': self.rows_fetched,
+                'bytes_fetched': self.bytes_fetched,
+                'empty_ranges': len(self._empty),
+            }
@@ -0,0 +1,100 @@
+import os
+from dotenv import load_dotenv
+
+# Load variables from a local .env file if present (see .env.example)
+load_dotenv()
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Market Data Provider: 'yfinance' (network, optionally cached), 'local' (memory-mapped store) or 'synthetic'
+DATA_PROVIDER = os.getenv("STOCKGUARD_DATA_PROVIDER", "yfinance").strip().lower()
+LOCAL_STORE_DIR = os.getenv("STOCKGUARD_LOCAL_STORE_DIR", "market_data")
+
+# Data Cache (yfinance provider only)
+CACHE_ENABLED = _env_flag("STOCKGUARD_CACHE_ENABLED", True)
+CACHE_DIR = os.getenv("STOCKGUARD_CACHE_DIR", "data_cache")
+# Seconds an empty upstream answer (unknown or delisted ticker, failed download) is remembered
+CACHE_EMPTY_TTL = float(os.getenv("STOCKGUARD_CACHE_EMPTY_TTL", "900"))
+
+# Feature Engineering: 'numpy' (fused kernel) or 'ta' (reference implementation)
+FEATURE_ENGINE = os.getenv("STOCKGUARD_FEATURE_ENGINE", "numpy")
+# Extra trading sessions fetched beyond the indicators' warm-up (unscheduled closures, late listings)
+WARMUP_MARGIN_BARS = int(os.getenv("STOCKGUARD_WARMUP_MARGIN_BARS", "5"))
+
+# Batch Analysis
+BATCH_MAX_WORKERS = int(os.getenv("STOCKGUARD_BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_MAX_TICKERS = int(os.getenv("STOCKGUARD_BATCH_MAX_TICKERS", "500"))
+
+# Anomaly Model Cache (fitted Isolation Forests reused between requests)
+MODEL_CACHE_ENABLED = _env_flag("STOCKGUARD_MODEL_CACHE_ENABLED", True)
+MODEL_CACHE_SIZE = int(os.getenv("STOCKGUARD_MODEL_CACHE_SIZE", "256"))
+MODEL_CACHE_TTL = float(os.getenv("STOCKGUARD_MODEL_CACHE_TTL", "3600"))
+MODEL_CACHE_DIR = os.getenv("STOCKGUARD_MODEL_CACHE_DIR", "")
+MODEL_REFIT_EVERY = int(os.getenv("STOCKGUARD_MODEL_REFIT_EVERY", "20"))
+MODEL_DRIFT_FACTOR = float(os.getenv("STOCKGUARD_MODEL_DRIFT_FACTOR", "3.0"))
+
+# Streaming /analyze: largest 'rows' event a client may ask for (rows per chunk)
+STREAM_MAX_CHUNK_ROWS = int(os.getenv("STOCKGUARD_STREAM_MAX_CHUNK_ROWS", "10000"))
+
+# Live Monitoring (/api/live WebSocket): stored bars replayed from the data provider stand in for a live feed
+LIVE_INTERVAL = os.getenv("STOCKGUARD_LIVE_INTERVAL", "1d")
+LIVE_REPLAY_START = os.getenv("STOCKGUARD_LIVE_REPLAY_START", "")
+LIVE_REPLAY_DAYS = int(os.getenv("STOCKGUARD_LIVE_REPLAY_DAYS", "90"))
+LIVE_REPLAY_SPEED = float(os.getenv("STOCKGUARD_LIVE_REPLAY_SPEED", "1.0"))
+LIVE_HISTORY_BARS = int(os.getenv("STOCKGUARD_LIVE_HISTORY_BARS", "252"))
+LIVE_CONTAMINATION = float(os.getenv("STOCKGUARD_LIVE_CONTAMINATION", "0.05"))
+LIVE_MAX_IDLE_TICKERS = int(os.getenv("STOCKGUARD_LIVE_MAX_IDLE_TICKERS", "256"))
+LIVE_MAX_SUBSCRIPTIONS = int(os.getenv("STOCKGUARD_LIVE_MAX_SUBSCRIPTIONS", "50"))
+
+# Walk-Forward Anomaly Mode: models refitted every N bars on a trailing window (no look-ahead)
+WALK_FORWARD_WINDOW = int(os.getenv("STOCKGUARD_WALK_FORWARD_WINDOW", "504"))
+WALK_FORWARD_REFIT_EVERY = int(os.getenv("STOCKGUARD_WALK_FORWARD_REFIT_EVERY", "21"))
+
+# Backtests (/api/backtest): cost per trade and the largest parameter grid a sweep may evaluate
+BACKTEST_FEE_BPS = float(os.getenv("STOCKGUARD_BACKTEST_FEE_BPS", "10"))
+BACKTEST_MAX_PARAM_SETS = int(os.getenv("STOCKGUARD_BACKTEST_MAX_PARAM_SETS", "100000"))
+
+# LLM Analyst: 'mock' (algorithmic text) or 'http' (OpenAI-compatible chat completions endpoint at LLM_URL).
+# Calls longer than LLM_TIMEOUT seconds fall back to the algorithmic text; answers are cached per market context
+LLM_PROVIDER = os.getenv("STOCKGUARD_LLM_PROVIDER", "mock")
+LLM_URL = os.getenv("STOCKGUARD_LLM_URL", "http://localhost:8080/v1/chat/completions")
+LLM_MODEL = os.getenv("STOCKGUARD_LLM_MODEL", "")
+LLM_API_KEY = os.getenv("STOCKGUARD_LLM_API_KEY", "")
+LLM_TIMEOUT = float(os.getenv("STOCKGUARD_LLM_TIMEOUT", "10"))
+LLM_MAX_CONCURRENCY = int(os.getenv("STOCKGUARD_LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_BATCH = int(os.getenv("STOCKGUARD_LLM_MAX_BATCH", "8"))
+LLM_CACHE_SIZE = int(os.getenv("STOCKGUARD_LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("STOCKGUARD_LLM_CACHE_TTL", "86400"))
+
+# Universe Anomaly Mode: Isolation Forest n_jobs for the single cross-sectional fit
+UNIVERSE_N_JOBS = int(os.getenv("STOCKGUARD_UNIVERSE_N_JOBS", "-1"))
+
+# API Response Cache (/api/analyze): historical ranges are immutable, ranges including today are short-lived
+RESPONSE_CACHE_ENABLED = _env_flag("STOCKGUARD_RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_SIZE = int(os.getenv("STOCKGUARD_RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("STOCKGUARD_RESPONSE_CACHE_MAX_MB", "256"))
+RESPONSE_CACHE_TTL_HISTORICAL = float(os.getenv("STOCKGUARD_RESPONSE_CACHE_TTL_HISTORICAL", "86400"))
+RESPONSE_CACHE_TTL_LIVE = float(os.getenv("STOCKGUARD_RESPONSE_CACHE_TTL_LIVE", "60"))
+RESPONSE_CACHE_DIR = os.getenv("STOCKGUARD_RESPONSE_CACHE_DIR", "")
+
+# PDF Report Jobs: render pool, pending-job limit and eviction of finished documents
+REPORT_WORKERS = int(os.getenv("STOCKGUARD_REPORT_WORKERS", "2"))
+REPORT_MAX_QUEUE = int(os.getenv("STOCKGUARD_REPORT_MAX_QUEUE", "64"))
+REPORT_MAX_JOBS = int(os.getenv("STOCKGUARD_REPORT_MAX_JOBS", "256"))
+REPORT_TTL = float(os.getenv("STOCKGUARD_REPORT_TTL", "600"))
+REPORT_MAX_MB = float(os.getenv("STOCKGUARD_REPORT_MAX_MB", "128"))
+REPORT_SPOOL_KB = float(os.getenv("STOCKGUARD_REPORT_SPOOL_KB", "1024"))
+
+# Analysis Handles: results kept server-side so /report can reference them instead of re-uploading
+ANALYSIS_STORE_SIZE = int(os.getenv("STOCKGUARD_ANALYSIS_STORE_SIZE", "1024"))
+ANALYSIS_STORE_MAX_MB = float(os.getenv("STOCKGUARD_ANALYSIS_STORE_MAX_MB", "256"))
+ANALYSIS_STORE_TTL = float(os.getenv("STOCKGUARD_ANALYSIS_STORE_TTL", "1800"))
+
+# Instrumentation: per-stage timings on /metrics (Prometheus text format) and Server-Timing headers
+METRICS_ENABLED = _env_flag("STOCKGUARD_METRICS_ENABLED", True)
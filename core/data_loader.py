@@ -1,50 +1,240 @@
+import asyncio
+import numpy as np
 import yfinance as yf
 import pandas as pd
-from typing import Optional
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from core.intervals import DAILY, INTERVALS, get_interval, split_range
 
-def fetch_data(ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+REQUIRED_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def interval_kwargs(interval: str) -> Dict[str, str]:
+    """
+    Keyword arguments selecting `interval` in a provider call. Daily bars are every
+    provider's default, so providers written before intervals existed keep working.
+    """
+    return {} if interval == DAILY else {'interval': interval}
+
+
+class DataProvider(ABC):
+    # Bar intervals the provider can serve
+    intervals: Tuple[str, ...] = (DAILY,)
+
+    @abstractmethod
+    def fetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        """
+        Fetches OHLCV bars for [start_date, end_date).
+        Returns a normalized DataFrame (see normalize_ohlcv), empty if no data found.
+        """
+        pass
+
+    def fetch_many(self, tickers: List[str], start_date: str, end_date: str,
+                   interval: str = DAILY) -> Dict[str, pd.DataFrame]:
+        """
+        Fetches several tickers for the same range. Providers with a grouped
+        download override this; the default makes one call per ticker.
+        """
+        return {ticker: self.fetch(ticker, start_date, end_date, **interval_kwargs(interval)) for ticker in tickers}
+
+    async def afetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        """
+        Awaitable fetch. Providers with a native async client override this; the
+        default runs the blocking fetch in a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(self.fetch, ticker, start_date, end_date, **interval_kwargs(interval))
+
+
+class YFinanceProvider(DataProvider):
+    intervals = tuple(INTERVALS)
+
+    def _download(self, tickers, start_date: str, end_date: str, interval: str, **kwargs) -> Optional[pd.DataFrame]:
+        # Intraday ranges are split into requests Yahoo accepts (see core.intervals)
+        parts = [yf.download(tickers, start=start, end=end, interval=interval, progress=False, **kwargs)
+                 for start, end in split_range(start_date, end_date, interval)]
+        parts = [part for part in parts if part is not None and not part.empty]
+        if not parts:
+            return None
+        raw = pd.concat(parts) if len(parts) > 1 else parts[0]
+        return raw[~raw.index.duplicated(keep='last')]
+
+    def fetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        df = self._download(ticker, start_date, end_date, interval)
+        return normalize_ohlcv(df)
+
+    def fetch_many(self, tickers: List[str], start_date: str, end_date: str,
+                   interval: str = DAILY) -> Dict[str, pd.DataFrame]:
+        # One grouped request (per chunk); columns come back as (ticker, field)
+        raw = self._download(tickers, start_date, end_date, interval, group_by='ticker')
+        if raw is None:
+            return {ticker: normalize_ohlcv(None) for ticker in tickers}
+        frames = {}
+        for ticker in tickers:
+            if isinstance(raw.columns, pd.MultiIndex) and ticker in raw.columns.get_level_values(0):
+                # Dates are aligned across tickers, so drop rows this ticker did not trade
+                frames[ticker] = normalize_ohlcv(raw[ticker].dropna(how='all'))
+            else:
+                frames[ticker] = normalize_ohlcv(None)
+        return frames
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Brings a raw provider frame to the shape used across the pipeline:
+    flat lowercase columns with 'date' as a regular column.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=REQUIRED_COLUMNS)
+
+    # Ensure flat index if multi-index is returned (common in recent yfinance versions)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    # Reset index to make Date a column if it's the index
+    df = df.reset_index()
+
+    # Standardize column names (intraday bars come indexed by 'Datetime')
+    df.columns = [str(c).lower() for c in df.columns]
+    df = df.rename(columns={'datetime': 'date'})
+
+    # Intraday timestamps are exchange-local and tz-aware: keep the wall-clock time
+    if 'date' in df.columns and getattr(df['date'].dt, 'tz', None) is not None:
+        df['date'] = df['date'].dt.tz_localize(None)
+    return df
+
+
+def compact_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores prices as float32 (half the memory of float64, about 7 significant digits)
+    and volume as int64. Used for intraday bars, where histories run to 10^5-10^6 rows;
+    indicators computed from float32 prices are stored as float32 too. Bars without a
+    volume are dropped (the feature engines would drop them anyway) rather than cast to 0 shares.
+    """
+    if 'volume' in df.columns and df['volume'].isna().any():
+        df = df.loc[df['volume'].notna()].reset_index(drop=True)
+    columns = {col: df[col].astype(np.float32) for col in PRICE_COLUMNS if col in df.columns and df[col].dtype != np.float32}
+    if 'volume' in df.columns and df['volume'].dtype != np.int64:
+        columns['volume'] = df['volume'].round().astype(np.int64)
+    return df.assign(**columns) if columns else df
+
+
+_provider: Optional[DataProvider] = None
+
+
+def get_provider() -> DataProvider:
+    """
+    Returns the process-wide data provider, building it from configuration on first use.
     """
-    Fetches historical stock data from Yahoo Finance.
+    global _provider
+    if _provider is None:
+        from core import config
+
+        if config.DATA_PROVIDER == 'local':
+            from core.local_store import LocalStore
+            provider: DataProvider = LocalStore(config.LOCAL_STORE_DIR)
+        elif config.DATA_PROVIDER == 'synthetic':
+            from core.synthetic import SyntheticProvider
+            provider = SyntheticProvider()
+        elif config.DATA_PROVIDER == 'yfinance':
+            provider = YFinanceProvider()
+            if config.CACHE_ENABLED:
+                from core.cache import OHLCVCache
+                provider = OHLCVCache(provider, config.CACHE_DIR, empty_ttl=config.CACHE_EMPTY_TTL)
+        else:
+            raise ValueError(f"Unknown data provider '{config.DATA_PROVIDER}'. Expected yfinance, local or synthetic.")
+        _provider = provider
+    return _provider
+
+
+def set_provider(provider: Optional[DataProvider]) -> None:
+    """
+    Replaces the process-wide data provider (None restores the configured default).
+    """
+    global _provider
+    _provider = provider
+
+
+def fetch_data(ticker: str, start_date: str, end_date: str, provider: Optional[DataProvider] = None,
+               interval: str = DAILY) -> Optional[pd.DataFrame]:
+    """
+    Fetches historical stock data from the configured provider (Yahoo Finance by default).
 
     Args:
         ticker (str): The stock ticker symbol (e.g., "AAPL").
         start_date (str): Start date in 'YYYY-MM-DD' format.
         end_date (str): End date in 'YYYY-MM-DD' format.
+        provider (DataProvider): Optional provider override.
+        interval (str): Bar interval ('1d', '1h', '5m', '1m', ... see core.intervals).
 
     Returns:
-        pd.DataFrame: A DataFrame containing OHLCV data, or None if no data found.
+        pd.DataFrame: A DataFrame containing OHLCV data (compact dtypes for intraday
+        bars, see compact_ohlcv), or None if no data found.
     """
     try:
-        print(f"Fetching data for {ticker} from {start_date} to {end_date}...")
-        df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-        
-        if df.empty:
+        print(f"Fetching {interval} data for {ticker} from {start_date} to {end_date}...")
+        provider = provider or get_provider()
+        df = provider.fetch(ticker, start_date, end_date, **interval_kwargs(interval))
+
+        if df is None or df.empty:
             print(f"No data found for {ticker}.")
             return None
-            
-        # Ensure flat index if multi-index is returned (common in recent yfinance versions)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-            
-        # Reset index to make Date a column if it's the index
-        df.reset_index(inplace=True)
-        
-        # Standardize column names
-        df.columns = [c.lower() for c in df.columns]
-        
+
         # Ensure we have required columns
-        required_cols = {'date', 'open', 'high', 'low', 'close', 'volume'}
-        if not required_cols.issubset(set(df.columns)):
+        if not set(REQUIRED_COLUMNS).issubset(set(df.columns)):
              # Sometimes yfinance returns 'Adj Close', handle if needed or just minimal check
              pass
-             
+
+        print(f"Successfully fetched {len(df)} records.")
+        return compact_ohlcv(df) if get_interval(interval).intraday else df
+
+    except Exception as e:
+        print(f"Error fetching data for {ticker}: {e}")
+        return None
+
+async def afetch_data(ticker: str, start_date: str, end_date: str, provider: Optional[DataProvider] = None,
+                      interval: str = DAILY) -> Optional[pd.DataFrame]:
+    """
+    Async counterpart of fetch_data, awaiting the provider's afetch.
+    """
+    try:
+        print(f"Fetching {interval} data for {ticker} from {start_date} to {end_date}...")
+        provider = provider or get_provider()
+        df = await provider.afetch(ticker, start_date, end_date, **interval_kwargs(interval))
+
+        if df is None or df.empty:
+            print(f"No data found for {ticker}.")
+            return None
+
         print(f"Successfully fetched {len(df)} records.")
-        return df
+        return compact_ohlcv(df) if get_interval(interval).intraday else df
 
     except Exception as e:
         print(f"Error fetching data for {ticker}: {e}")
         return None
 
+def fetch_data_many(tickers: List[str], start_date: str, end_date: str, provider: Optional[DataProvider] = None) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Fetches historical data for several tickers through one grouped provider call.
+
+    Returns:
+        Dict mapping each ticker to its OHLCV DataFrame, or None if no data found.
+    """
+    print(f"Fetching data for {len(tickers)} tickers from {start_date} to {end_date}...")
+    try:
+        provider = provider or get_provider()
+        frames = provider.fetch_many(tickers, start_date, end_date)
+    except Exception as e:
+        print(f"Error fetching data for {tickers}: {e}")
+        return {ticker: None for ticker in tickers}
+
+    result = {}
+    for ticker in tickers:
+        df = frames.get(ticker)
+        result[ticker] = df if df is not None and not df.empty else None
+    print(f"Successfully fetched {sum(df is not None for df in result.values())}/{len(tickers)} tickers.")
+    return result
+
 if __name__ == "__main__":
     # Simple test
     data = fetch_data("AAPL", "2023-01-01", "2023-12-31")
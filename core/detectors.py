@@ -0,0 +1,218 @@
+"""
+Linear-time anomaly detectors, alternatives to the Isolation Forest for screening many series.
+
+Every detector turns the feature matrix into an outlier score per row (higher is more
+unusual). `detect` then applies the Isolation Forest contract to its negation, the raw
+score (lower is more anomalous, as IsolationForest.score_samples): rows below the
+contamination quantile of the raw score are flagged -1, and anomaly_score is the distance
+to that threshold, so it is negative for anomalies. Contamination only moves the threshold,
+so one set of raw scores gives the labels at any level (contamination_thresholds).
+
+- robust_z: rolling median / MAD z-score per feature, combined as a root mean square.
+- hbos: histogram-based outlier score, summed -log density of each feature's bin.
+- hst: half-space trees scored window by window against the previous window's mass profile.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+ISOLATION_FOREST = 'isolation_forest'
+METHODS = (ISOLATION_FOREST, 'robust_z', 'hbos', 'hst')
+
+# Scale of the MAD that matches the standard deviation of normal data
+MAD_SCALE = 1.4826
+
+
+def _matrix(X: pd.DataFrame) -> np.ndarray:
+    # Infinite values (e.g. vol_spike over a zero average) are treated as missing
+    values = X.to_numpy(dtype=np.float64, copy=True)
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def robust_z_scores(X: pd.DataFrame, window: int = 63, min_periods: int = 20) -> np.ndarray:
+    """
+    Root mean square over features of |x - rolling median| / (1.4826 x rolling MAD),
+    each row compared with the trailing `window` rows (itself included).
+    """
+    values = pd.DataFrame(_matrix(X))
+    rolling = values.rolling(window, min_periods=min_periods)
+    median = rolling.median()
+    deviation = (values - median).abs()
+    mad = deviation.rolling(window, min_periods=min_periods).median() * MAD_SCALE
+    z = (deviation / mad.where(mad > 0)).to_numpy()
+    # Rows before min_periods (and constant features) contribute nothing
+    z = np.nan_to_num(z, nan=0.0)
+    return np.sqrt(np.mean(z ** 2, axis=1))
+
+
+def hbos_scores(X: pd.DataFrame, bins: Optional[int] = None) -> np.ndarray:
+    """
+    Histogram-based outlier score: per feature, an equal-width histogram (sqrt(n) bins
+    by default); a row scores the sum over features of -log(its bin's height / the
+    tallest bin's height).
+    """
+    values = _matrix(X)
+    n_rows = len(values)
+    bins = bins or max(10, int(np.sqrt(n_rows)))
+    scores = np.zeros(n_rows)
+    for column in values.T:
+        valid = ~np.isnan(column)
+        if not valid.any():
+            continue
+        counts, edges = np.histogram(column[valid], bins=bins)
+        # The last edge belongs to the last bin, as in np.histogram
+        index = np.clip(np.searchsorted(edges, column[valid], side='right') - 1, 0, bins - 1)
+        density = counts[index] / counts.max()
+        scores[valid] -= np.log(density)
+    return scores
+
+
+class HalfSpaceTrees:
+    """
+    Streaming half-space trees (Tan, Ting & Liu, 2011).
+
+    Each tree halves a random feature's work range at every level down to `depth`. Rows
+    arrive in windows of `window_size`: a window is scored against the mass profile
+    (rows per node) of the previous window, then its own profile becomes the reference.
+    The first window is its own reference. Rows in sparse regions score high.
+    """
+
+    def __init__(self, n_trees: int = 25, depth: int = 8, window_size: int = 250, seed: int = 42):
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window_size = window_size
+        self.size_limit = max(1.0, 0.1 * window_size)
+        self.rng = np.random.default_rng(seed)
+        self.dims: Optional[np.ndarray] = None
+        self.splits: Optional[np.ndarray] = None
+        self.reference: Optional[np.ndarray] = None
+        self.low = self.span = None
+
+    def _build(self, n_features: int) -> None:
+        n_internal = 2 ** self.depth - 1
+        self.dims = self.rng.integers(0, n_features, size=(self.n_trees, n_internal))
+        self.splits = np.empty((self.n_trees, n_internal))
+        for t in range(self.n_trees):
+            # Random work range around [0, 1] per feature (data is scaled to the first window)
+            s = self.rng.random(n_features)
+            half = 2 * np.maximum(s, 1 - s)
+            low, high = s - half, s + half
+            ranges = [(low, high)]
+            for node in range(n_internal):
+                lo, hi = ranges[node]
+                dim = self.dims[t, node]
+                mid = (lo[dim] + hi[dim]) / 2
+                self.splits[t, node] = mid
+                left_hi, right_lo = hi.copy(), lo.copy()
+                left_hi[dim], right_lo[dim] = mid, mid
+                ranges.append((lo, left_hi))
+                ranges.append((right_lo, hi))
+
+    def _paths(self, values: np.ndarray) -> np.ndarray:
+        # Node index (heap order) of every row at every level: (trees, depth + 1, rows)
+        paths = np.zeros((self.n_trees, self.depth + 1, len(values)), dtype=np.int64)
+        rows = np.arange(len(values))
+        for t in range(self.n_trees):
+            node = np.zeros(len(values), dtype=np.int64)
+            for level in range(self.depth):
+                right = values[rows, self.dims[t, node]] > self.splits[t, node]
+                node = 2 * node + 1 + right
+                paths[t, level + 1] = node
+        return paths
+
+    def _mass(self, paths: np.ndarray) -> np.ndarray:
+        n_nodes = 2 ** (self.depth + 1) - 1
+        mass = np.zeros((self.n_trees, n_nodes))
+        for t in range(self.n_trees):
+            mass[t] = np.bincount(paths[t].ravel(), minlength=n_nodes)
+        return mass
+
+    def _score(self, paths: np.ndarray, mass: np.ndarray) -> np.ndarray:
+        # Normal score: mass x 2^level at the first node below the size limit (or a leaf)
+        n_rows = paths.shape[2]
+        normal = np.zeros(n_rows)
+        for t in range(self.n_trees):
+            pending = np.ones(n_rows, dtype=bool)
+            for level in range(self.depth + 1):
+                m = mass[t, paths[t, level]]
+                stop = pending & ((m < self.size_limit) | (level == self.depth))
+                normal[stop] += m[stop] * 2.0 ** level
+                pending &= ~stop
+        return normal
+
+    def score_stream(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Scores rows in arrival order, window by window. Returns outlier scores (higher is more unusual).
+        """
+        values = _matrix(X)
+        if self.dims is None:
+            first = values[:self.window_size]
+            self.low = np.nanmin(first, axis=0)
+            self.span = np.nanmax(first, axis=0) - self.low
+            self.span[~(self.span > 0)] = 1.0
+            self.low = np.nan_to_num(self.low)
+            self._build(values.shape[1])
+        # Missing values sit in the middle of the first window's range
+        scaled = np.nan_to_num((values - self.low) / self.span, nan=0.5)
+
+        normal = np.empty(len(scaled))
+        for lo in range(0, len(scaled), self.window_size):
+            paths = self._paths(scaled[lo:lo + self.window_size])
+            mass = self._mass(paths)
+            reference = self.reference if self.reference is not None else mass
+            normal[lo:lo + self.window_size] = self._score(paths, reference)
+            self.reference = mass
+        return -normal
+
+
+def outlier_scores(method: str, X: pd.DataFrame) -> np.ndarray:
+    """
+    Outlier score per row of X (higher is more unusual) for one of the linear-time methods.
+    """
+    if method == 'robust_z':
+        return robust_z_scores(X)
+    if method == 'hbos':
+        return hbos_scores(X)
+    if method == 'hst':
+        return HalfSpaceTrees().score_stream(X)
+    raise ValueError(f"Unknown method '{method}'. Use one of: {', '.join(METHODS)}.")
+
+
+def contamination_thresholds(raw, levels: Iterable[float]) -> Dict[float, float]:
+    """
+    Thresholds on raw scores (lower is more anomalous) for several contamination levels.
+
+    The level-c threshold is the c-quantile of the raw scores, computed as IsolationForest
+    computes its offset_, so thresholding the raw scores of one fit gives exactly the
+    labels a fit at that level would (the trees do not depend on contamination).
+
+    Returns:
+        Level -> threshold; rows scoring below it are anomalies at that level (labels_at).
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    return {float(level): float(np.percentile(raw, 100.0 * level)) for level in levels}
+
+
+def labels_at(raw, threshold: float) -> np.ndarray:
+    """
+    Anomaly labels (-1 for anomaly, 1 for normal) of raw scores for one threshold.
+    """
+    return np.where(np.asarray(raw) < threshold, -1, 1)
+
+
+def raw_scores(method: str, X: pd.DataFrame) -> np.ndarray:
+    """
+    Contamination-free score per row of X, lower is more anomalous (negated outlier_scores).
+    """
+    return -outlier_scores(method, X)
+
+
+def detect(method: str, X: pd.DataFrame, contamination: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (anomaly labels, anomaly scores) with the Isolation Forest contract:
+    -1 for the `contamination` share of rows scoring highest, scores negative for those.
+    """
+    raw = raw_scores(method, X)
+    threshold = contamination_thresholds(raw, [contamination])[float(contamination)]
+    return labels_at(raw, threshold), raw - threshold
@@ -1,21 +1,78 @@
 import pandas as pd
 import numpy as np
 import ta
-from core.strategy import evaluate_market_condition
+from collections import deque
+from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from core.strategy import compute_signals, evaluate_market_condition
 
-def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+FEATURE_ENGINES = ('ta', 'numpy')
+
+# Output columns in the order both engines produce them
+INDICATOR_COLUMNS = [
+    'returns', 'log_returns', 'volatility_14',
+    'ma_50', 'ma_200', 'dist_ma_50', 'dist_ma_200',
+    'rsi', 'macd',
+    'bb_mid', 'bb_upper', 'bb_lower', 'bb_width',
+    'atr', 'adx', 'stoch_k', 'obv',
+    'vol_ma_20', 'vol_spike',
+]
+
+MIN_ROWS = 50
+
+
+def add_technical_indicators(df: pd.DataFrame, engine: Optional[str] = None,
+                             outputs: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
-    Adds technical indicators to the DataFrame.
+    Adds technical indicators and strategy signals to the DataFrame.
     Expected columns: 'close', 'high', 'low', 'volume'
+
+    Args:
+        df: OHLCV DataFrame.
+        engine: 'ta' (reference, one `ta` call per indicator) or 'numpy' (fused kernel).
+            Defaults to config.FEATURE_ENGINE.
+        outputs: Indicator (and signal) columns to add; None adds all of them. Rows are
+            dropped only where a requested column is still warming up, and the numpy
+            engine computes nothing else.
+    """
+    if engine is None:
+        from core import config
+        engine = config.FEATURE_ENGINE
+
+    if engine == 'ta':
+        df = _indicators_ta(df, outputs)
+    elif engine == 'numpy':
+        df = _indicators_numpy(df, outputs)
+    else:
+        raise ValueError(f"Unknown feature engine '{engine}'. Expected one of {FEATURE_ENGINES}.")
+
+    # 11. Calculate Strategy Signals for the entire dataframe
+    # We apply this AFTER dropna so we have valid indicators
+    if not df.empty and (outputs is None or set(outputs) & set(SIGNAL_COLUMNS)):
+        # Column-wise equivalent of evaluate_market_condition (the per-row reference)
+        df['sentiment'], df['action'] = compute_signals(df)
+
+    # If cleaning results in empty df, outside caller should handle it.
+
+    return df
+
+
+def _indicators_ta(df: pd.DataFrame, outputs: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
+    Reference engine built on the `ta` library (always computes every indicator).
+    """
+    columns = _indicator_outputs(outputs)
     df = df.copy()
+    raw_columns = list(df.columns)
     
     # ensure sorted by date
     # ensure sorted by date
     if 'date' in df.columns:
         df = df.sort_values(by='date')
         
-    if len(df) < 50:
+    if len(df) < MIN_ROWS:
          # 50 is min for MA50, but let's say 30 for safety of other indicators
          # If < 50, MA50 will be all NaN, and dropna will kill it anyway.
          # But to avoid 'IndexError' in TA lib, we should stop early.
@@ -73,16 +130,548 @@ def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     
     # Drop rows with NaN created by rolling windows to avoid issues in ML
     # Note: 200-day MA will cause first 200 rows to be dropped.
-    df.dropna(inplace=True)
-    
-    # 11. Calculate Strategy Signals for the entire dataframe
-    # We apply this AFTER dropna so we have valid indicators
-    if not df.empty:
-        # returns tuple (sentiment, action) -> expand to columns
-        signals = df.apply(lambda row: evaluate_market_condition(row), axis=1)
-        df['sentiment'] = [x[0] for x in signals]
-        df['action'] = [x[1] for x in signals]
+    df = df[raw_columns + columns].dropna()
 
-    # If cleaning results in empty df, outside caller should handle it.
-    
     return df
+
+
+# --- Fused NumPy engine ---
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    out = np.empty_like(x)
+    out[0] = np.nan
+    out[1:] = x[:-1]
+    return out
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        # Centre on the first value to keep the running sum small
+        c = np.cumsum(x - x[0])
+        sums = c[window - 1:].copy()
+        sums[1:] -= c[:-window]
+        out[window - 1:] = sums / window + x[0]
+    return out
+
+
+def _rolling_apply(x: np.ndarray, window: int, func, **kwargs) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = func(sliding_window_view(x, window), axis=1, **kwargs)
+    return out
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas ewm(alpha=..., adjust=False).mean() for a NaN-free array."""
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * x[0]])
+    return y
+
+
+def _wilder(x: np.ndarray, seed: float, decay: float, gain: float) -> np.ndarray:
+    """y[0] = seed, y[k] = decay * y[k-1] + gain * x[k]."""
+    out = np.empty(len(x))
+    out[0] = seed
+    if len(x) > 1:
+        out[1:], _ = lfilter([gain], [1.0, -decay], x[1:], zi=[decay * seed])
+    return out
+
+
+# --- Indicator graph ---
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    One node of the indicator dependency graph.
+
+    `inputs` are OHLCV columns or other nodes; `warmup` is how many bars after its inputs
+    become valid the first value appears; `memory` is how many further bars recursive
+    smoothing needs before its seed no longer matters (0 for windowed indicators).
+    Nodes starting with '_' are shared intermediates, never output columns.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    warmup: int = 0
+    memory: int = 0
+
+
+# Relative weight of the seed below which a recursive (EMA / Wilder) indicator is settled
+SETTLE_TOLERANCE = 1e-3
+
+
+def _settle(decay: float) -> int:
+    return int(np.ceil(np.log(SETTLE_TOLERANCE) / np.log(decay)))
+
+
+def _returns(c):
+    return c['close'] / c['_prev_close'] - 1
+
+
+def _log_returns(c):
+    return np.log(c['close'] / c['_prev_close'])
+
+
+def _dist(ma: str):
+    return lambda c: (c['close'] - c[ma]) / c[ma]
+
+
+def _rsi(c):
+    # Wilder smoothing of up/down moves
+    diff = c['close'] - c['_prev_close']
+    diff[0] = 0.0
+    ema_up = _ewm(np.where(diff > 0, diff, 0.0), 1 / 14)
+    ema_dn = _ewm(np.where(diff < 0, -diff, 0.0), 1 / 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(ema_dn == 0, 100.0, 100 - 100 / (1 + ema_up / ema_dn))
+    rsi[:13] = np.nan
+    return rsi
+
+
+def _macd(c):
+    # Histogram: 12/26 EMAs, 9-period signal
+    close = c['close']
+    macd_line = _ewm(close, 2 / 13) - _ewm(close, 2 / 27)
+    macd = np.full(len(close), np.nan)
+    if len(close) > 33:
+        macd[25:] = macd_line[25:] - _ewm(macd_line[25:], 2 / 10)
+        macd[25:33] = np.nan
+    return macd
+
+
+def _bb_band(sign: int):
+    return lambda c: c['bb_mid'] + sign * 2 * c['_bb_std']
+
+
+def _true_range(c):
+    # Shared by ATR and the ADX directional movement
+    high, low, prev_close = c['high'], c['low'], c['_prev_close']
+    true_range = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    true_range[0] = high[0] - low[0]
+    return true_range
+
+
+def _atr(c):
+    true_range = c['_true_range']
+    atr = np.zeros(len(true_range))
+    atr[13:] = _wilder(true_range[13:], true_range[:14].mean(), 13 / 14, 1 / 14)
+    return atr
+
+
+def _adx(c):
+    high, low, true_range = c['high'], c['low'], c['_true_range']
+    n = len(high)
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    adx = np.zeros(n)
+    if n > 28:
+        tr_s = _wilder(true_range[14:], true_range[1:15].sum(), 13 / 14, 1.0)
+        plus_s = _wilder(plus_dm[14:], plus_dm[1:15].sum(), 13 / 14, 1.0)
+        minus_s = _wilder(minus_dm[14:], minus_dm[1:15].sum(), 13 / 14, 1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            di_plus = np.where(tr_s != 0, 100 * plus_s / tr_s, 0.0)
+            di_minus = np.where(tr_s != 0, 100 * minus_s / tr_s, 0.0)
+            di_sum = di_plus + di_minus
+            dx = np.where(di_sum != 0, 100 * np.abs(di_plus - di_minus) / di_sum, 0.0)
+        # dx[k] belongs to bar 14 + k; ADX starts at bar 27 with the mean of the first 14
+        adx[27:] = _wilder(dx[13:], dx[:14].mean(), 13 / 14, 1 / 14)
+    return adx
+
+
+def _stoch_k(c):
+    lowest = _rolling_apply(c['low'], 14, np.min)
+    highest = _rolling_apply(c['high'], 14, np.max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * (c['close'] - lowest) / (highest - lowest)
+
+
+def _obv(c):
+    return np.cumsum(np.where(c['close'] < c['_prev_close'], -c['volume'], c['volume']))
+
+
+def _vol_spike(c):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return c['volume'] / c['vol_ma_20']
+
+
+INDICATORS: Dict[str, Indicator] = {node.name: node for node in [
+    Indicator('_prev_close', ('close',), lambda c: _shift(c['close']), warmup=1),
+    # 0. Basics
+    Indicator('returns', ('close', '_prev_close'), _returns),
+    Indicator('log_returns', ('close', '_prev_close'), _log_returns),
+    # 1. Volatility (Rolling Std Dev)
+    Indicator('volatility_14', ('log_returns',), lambda c: _rolling_apply(c['log_returns'], 14, np.std, ddof=1), warmup=13),
+    # 2. Moving Averages
+    Indicator('ma_50', ('close',), lambda c: _rolling_mean(c['close'], 50), warmup=49),
+    Indicator('ma_200', ('close',), lambda c: _rolling_mean(c['close'], 200), warmup=199),
+    Indicator('dist_ma_50', ('close', 'ma_50'), _dist('ma_50')),
+    Indicator('dist_ma_200', ('close', 'ma_200'), _dist('ma_200')),
+    # 3. RSI
+    Indicator('rsi', ('close', '_prev_close'), _rsi, warmup=13, memory=_settle(13 / 14)),
+    # 4. MACD (slowest EMA, then the signal EMA)
+    Indicator('macd', ('close',), _macd, warmup=33, memory=_settle(25 / 27) + _settle(0.8)),
+    # 5. Bollinger Bands
+    Indicator('bb_mid', ('close',), lambda c: _rolling_mean(c['close'], 20), warmup=19),
+    Indicator('_bb_std', ('close',), lambda c: _rolling_apply(c['close'], 20, np.std), warmup=19),
+    Indicator('bb_upper', ('bb_mid', '_bb_std'), _bb_band(1)),
+    Indicator('bb_lower', ('bb_mid', '_bb_std'), _bb_band(-1)),
+    Indicator('bb_width', ('bb_upper', 'bb_lower', 'bb_mid'), lambda c: (c['bb_upper'] - c['bb_lower']) / c['bb_mid'] * 100),
+    # 6. ATR
+    Indicator('_true_range', ('high', 'low', '_prev_close'), _true_range),
+    Indicator('atr', ('_true_range',), _atr, warmup=13, memory=_settle(13 / 14)),
+    # 7. ADX
+    Indicator('adx', ('high', 'low', '_true_range'), _adx, warmup=27, memory=2 * _settle(13 / 14)),
+    # 8. Stochastic Oscillator
+    Indicator('stoch_k', ('close', 'high', 'low'), _stoch_k, warmup=13),
+    # 9. On-Balance Volume
+    Indicator('obv', ('close', 'volume', '_prev_close'), _obv),
+    # 10. Volume Spikes
+    Indicator('vol_ma_20', ('volume',), lambda c: _rolling_mean(c['volume'], 20), warmup=19),
+    Indicator('vol_spike', ('volume', 'vol_ma_20'), _vol_spike),
+]}
+
+# Strategy signal columns and the indicators they are computed from
+SIGNAL_COLUMNS = ['sentiment', 'action']
+SIGNAL_INPUTS = ('rsi', 'macd', 'ma_50')
+
+
+def _indicator_outputs(outputs: Optional[Iterable[str]]) -> List[str]:
+    """
+    Requested indicator columns in INDICATOR_COLUMNS order (all of them for None);
+    signal columns pull in their inputs. Raises ValueError for unknown names.
+    """
+    if outputs is None:
+        return list(INDICATOR_COLUMNS)
+    requested = set(outputs)
+    unknown = requested - set(INDICATOR_COLUMNS) - set(SIGNAL_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown indicators: {', '.join(sorted(unknown))}. Expected any of {INDICATOR_COLUMNS + SIGNAL_COLUMNS}.")
+    if requested & set(SIGNAL_COLUMNS):
+        requested.update(SIGNAL_INPUTS)
+    return [name for name in INDICATOR_COLUMNS if name in requested]
+
+
+def resolve_indicators(outputs: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Graph nodes needed for `outputs`, in dependency order.
+    """
+    order: List[str] = []
+
+    def visit(name: str) -> None:
+        if name in order or name not in INDICATORS:
+            return
+        for dependency in INDICATORS[name].inputs:
+            visit(dependency)
+        order.append(name)
+
+    for name in _indicator_outputs(outputs):
+        visit(name)
+    return order
+
+
+def _lookback(name: str, memo: Dict[str, Tuple[int, int]]) -> Tuple[int, int]:
+    # (bars until the first value, bars until recursive smoothing has settled)
+    if name not in INDICATORS:
+        return 0, 0
+    if name not in memo:
+        node = INDICATORS[name]
+        inputs = [_lookback(dependency, memo) for dependency in node.inputs]
+        warmup = node.warmup + max((w for w, _ in inputs), default=0)
+        memory = node.memory + max((m for _, m in inputs), default=0)
+        memo[name] = (warmup, memory)
+    return memo[name]
+
+
+def warmup_bars(outputs: Optional[Iterable[str]] = None) -> int:
+    """
+    Bars of history needed before the first row for which every requested output is
+    valid and settled (e.g. 199 for ma_200, about 100 for RSI alone).
+    """
+    memo: Dict[str, Tuple[int, int]] = {}
+    return max((sum(_lookback(name, memo)) for name in _indicator_outputs(outputs)), default=0)
+
+
+def _indicators_numpy(df: pd.DataFrame, outputs: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Fused engine: extracts contiguous float64 arrays once and evaluates only the graph
+    nodes the requested outputs depend on, each exactly once (shared intermediates such
+    as previous close and true range are reused), then assembles the output frame once.
+    Numerically matches the `ta` engine.
+    """
+    columns = _indicator_outputs(outputs)
+    if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+        df = df.sort_values(by='date')
+
+    if len(df) < MIN_ROWS:
+        raise ValueError(f"Insufficient data for technical analysis. Got {len(df)} rows, need at least {MIN_ROWS}.")
+
+    # Clean data: drop any rows with NaN in critical columns before starting
+    critical = df[['close', 'high', 'low', 'volume']].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(critical).any(axis=1)
+    if not valid.all():
+        df = df.loc[valid]
+        critical = critical[valid]
+    ind = {name: np.ascontiguousarray(critical[:, i]) for i, name in enumerate(('close', 'high', 'low', 'volume'))}
+
+    for name in resolve_indicators(columns):
+        ind[name] = INDICATORS[name].compute(ind)
+
+    # Drop rows with NaN in any column, like the reference engine
+    keep = df.notna().all(axis=1).to_numpy().copy()
+    for name in columns:
+        keep &= ~np.isnan(ind[name])
+
+    out = df.loc[keep]
+    # Indicators keep the precision of the prices (float32 for compact intraday frames)
+    dtype = np.float32 if df['close'].dtype == np.float32 else np.float64
+    indicators = pd.DataFrame({name: ind[name][keep].astype(dtype, copy=False) for name in columns}, index=out.index)
+    return pd.concat([out, indicators], axis=1)
+
+
+# --- Incremental engine ---
+
+def _std(values, ddof: int = 0) -> float:
+    n = len(values)
+    mean = sum(values) / n
+    return (sum((v - mean) ** 2 for v in values) / (n - ddof)) ** 0.5
+
+
+class IndicatorState:
+    """
+    Running state of every indicator, updated in constant time per appended bar.
+
+    Seed it from a history with `from_history`, then call `update(bar)` for each new bar to
+    get the row `add_technical_indicators` would produce for it (indicators, sentiment and
+    action), plus an anomaly score from the Isolation Forest fitted on the seed history.
+
+    The state is plain Python data: `to_dict`/`from_dict` round-trip it through JSON
+    (without the fitted model), and pickling keeps the model as well.
+    """
+
+    _WINDOWS = {'close': 200, 'log_returns': 14, 'high': 14, 'low': 14, 'volume': 20}
+    _SCALARS = [
+        'count', 'prev_close', 'prev_high', 'prev_low',
+        'sum_close_200', 'sum_close_50', 'sum_close_20', 'sum_volume_20',
+        'ema_up', 'ema_dn', 'ema_12', 'ema_26', 'macd_signal',
+        'atr', 'atr_seed_sum', 'tr_smooth', 'plus_smooth', 'minus_smooth', 'dx_sum', 'adx', 'obv',
+    ]
+
+    def __init__(self, contamination: float = 0.05):
+        self.contamination = contamination
+        self.model = None
+        self.features_used: List[str] = []
+        self.windows = {name: deque(maxlen=size) for name, size in self._WINDOWS.items()}
+        for name in self._SCALARS:
+            setattr(self, name, 0.0)
+        self.count = 0
+
+    # --- Seeding & serialization ---
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, contamination: float = 0.05, fit_model: bool = True) -> 'IndicatorState':
+        """
+        Replays a history bar by bar and (optionally) fits the anomaly model on the
+        resulting feature rows, exactly as detect_anomalies would on the batch output.
+        """
+        from core.anomaly import FEATURE_COLUMNS, build_model
+
+        state = cls(contamination=contamination)
+        if 'date' in df.columns:
+            df = df.sort_values(by='date')
+        rows = [row for row in (state._advance(bar) for bar in df.to_dict(orient='records')) if row is not None]
+
+        if fit_model and len(rows) >= 50:
+            features = pd.DataFrame(rows)
+            state.features_used = [c for c in FEATURE_COLUMNS if c in features.columns]
+            state.model = build_model(contamination).fit(features[state.features_used])
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self._SCALARS}
+        data['contamination'] = self.contamination
+        data['windows'] = {name: list(values) for name, values in self.windows.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorState':
+        state = cls(contamination=data.get('contamination', 0.05))
+        for name in cls._SCALARS:
+            setattr(state, name, data[name])
+        for name, values in data['windows'].items():
+            state.windows[name].extend(values)
+        return state
+
+    # --- Updates ---
+
+    def update(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Appends one bar (mapping with date, open, high, low, close, volume).
+
+        Returns:
+            The new row with indicators, sentiment/action and, when a model is fitted,
+            anomaly/anomaly_score; None while the indicators are still warming up.
+        """
+        row = self._advance(bar)
+        if row is None or self.model is None:
+            return row
+
+        # One scoring call; decision_function/predict are derived from it the way sklearn does
+        X = pd.DataFrame([[row[c] for c in self.features_used]], columns=self.features_used)
+        score = float(self.model.score_samples(X)[0] - self.model.offset_)
+        row['anomaly'] = -1 if score < 0 else 1
+        row['anomaly_score'] = score
+        return row
+
+    def _advance(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        close, high, low, volume = (float(bar[c]) for c in ('close', 'high', 'low', 'volume'))
+        if any(np.isnan(v) for v in (close, high, low, volume)):
+            # Same as the batch cleaning step: such bars never enter the indicators
+            return None
+
+        i = self.count
+        w = self.windows
+        nan = float('nan')
+        row = dict(bar)
+
+        # 0. Basics
+        if i == 0:
+            returns = log_returns = nan
+            true_range = high - low
+        else:
+            prev_close = self.prev_close
+            returns = close / prev_close - 1
+            log_returns = float(np.log(close / prev_close))
+            true_range = max(high, prev_close) - min(low, prev_close)
+        row['returns'] = returns
+        row['log_returns'] = log_returns
+
+        # 1. Volatility
+        w['log_returns'].append(log_returns)
+        row['volatility_14'] = _std(w['log_returns'], ddof=1) if i >= 14 else nan
+
+        # 2. Moving Averages (running sums over the 200-bar close window)
+        closes = w['close']
+        if len(closes) == 200:
+            self.sum_close_200 -= closes[0]
+        if len(closes) >= 50:
+            self.sum_close_50 -= closes[-50]
+        if len(closes) >= 20:
+            self.sum_close_20 -= closes[-20]
+        closes.append(close)
+        self.sum_close_200 += close
+        self.sum_close_50 += close
+        self.sum_close_20 += close
+        ma_50 = self.sum_close_50 / 50 if i >= 49 else nan
+        ma_200 = self.sum_close_200 / 200 if i >= 199 else nan
+        row['ma_50'] = ma_50
+        row['ma_200'] = ma_200
+        row['dist_ma_50'] = (close - ma_50) / ma_50
+        row['dist_ma_200'] = (close - ma_200) / ma_200
+
+        # 3. RSI
+        diff = close - self.prev_close if i > 0 else 0.0
+        up, dn = max(diff, 0.0), max(-diff, 0.0)
+        if i == 0:
+            self.ema_up, self.ema_dn = up, dn
+        else:
+            self.ema_up += (up - self.ema_up) / 14
+            self.ema_dn += (dn - self.ema_dn) / 14
+        if i < 13:
+            row['rsi'] = nan
+        elif self.ema_dn == 0:
+            row['rsi'] = 100.0
+        else:
+            row['rsi'] = 100 - 100 / (1 + self.ema_up / self.ema_dn)
+
+        # 4. MACD
+        if i == 0:
+            self.ema_12 = self.ema_26 = close
+        else:
+            self.ema_12 = (1 - 2 / 13) * self.ema_12 + (2 / 13) * close
+            self.ema_26 = (1 - 2 / 27) * self.ema_26 + (2 / 27) * close
+        macd_line = self.ema_12 - self.ema_26
+        if i == 25:
+            self.macd_signal = macd_line
+        elif i > 25:
+            self.macd_signal = 0.8 * self.macd_signal + 0.2 * macd_line
+        row['macd'] = macd_line - self.macd_signal if i >= 33 else nan
+
+        # 5. Bollinger Bands
+        if i >= 19:
+            bb_mid = self.sum_close_20 / 20
+            bb_std = _std(list(closes)[-20:])
+            row['bb_mid'] = bb_mid
+            row['bb_upper'] = bb_mid + 2 * bb_std
+            row['bb_lower'] = bb_mid - 2 * bb_std
+            row['bb_width'] = (row['bb_upper'] - row['bb_lower']) / bb_mid * 100
+        else:
+            row['bb_mid'] = row['bb_upper'] = row['bb_lower'] = row['bb_width'] = nan
+
+        # 6. ATR
+        if i < 13:
+            self.atr_seed_sum += true_range
+        elif i == 13:
+            self.atr = (self.atr_seed_sum + true_range) / 14
+        else:
+            self.atr = (self.atr * 13 + true_range) / 14
+        row['atr'] = self.atr if i >= 13 else 0.0
+
+        # 7. ADX (directional movement sums over bars 1..14, then Wilder smoothing)
+        if i >= 1:
+            up_move = high - self.prev_high
+            down_move = self.prev_low - low
+            plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+            minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+            decay = 1.0 if i <= 14 else 13 / 14
+            self.tr_smooth = self.tr_smooth * decay + true_range
+            self.plus_smooth = self.plus_smooth * decay + plus_dm
+            self.minus_smooth = self.minus_smooth * decay + minus_dm
+        if i >= 14:
+            tr_s = self.tr_smooth
+            di_plus = 100 * self.plus_smooth / tr_s if tr_s != 0 else 0.0
+            di_minus = 100 * self.minus_smooth / tr_s if tr_s != 0 else 0.0
+            di_sum = di_plus + di_minus
+            dx = 100 * abs(di_plus - di_minus) / di_sum if di_sum != 0 else 0.0
+            if i < 27:
+                self.dx_sum += dx
+            elif i == 27:
+                self.adx = (self.dx_sum + dx) / 14
+            else:
+                self.adx = (self.adx * 13 + dx) / 14
+        row['adx'] = self.adx if i >= 27 else 0.0
+
+        # 8. Stochastic Oscillator
+        w['high'].append(high)
+        w['low'].append(low)
+        if i >= 13:
+            lowest, highest = min(w['low']), max(w['high'])
+            row['stoch_k'] = 100 * (close - lowest) / (highest - lowest) if highest != lowest else nan
+        else:
+            row['stoch_k'] = nan
+
+        # 9. On-Balance Volume
+        self.obv += -volume if (i > 0 and close < self.prev_close) else volume
+        row['obv'] = self.obv
+
+        # 10. Volume Spikes
+        volumes = w['volume']
+        if len(volumes) == 20:
+            self.sum_volume_20 -= volumes[0]
+        volumes.append(volume)
+        self.sum_volume_20 += volume
+        vol_ma_20 = self.sum_volume_20 / 20 if i >= 19 else nan
+        row['vol_ma_20'] = vol_ma_20
+        row['vol_spike'] = volume / vol_ma_20 if vol_ma_20 != 0 else float('inf')
+
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        self.count = i + 1
+
+        # Warm-up rows are dropped by the batch engines as well
+        if any(v is None or (isinstance(v, float) and np.isnan(v)) for v in row.values()):
+            return None
+
+        # 11. Strategy Signals (per-row reference rules)
+        row['sentiment'], row['action'] = evaluate_market_condition(row)
+        return row
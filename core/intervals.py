@@ -0,0 +1,85 @@
+"""
+Bar intervals: bar length, and how much history upstream providers serve per request.
+
+Limits follow Yahoo Finance: 1-minute bars only for the last 30 days and at most 8 days
+per request, other intraday intervals for the last 60 days, hourly bars for the last
+730 days. Longer ranges are split into chunks of `max_span_days`.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import pandas as pd
+
+DAILY = '1d'
+
+# Minutes in a regular US equity session; 24h markets have more bars per day
+SESSION_MINUTES = 390
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass(frozen=True)
+class Interval:
+    name: str
+    minutes: int  # bar length; 0 for daily bars
+    max_span_days: Optional[int]  # longest range one upstream request may cover (None: unlimited)
+    max_history_days: Optional[int]  # how far back upstream keeps these bars (None: unlimited)
+
+    @property
+    def intraday(self) -> bool:
+        return self.minutes > 0
+
+    @property
+    def bars_per_session(self) -> int:
+        return SESSION_MINUTES // self.minutes if self.intraday else 1
+
+    @property
+    def bars_per_year(self) -> int:
+        return self.bars_per_session * TRADING_DAYS_PER_YEAR
+
+
+INTERVALS = {i.name: i for i in (
+    Interval('1m', 1, 7, 30),
+    Interval('2m', 2, 59, 60),
+    Interval('5m', 5, 59, 60),
+    Interval('15m', 15, 59, 60),
+    Interval('30m', 30, 59, 60),
+    Interval('1h', 60, 729, 730),
+    Interval(DAILY, 0, None, None),
+)}
+
+
+def get_interval(name: str) -> Interval:
+    """
+    Looks up a bar interval. Raises ValueError for unknown names.
+    """
+    try:
+        return INTERVALS[name]
+    except KeyError:
+        raise ValueError(f"Unknown interval '{name}'. Expected one of: {', '.join(INTERVALS)}.") from None
+
+
+def split_range(start_date: str, end_date: str, interval: str,
+                today: Optional[pd.Timestamp] = None) -> List[Tuple[str, str]]:
+    """
+    Splits [start_date, end_date) into consecutive ranges one upstream request can serve.
+    The start is first moved up to the oldest day upstream still keeps for the interval.
+
+    Returns:
+        List of ('YYYY-MM-DD', 'YYYY-MM-DD') half-open ranges; empty if nothing is available.
+    """
+    spec = get_interval(interval)
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+    if spec.max_history_days is not None:
+        today = (today if today is not None else pd.Timestamp.today()).normalize()
+        start = max(start, today - pd.Timedelta(days=spec.max_history_days - 1))
+    if start >= end:
+        return []
+    if spec.max_span_days is None:
+        return [(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))]
+
+    step = pd.Timedelta(days=spec.max_span_days)
+    chunks = []
+    while start < end:
+        chunk_end = min(start + step, end)
+        chunks.append((start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+        start = chunk_end
+    return chunks
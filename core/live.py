@@ -0,0 +1,272 @@
+"""
+Live monitoring: per-ticker indicator state kept warm in the server, pushed to subscribers.
+
+A feed delivers bars per ticker (`history` to seed from, then `bars` as they arrive).
+`LiveMonitor` seeds one IndicatorState per ticker, updates it in constant time per bar
+and publishes an event only when the bar changes something: the action or the sentiment
+from evaluate_market_condition, or an anomaly flag. Every subscriber of a ticker shares
+the one update and the one encoded message.
+
+`ReplayFeed` plays stored bars back at a configurable speed and stands in for a live source.
+"""
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+import numpy as np
+import pandas as pd
+from core.data_loader import DataProvider, fetch_data
+from core.features import IndicatorState
+from core.intervals import DAILY
+from core.planner import plan_range
+from core.singleflight import SingleFlight
+
+class ReplayFeed:
+    """
+    Plays stored bars back as if they were arriving live.
+
+    Bars before `start_date` are the history a ticker's state is seeded from (the indicators'
+    warm-up plus `history_bars` for the anomaly model); bars from `start_date` to `end_date`
+    are then delivered `speed` per second (0 delivers them as fast as they are consumed).
+    Up to `max_frames` fetched tickers are kept (LRU).
+    """
+
+    def __init__(self, start_date: str, end_date: Optional[str] = None, interval: str = DAILY,
+                 speed: float = 1.0, history_bars: int = 252, provider: Optional[DataProvider] = None,
+                 max_frames: int = 256):
+        self.start_date = pd.Timestamp(start_date).strftime('%Y-%m-%d')
+        self.end_date = end_date or pd.Timestamp.today().strftime('%Y-%m-%d')
+        self.interval = interval
+        self.speed = speed
+        self.history_bars = history_bars
+        self.provider = provider
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[str, Optional[pd.DataFrame]]" = OrderedDict()
+        # history() runs in worker threads
+        self._lock = threading.Lock()
+
+    def _frame(self, ticker: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            if ticker in self._frames:
+                self._frames.move_to_end(ticker)
+                return self._frames[ticker]
+        plan = plan_range(self.start_date, self.end_date, extra=self.history_bars, interval=self.interval)
+        df = fetch_data(ticker, plan.fetch_start, self.end_date, provider=self.provider, interval=self.interval)
+        with self._lock:
+            self._frames[ticker] = df
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return df
+
+    def history(self, ticker: str) -> Optional[pd.DataFrame]:
+        """
+        Bars before the replay start (None when the ticker has no data).
+        """
+        df = self._frame(ticker)
+        return None if df is None else df.loc[df['date'] < self.start_date]
+
+    async def bars(self, ticker: str, after: Optional[pd.Timestamp] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Replayed bars, from the replay start or the first bar after `after`.
+        """
+        df = self._frame(ticker)
+        if df is None:
+            return
+        df = df.loc[df['date'] >= self.start_date]
+        if after is not None:
+            df = df.loc[df['date'] > after]
+        delay = 1 / self.speed if self.speed > 0 else 0.0
+        for bar in df.to_dict(orient='records'):
+            # Always yields control, so other tickers and subscribers keep up
+            await asyncio.sleep(delay)
+            yield bar
+
+
+@dataclass
+class TickerStream:
+    ticker: str
+    state: IndicatorState
+    last: Dict[str, Any]
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+    task: Optional[asyncio.Task] = None
+    finished: bool = False
+
+
+def _number(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) or np.isinf(value) else value
+
+
+def bar_events(ticker: str, row: Dict[str, Any], previous: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Events a new row produces compared with the ticker's previous row.
+    """
+    base = {'ticker': ticker, 'date': str(row['date']), 'close': _number(row['close'])}
+    events = []
+    if row['action'] != previous['action']:
+        events.append({'event': 'signal', **base, 'action': row['action'], 'previous': previous['action'],
+                       'rsi': _number(row['rsi'])})
+    if row['sentiment'] != previous['sentiment']:
+        events.append({'event': 'sentiment', **base, 'sentiment': row['sentiment'], 'previous': previous['sentiment']})
+    if row.get('anomaly') == -1:
+        events.append({'event': 'anomaly', **base, 'anomaly_score': _number(row['anomaly_score'])})
+    return events
+
+
+class LiveMonitor:
+    """
+    Hub between one feed and many subscribers.
+
+    The first subscriber of a ticker seeds its state (concurrent first subscribers share
+    the seeding) and starts the ticker's pump; later subscribers join it. When the last
+    subscriber leaves, the pump stops but the state is kept warm, so a new subscriber
+    resumes from the last bar seen. Up to `max_idle` idle states are kept (LRU).
+
+    Subscribers receive JSON text on their queue. A subscriber whose queue is full loses
+    its oldest message rather than holding up the others.
+    """
+
+    def __init__(self, feed, contamination: float = 0.05, max_idle: int = 256, queue_size: int = 256):
+        self.feed = feed
+        self.contamination = contamination
+        self.max_idle = max_idle
+        self.queue_size = queue_size
+        self.streams: "OrderedDict[str, TickerStream]" = OrderedDict()
+        self._seeding = SingleFlight()
+        self._stats = {'seeds': 0, 'bars': 0, 'events': 0, 'messages': 0, 'dropped': 0}
+
+    def queue(self) -> asyncio.Queue:
+        return asyncio.Queue(maxsize=self.queue_size)
+
+    async def subscribe(self, ticker: str, queue: asyncio.Queue) -> None:
+        """
+        Adds a subscriber for a ticker. Raises LookupError when the feed has no data for it,
+        or whatever seeding the state raised.
+        """
+        ticker = ticker.strip().upper()
+        stream = self.streams.get(ticker) or await self._seeding.do(ticker, lambda: self._seed(ticker))
+        stream.subscribers.add(queue)
+        self.streams.move_to_end(ticker)
+        self.notify(queue, self._snapshot(stream))
+        if stream.task is None and not stream.finished:
+            stream.task = asyncio.create_task(self._pump(stream))
+
+    def unsubscribe(self, ticker: str, queue: asyncio.Queue) -> None:
+        stream = self.streams.get(ticker.strip().upper())
+        if stream is None:
+            return
+        stream.subscribers.discard(queue)
+        if not stream.subscribers and stream.task is not None:
+            stream.task.cancel()
+            stream.task = None
+        self._evict_idle()
+
+    async def _seed(self, ticker: str) -> TickerStream:
+        if ticker in self.streams:
+            return self.streams[ticker]
+        history = await asyncio.to_thread(self.feed.history, ticker)
+        if history is None or history.empty:
+            raise LookupError(f"No data for {ticker}.")
+        state = await asyncio.to_thread(IndicatorState.from_history, history.iloc[:-1], self.contamination)
+        # The last history bar gives the baseline the first live bar is compared with
+        last = state.update(history.iloc[-1].to_dict())
+        if last is None:
+            raise LookupError(f"Not enough history for {ticker}.")
+        stream = TickerStream(ticker=ticker, state=state, last=last)
+        self.streams[ticker] = stream
+        self._stats['seeds'] += 1
+        self._evict_idle()
+        return stream
+
+    async def _pump(self, stream: TickerStream) -> None:
+        try:
+            async for bar in self.feed.bars(stream.ticker, after=stream.last['date']):
+                # A few milliseconds per bar; run inline so a cancelled pump never leaves
+                # the state one bar ahead of stream.last
+                row = stream.state.update(bar)
+                if row is None:
+                    continue
+                self._stats['bars'] += 1
+                previous, stream.last = stream.last, row
+                for event in bar_events(stream.ticker, row, previous):
+                    self._publish(stream, event)
+            stream.finished = True
+            self._publish(stream, {'event': 'end', 'ticker': stream.ticker, 'date': str(stream.last['date'])})
+        except Exception as e:
+            print(f"Live feed for {stream.ticker} failed: {e}")
+            self._publish(stream, {'event': 'error', 'ticker': stream.ticker, 'detail': str(e)})
+        finally:
+            if stream.task is asyncio.current_task():
+                stream.task = None
+
+    def _snapshot(self, stream: TickerStream) -> Dict[str, Any]:
+        last = stream.last
+        return {'event': 'subscribed', 'ticker': stream.ticker, 'date': str(last['date']), 'close': _number(last['close']),
+                'sentiment': last['sentiment'], 'action': last['action'], 'finished': stream.finished}
+
+    @staticmethod
+    def _encode(event: Dict[str, Any]) -> str:
+        return json.dumps(event, separators=(',', ':'))
+
+    def _publish(self, stream: TickerStream, event: Dict[str, Any]) -> None:
+        # Encoded once for every subscriber
+        message = self._encode(event)
+        self._stats['events'] += 1
+        for queue in list(stream.subscribers):
+            self._send(queue, message)
+
+    def notify(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        """
+        Sends an event to one subscriber only (acknowledgements, errors).
+        """
+        self._send(queue, self._encode(event))
+
+    def _send(self, queue: asyncio.Queue, message: str) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self._stats['dropped'] += 1
+        queue.put_nowait(message)
+        self._stats['messages'] += 1
+
+    def _evict_idle(self) -> None:
+        idle = [ticker for ticker, stream in self.streams.items() if not stream.subscribers]
+        for ticker in idle[:max(0, len(idle) - self.max_idle)]:
+            del self.streams[ticker]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['tickers'] = len(self.streams)
+        stats['active'] = sum(1 for stream in self.streams.values() if stream.task is not None)
+        stats['subscribers'] = sum(len(stream.subscribers) for stream in self.streams.values())
+        return stats
+
+
+_monitor: Optional[LiveMonitor] = None
+
+
+def get_monitor() -> LiveMonitor:
+    """
+    Returns the process-wide live monitor, replaying the configured provider's bars.
+    """
+    global _monitor
+    if _monitor is None:
+        from core import config
+        start = config.LIVE_REPLAY_START or (pd.Timestamp.today() - pd.Timedelta(days=config.LIVE_REPLAY_DAYS)).strftime('%Y-%m-%d')
+        feed = ReplayFeed(start, interval=config.LIVE_INTERVAL, speed=config.LIVE_REPLAY_SPEED,
+                          history_bars=config.LIVE_HISTORY_BARS, max_frames=config.LIVE_MAX_IDLE_TICKERS)
+        _monitor = LiveMonitor(feed, contamination=config.LIVE_CONTAMINATION, max_idle=config.LIVE_MAX_IDLE_TICKERS)
+    return _monitor
+
+
+def set_monitor(monitor: Optional[LiveMonitor]) -> None:
+    """
+    Replaces the process-wide monitor (None rebuilds it from configuration).
+    """
+    global _monitor
+    if _monitor is not None and _monitor is not monitor:
+        for stream in _monitor.streams.values():
+            if stream.task is not None:
+                stream.task.cancel()
+    _monitor = monitor
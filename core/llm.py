@@ -1,38 +1,170 @@
+"""
+LLM analyst: providers that write the market interpretation, and the service in front of them.
+
+Providers turn a MarketContext (the facts of one ticker's analysis) into text: MockLLM
+renders an algorithmic assessment locally, HTTPLLM asks a model behind an OpenAI-compatible
+chat completions endpoint. Sentiment and action are always the algorithmic ones.
+
+LLMService is what the API calls. It runs the providers' async calls on its own event loop
+(so both async endpoints and worker threads can use it without blocking the server loop),
+with at most `max_concurrency` calls in flight per provider, a timeout after which MockLLM's
+text is returned instead, a cache keyed by a hash of the context, coalescing of identical
+contexts in flight, and several tickers batched into one prompt.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
 import pandas as pd
-from typing import Dict, Any
 from core.strategy import evaluate_market_condition
+from core.ttl_cache import TTLCache
+
+LANGUAGE_NAMES = {'en': 'English', 'pl': 'Polish'}
+
+
+@dataclass(frozen=True)
+class MarketContext:
+    """
+    Everything an analysis text is written from; equal contexts get the same text.
+    """
+    ticker: str
+    date: str
+    language: str
+    sentiment: str
+    action: str
+    close: float
+    ma_50: float
+    rsi: float
+    macd: float
+    adx: float
+    anomaly_dates: Tuple[str, ...]
+
+    def key(self) -> str:
+        """
+        Hash of the context, the response cache key.
+        """
+        return hashlib.sha1(json.dumps(asdict(self), sort_keys=True, default=str).encode()).hexdigest()
+
+    def describe(self) -> str:
+        """
+        The context as a prompt section.
+        """
+        recent = f" (most recent: {', '.join(self.anomaly_dates[-5:][::-1])})" if self.anomaly_dates else ""
+        return (
+            f"### {self.ticker}\n"
+            f"date: {self.date}\n"
+            f"verdict: {self.sentiment}, action: {self.action}\n"
+            f"close: {self.close:.2f}, 50-day moving average: {self.ma_50:.2f}\n"
+            f"RSI: {self.rsi:.1f}, MACD histogram: {self.macd:.3f}, ADX: {self.adx:.1f}\n"
+            f"anomalies in the period: {len(self.anomaly_dates)}{recent}"
+        )
+
+
+def market_context(ticker: str, anomalies_df: pd.DataFrame, latest_data: pd.Series, language: str = 'en') -> MarketContext:
+    """
+    Builds the context of an analysis from its anomalies and the latest bar.
+    """
+    # Re-use pre-calculated signals if available, else recalculate
+    if 'sentiment' in latest_data and 'action' in latest_data:
+        sentiment = latest_data['sentiment']
+        action = latest_data['action']
+    else:
+        sentiment, action = evaluate_market_condition(latest_data)
+
+    price = latest_data.get('close', 0)
+    return MarketContext(
+        ticker=ticker,
+        date=str(latest_data['date']).split()[0],
+        language=language,
+        sentiment=str(sentiment),
+        action=str(action),
+        close=float(price),
+        ma_50=float(latest_data.get('ma_50', price)),
+        rsi=float(latest_data.get('rsi', 50)),
+        macd=float(latest_data.get('macd', 0)),
+        adx=float(latest_data.get('adx', 0)),
+        anomaly_dates=tuple(anomalies_df['date'].astype(str)) if len(anomalies_df) else (),
+    )
+
+
+def build_prompt(contexts: Sequence[MarketContext]) -> str:
+    """
+    One prompt for one or several tickers (all in the same language).
+    """
+    language = LANGUAGE_NAMES.get(contexts[0].language, contexts[0].language)
+    instructions = (
+        f"You are a market analyst. In {language}, write a short interpretation (3-5 sentences, markdown allowed) "
+        "of the market context below: trend, momentum, trend strength and the detected anomalies. "
+        "The verdict and action are computed algorithmically: explain them, do not change them. "
+        "End with a one-line disclaimer that this is not financial advice."
+    )
+    if len(contexts) > 1:
+        instructions += " Answer with one JSON object mapping each ticker to its interpretation."
+    else:
+        instructions += " Answer with the interpretation only."
+    return "\n\n".join([instructions] + [context.describe() for context in contexts])
+
 
 class LLMProvider(ABC):
+    # Most calls LLMService sends this provider at once
+    max_concurrency: int = 4
+    # Most tickers one prompt may cover
+    max_batch: int = 1
+
     @abstractmethod
-    def generate_analysis(self, ticker: str, anomalies_df: pd.DataFrame, latest_data: pd.Series, language: str = 'en') -> Dict[str, Any]:
+    def generate(self, context: MarketContext) -> Dict[str, Any]:
         """
         Generates a natural language explanation and structured signals.
         Returns dict: {'text': str, 'sentiment': str, 'action': str}
         """
         pass
 
-class MockLLM(LLMProvider):
     def generate_analysis(self, ticker: str, anomalies_df: pd.DataFrame, latest_data: pd.Series, language: str = 'en') -> Dict[str, Any]:
+        """
+        generate() for the context of an analysis (see market_context).
+        """
+        return self.generate(market_context(ticker, anomalies_df, latest_data, language))
+
+    async def agenerate_batch(self, contexts: Sequence[MarketContext]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Awaitable generate for up to max_batch contexts; None for a context the provider did
+        not answer. Providers with a native async client override this; the default runs
+        the blocking generate in worker threads so the event loop stays free.
+        """
+        return list(await asyncio.gather(*(asyncio.to_thread(self.generate, c) for c in contexts)))
+
+    async def aclose(self) -> None:
+        """
+        Releases the provider's connections.
+        """
+
+
+class MockLLM(LLMProvider):
+    # Local and instant: no reason to limit or split calls
+    max_concurrency = 64
+    max_batch = 64
+
+    def generate(self, context: MarketContext) -> Dict[str, Any]:
         """
         Mock implementation with heuristic, algorithmic market assessment and localization.
         """
-        # Re-use pre-calculated signals if available, else recalculate
-        if 'sentiment' in latest_data and 'action' in latest_data:
-            sentiment = latest_data['sentiment']
-            action = latest_data['action']
-        else:
-            sentiment, action = evaluate_market_condition(latest_data)
+        ticker, language = context.ticker, context.language
+        sentiment, action = context.sentiment, context.action
 
         # Gather context
-        rsi = latest_data.get('rsi', 50)
-        macd = latest_data.get('macd', 0)
-        price = latest_data.get('close', 0)
-        ma_50 = latest_data.get('ma_50', price)
-        adx = latest_data.get('adx', 0)
-        count = len(anomalies_df)
-        dates = anomalies_df['date'].astype(str).tolist() if count > 0 else []
-        recent_date = str(latest_data['date']).split()[0]
+        rsi = context.rsi
+        macd = context.macd
+        price = context.close
+        ma_50 = context.ma_50
+        adx = context.adx
+        count = len(context.anomaly_dates)
+        dates = list(context.anomaly_dates)
+        recent_date = context.date
         
         # --- LOCALIZATION ---
         
@@ -94,3 +226,272 @@ class MockLLM(LLMProvider):
             "sentiment": sentiment,
             "action": action
         }
+
+    async def agenerate_batch(self, contexts: Sequence[MarketContext]) -> List[Optional[Dict[str, Any]]]:
+        return [self.generate(context) for context in contexts]
+
+
+class HTTPLLM(LLMProvider):
+    """
+    A model behind an OpenAI-compatible chat completions endpoint (OpenAI, vLLM,
+    llama.cpp, Ollama...). Up to `max_batch` tickers share one prompt, answered as a JSON
+    object keyed by ticker; tickers missing from the answer are reported as None.
+    """
+
+    def __init__(self, url: str, model: str = '', api_key: str = '', max_concurrency: int = 4, max_batch: int = 8,
+                 max_tokens: int = 400, timeout: float = 60.0):
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_batch = max_batch
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        # Created on first use, on the event loop of the service that owns this provider
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _request(self, contexts: Sequence[MarketContext]) -> Dict[str, Any]:
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        body = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': build_prompt(contexts)}],
+            'max_tokens': self.max_tokens * len(contexts),
+            'temperature': 0.2,
+        }
+        return {'url': self.url, 'json': body, 'headers': headers}
+
+    @staticmethod
+    def _results(contexts: Sequence[MarketContext], response: httpx.Response) -> List[Optional[Dict[str, Any]]]:
+        response.raise_for_status()
+        content = response.json()['choices'][0]['message']['content'] or ''
+        if len(contexts) == 1:
+            texts = {contexts[0].ticker: content.strip()}
+        else:
+            # Models may wrap the object in a code fence or add a sentence around it
+            start, end = content.find('{'), content.rfind('}')
+            try:
+                texts = json.loads(content[start:end + 1]) if start >= 0 else {}
+            except ValueError:
+                texts = {}
+        results = []
+        for context in contexts:
+            text = texts.get(context.ticker)
+            ok = isinstance(text, str) and text.strip()
+            results.append({'text': text.strip(), 'sentiment': context.sentiment, 'action': context.action} if ok else None)
+        return results
+
+    def generate(self, context: MarketContext) -> Dict[str, Any]:
+        result = self._results([context], httpx.post(timeout=self.timeout, **self._request([context])))[0]
+        if result is None:
+            raise ValueError(f"Empty answer for {context.ticker}.")
+        return result
+
+    async def agenerate_batch(self, contexts: Sequence[MarketContext]) -> List[Optional[Dict[str, Any]]]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._results(contexts, await self._client.post(**self._request(contexts)))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class LLMService:
+    """
+    Front of an LLMProvider used by the API (see the module docstring).
+
+    Calls run on a private event loop in a background thread: `analyze`/`analyze_many`
+    block the calling (worker) thread, `aanalyze`/`aanalyze_many` await from any loop.
+    Each provider call waits at most `timeout` seconds, queueing behind the concurrency
+    limit included; on timeout or error the contexts get MockLLM's text, which is not
+    cached, so the model is asked again next time. Answers are cached for `ttl` seconds.
+    Every result carries `fallback`, so callers can keep canned text out of their own caches.
+    """
+
+    def __init__(self, provider: LLMProvider, timeout: float = 10.0, cache_size: int = 1024,
+                 ttl: Optional[float] = 86400.0, fallback: Optional[LLMProvider] = None):
+        self.provider = provider
+        self.timeout = timeout
+        self.fallback = fallback or MockLLM()
+        self.cache = TTLCache(max_entries=cache_size, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'contexts': 0, 'coalesced': 0, 'calls': 0, 'generated': 0,
+            'timeouts': 0, 'errors': 0, 'fallbacks': 0, 'call_seconds': 0.0, 'max_call_seconds': 0.0,
+        }
+
+    # --- Event loop ---
+
+    def _submit(self, coro):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='llm', daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def close(self) -> None:
+        """
+        Closes the provider's connections and stops the event loop.
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.provider.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    # --- Public API ---
+
+    def analyze(self, context: MarketContext) -> Dict[str, Any]:
+        return self.analyze_many([context])[0]
+
+    def analyze_many(self, contexts: Sequence[MarketContext]) -> List[Dict[str, Any]]:
+        """
+        Results for several contexts, batched into as few prompts as the provider allows.
+        """
+        return self._submit(self._analyze_many(list(contexts))).result()
+
+    async def aanalyze(self, context: MarketContext) -> Dict[str, Any]:
+        return (await self.aanalyze_many([context]))[0]
+
+    async def aanalyze_many(self, contexts: Sequence[MarketContext]) -> List[Dict[str, Any]]:
+        return await asyncio.wrap_future(self._submit(self._analyze_many(list(contexts))))
+
+    # --- On the service loop ---
+
+    def _record(self, name: str, value) -> None:
+        with self._lock:
+            self._stats[name] += value
+
+    async def _analyze_many(self, contexts: List[MarketContext]) -> List[Dict[str, Any]]:
+        self._record('requests', 1)
+        self._record('contexts', len(contexts))
+        loop = asyncio.get_running_loop()
+        answers: Dict[str, Any] = {}
+        todo: List[MarketContext] = []
+        for context in contexts:
+            key = context.key()
+            if key in answers:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                answers[key] = cached
+            elif key in self._inflight:
+                # The same context is being generated for another caller
+                self._record('coalesced', 1)
+                answers[key] = self._inflight[key]
+            else:
+                answers[key] = self._inflight[key] = loop.create_future()
+                todo.append(context)
+
+        await asyncio.gather(*(self._generate(batch) for batch in self._batches(todo)))
+        results = []
+        for context in contexts:
+            answer = answers[context.key()]
+            if isinstance(answer, asyncio.Future):
+                answer = await asyncio.shield(answer)
+            # Callers get their own copy of cached answers
+            results.append(dict(answer))
+        return results
+
+    def _batches(self, contexts: List[MarketContext]) -> List[List[MarketContext]]:
+        # One language per prompt, each ticker at most once per prompt (answers are keyed by ticker)
+        batches: List[List[MarketContext]] = []
+        open_batches: Dict[str, List[MarketContext]] = {}
+        for context in contexts:
+            batch = open_batches.get(context.language)
+            if (batch is None or len(batch) >= max(self.provider.max_batch, 1)
+                    or any(c.ticker == context.ticker for c in batch)):
+                batch = open_batches[context.language] = []
+                batches.append(batch)
+            batch.append(context)
+        return batches
+
+    async def _call(self, batch: List[MarketContext]) -> List[Optional[Dict[str, Any]]]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(self.provider.max_concurrency, 1))
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                return await self.provider.agenerate_batch(batch)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._record('calls', 1)
+                self._record('call_seconds', elapsed)
+                with self._lock:
+                    self._stats['max_call_seconds'] = max(self._stats['max_call_seconds'], elapsed)
+
+    async def _generate(self, batch: List[MarketContext]) -> None:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        try:
+            results = await asyncio.wait_for(self._call(batch), self.timeout)
+        except asyncio.TimeoutError:
+            self._record('timeouts', 1)
+            print(f"LLM call for {', '.join(c.ticker for c in batch)} timed out after {self.timeout}s; using the algorithmic text.")
+        except Exception as e:
+            self._record('errors', 1)
+            print(f"LLM call for {', '.join(c.ticker for c in batch)} failed ({e}); using the algorithmic text.")
+        finally:
+            for context, result in zip(batch, results):
+                key = context.key()
+                if result is None:
+                    self._record('fallbacks', 1)
+                    result = dict(self.fallback.generate(context), fallback=True)
+                else:
+                    self._record('generated', 1)
+                    result = dict(result, fallback=False)
+                    self.cache.set(key, result)
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['provider'] = type(self.provider).__name__
+        stats['avg_call_seconds'] = stats['call_seconds'] / stats['calls'] if stats['calls'] else 0.0
+        stats['in_flight'] = len(self._inflight)
+        stats['cache'] = self.cache.stats()
+        return stats
+
+
+_service: Optional[LLMService] = None
+
+
+def get_llm() -> LLMService:
+    """
+    Returns the process-wide LLM service, built from configuration on first use.
+    """
+    global _service
+    if _service is None:
+        from core import config
+
+        if config.LLM_PROVIDER == 'http':
+            provider: LLMProvider = HTTPLLM(config.LLM_URL, model=config.LLM_MODEL, api_key=config.LLM_API_KEY,
+                                            max_concurrency=config.LLM_MAX_CONCURRENCY, max_batch=config.LLM_MAX_BATCH)
+        elif config.LLM_PROVIDER == 'mock':
+            provider = MockLLM()
+        else:
+            raise ValueError(f"Unknown LLM provider '{config.LLM_PROVIDER}'. Use 'mock' or 'http'.")
+        _service = LLMService(provider, timeout=config.LLM_TIMEOUT, cache_size=config.LLM_CACHE_SIZE,
+                              ttl=config.LLM_CACHE_TTL)
+    return _service
+
+
+def set_llm(service: Optional[LLMService]) -> None:
+    """
+    Replaces the process-wide LLM service (None rebuilds it from configuration); the
+    previous one is closed.
+    """
+    global _service
+    previous, _service = _service, service
+    if previous is not None and previous is not service:
+        previous.close()
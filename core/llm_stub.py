@@ -0,0 +1,119 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint, for tests and benchmarks.
+
+Answers after `latency` seconds plus `per_ticker` seconds for every ticker section
+('### TICKER') in the prompt, as a model takes longer to write more text. Prompts covering
+several tickers get a JSON object keyed by ticker, single tickers plain text.
+
+Usage:
+    python -m core.llm_stub [--port 8080] [--latency 1.0] [--per-ticker 0.2]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+TICKER_HEADER = re.compile(r'^### (\S+)', re.MULTILINE)
+
+
+class StubLLMServer:
+    """
+    Chat completions stub on a background thread. `requests` counts the calls, `prompts`
+    keeps their tickers and `max_in_flight` the most calls it served at once.
+    """
+
+    def __init__(self, latency: float = 0.0, per_ticker: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.per_ticker = per_ticker
+        self.requests = 0
+        self.prompts: List[List[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def answer(self, prompt: str) -> str:
+        tickers = TICKER_HEADER.findall(prompt)
+        texts = {ticker: f"Stub analysis for {ticker}." for ticker in tickers}
+        if len(tickers) == 1:
+            return texts[tickers[0]]
+        return json.dumps(texts)
+
+    def _complete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = body['messages'][-1]['content']
+        tickers = TICKER_HEADER.findall(prompt)
+        with self._lock:
+            self.requests += 1
+            self.prompts.append(tickers)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency + self.per_ticker * len(tickers))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {
+            'object': 'chat.completion',
+            'model': body.get('model') or 'stub',
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': self.answer(prompt)}}],
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.dumps(stub._complete(json.loads(self.rfile.read(length)))).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name='llm-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=1.0)
+    parser.add_argument('--per-ticker', type=float, default=0.2)
+    args = parser.parse_args()
+
+    stub = StubLLMServer(latency=args.latency, per_ticker=args.per_ticker, host='0.0.0.0', port=args.port)
+    print(f"Stub LLM listening on {stub.url}")
+    stub._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Local memory-mapped market data store.
+
+Usage (bulk import):
+    python -m core.local_store import dumps/*.csv dumps/*.parquet [--root market_data] [--ticker AAPL] [--interval 1m]
+    python -m core.local_store list [--root market_data] [--interval 1m]
+"""
+import argparse
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from typing import Dict, Iterable, List, Optional, Tuple
+from core.data_loader import DataProvider, REQUIRED_COLUMNS
+from core.intervals import DAILY, INTERVALS
+
+SUFFIX = '.arrow'
+
+# Column names found in common dumps -> pipeline names
+_ALIASES = {'datetime': 'date', 'timestamp': 'date', 'time': 'date', 'symbol': 'ticker'}
+
+
+class LocalStore(DataProvider):
+    """
+    Offline provider reading per-ticker columnar files from a local directory.
+
+    Each ticker is one uncompressed Arrow IPC file ('<TICKER>.arrow', '<TICKER>@<interval>.arrow'
+    for intraday bars) sorted by date.
+    Files are memory-mapped once and kept open, so a fetch is a binary search on the
+    date column plus zero-copy slices of the mapped columns. The returned frames are
+    read-only views unless `copy=True`; the pipeline only adds columns, but callers
+    that modify values in place must copy first. A file rewritten by `write` is
+    re-mapped on the next fetch.
+    """
+
+    intervals = tuple(INTERVALS)
+
+    def __init__(self, root: str, copy: bool = False):
+        self.root = root
+        self.copy = copy
+        self._tables: Dict[str, Tuple[Tuple[int, int], pa.Table, Dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, ticker: str, interval: str = DAILY) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker.upper())
+        if interval != DAILY:
+            safe += '@' + interval
+        return os.path.join(self.root, safe + SUFFIX)
+
+    def tickers(self, interval: str = DAILY) -> List[str]:
+        names = [name[:-len(SUFFIX)] for name in os.listdir(self.root) if name.endswith(SUFFIX)]
+        if interval == DAILY:
+            return sorted(name for name in names if '@' not in name)
+        tag = '@' + interval
+        return sorted(name[:-len(tag)] for name in names if name.endswith(tag))
+
+    def _open(self, ticker: str, interval: str = DAILY) -> Optional[Tuple[pa.Table, Dict[str, np.ndarray]]]:
+        path = self._path(ticker, interval)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._tables.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1], cached[2]
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+            # NumPy views of the single-chunk columns (no copy: no nulls, fixed width)
+            columns = {name: table.column(name).chunk(0).to_numpy() if table.num_rows else np.empty(0)
+                       for name in table.column_names}
+            self._tables[path] = (version, table, columns)
+            return table, columns
+
+    def fetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        opened = self._open(ticker, interval)
+        if opened is None:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+        _, columns = opened
+        dates = columns['date']
+        lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side='left'))
+        hi = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='left'))
+        if hi <= lo:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+        return pd.DataFrame({name: values[lo:hi] for name, values in columns.items()}, copy=self.copy)
+
+    def write(self, ticker: str, df: pd.DataFrame, merge: bool = True, interval: str = DAILY) -> int:
+        """
+        Stores bars for a ticker (merged with existing ones unless merge=False; new rows
+        win on equal dates). Returns the number of rows in the stored file.
+        """
+        new = prepare_ohlcv(df)
+        if merge:
+            opened = self._open(ticker, interval)
+            if opened is not None and opened[0].num_rows:
+                new = pd.concat([opened[0].to_pandas(), new], ignore_index=True)
+                new = new.drop_duplicates(subset='date', keep='last').sort_values('date', kind='stable')
+        table = pa.Table.from_pandas(new.reset_index(drop=True), preserve_index=False).combine_chunks()
+
+        path = self._path(ticker, interval)
+        tmp_path = path + '.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return table.num_rows
+
+
+def prepare_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes a raw dump to the stored layout: OHLCV columns only, naive timestamps
+    (timezone-aware ones converted to UTC), float prices and int64 volume, sorted by date
+    with duplicate dates removed. Rows without a close or a volume are dropped.
+    """
+    df = df.rename(columns=lambda c: _ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}. Expected {', '.join(REQUIRED_COLUMNS)}.")
+
+    # Naive timestamps are kept as they are; aware ones (even with mixed offsets) become UTC
+    dates = pd.to_datetime(df['date'], utc=True).dt.tz_localize(None)
+    out = pd.DataFrame({'date': dates.astype('datetime64[ns]')})
+    for col in ('open', 'high', 'low', 'close'):
+        out[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64).to_numpy()
+    out['volume'] = pd.to_numeric(df['volume'], errors='coerce').to_numpy()
+    # Bars without a volume are dropped rather than stored as 0 shares (which would read as a
+    # volume collapse); the feature engines drop them for every other provider too
+    out = out.dropna(subset=['date', 'close', 'volume'])
+    out['volume'] = out['volume'].astype(np.int64)
+    return out.drop_duplicates(subset='date', keep='last').sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def read_dump(path: str) -> pd.DataFrame:
+    if path.lower().endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def import_files(store: LocalStore, paths: Iterable[str], ticker: Optional[str] = None,
+                 interval: str = DAILY) -> Dict[str, int]:
+    """
+    Bulk-loads CSV/Parquet dumps. A file with a 'ticker' (or 'symbol') column may hold
+    several tickers; otherwise the ticker is `ticker` or the file name.
+
+    Returns:
+        Ticker -> rows stored after the import.
+    """
+    stored: Dict[str, int] = {}
+    for path in paths:
+        raw = read_dump(path)
+        raw = raw.rename(columns=lambda c: _ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+        if 'ticker' in raw.columns and ticker is None:
+            groups = raw.groupby('ticker', sort=False)
+        else:
+            name = ticker or os.path.splitext(os.path.basename(path))[0]
+            groups = [(name, raw)]
+        for name, group in groups:
+            stored[str(name).upper()] = store.write(str(name), group, interval=interval)
+            print(f"Imported {len(group)} rows for {str(name).upper()} from {path}.")
+    return stored
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="Bulk-load CSV/Parquet dumps")
+    import_parser.add_argument('paths', nargs='+')
+    import_parser.add_argument('--ticker', default=None, help="Ticker for single-ticker files (default: file name)")
+    list_parser = commands.add_parser('list', help="List stored tickers")
+    for sub in (import_parser, list_parser):
+        sub.add_argument('--root', default=None, help="Store directory (default: STOCKGUARD_LOCAL_STORE_DIR)")
+        sub.add_argument('--interval', default=DAILY, choices=list(INTERVALS), help="Bar interval of the files")
+    args = parser.parse_args(argv)
+
+    from core import config
+    store = LocalStore(args.root or config.LOCAL_STORE_DIR)
+    if args.command == 'import':
+        stored = import_files(store, args.paths, ticker=args.ticker, interval=args.interval)
+        print(f"Stored {len(stored)} tickers in {store.root}.")
+    else:
+        for name in store.tickers(args.interval):
+            table, columns = store._open(name, args.interval)
+            dates = columns['date']
+            first, last = (str(pd.Timestamp(d)) for d in (dates[0], dates[-1])) if len(dates) else ('-', '-')
+            print(f"{name:<12} {table.num_rows:>10} rows  {first} .. {last}")
+
+
+if __name__ == "__main__":
+    main()
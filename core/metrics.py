@@ -0,0 +1,213 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Stage latency buckets in seconds (1 ms .. 30 s)
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple((name, str(labels[name])) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple((name, str(labels[name])) for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[Labels, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple((name, str(labels[name])) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple((name, str(labels[name])) for name in self.labelnames))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (math.inf,), counts):
+                    cumulative += n
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Metric read at scrape time from existing counters (cache and model registry stats).
+    `func` returns [(labels dict, value), ...].
+    """
+
+    def __init__(self, name: str, help: str, kind: str, func: Callable[[], List[Tuple[Dict[str, str], float]]]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.func = func
+
+    def render(self) -> List[str]:
+        try:
+            samples = self.func()
+        except Exception as e:
+            print(f"Metric {self.name} unavailable: {e}")
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in samples:
+            lines.append(f"{self.name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'stockguard_stage_seconds', 'Time spent per request stage.', ('endpoint', 'stage')))
+ROWS_PROCESSED = REGISTRY.register(Counter(
+    'stockguard_rows_processed_total', 'Rows run through feature engineering and anomaly detection.', ('endpoint',)))
+# Grows with traffic (cache hits included); upstream downloads are stockguard_provider_bytes_total
+FRAME_BYTES = REGISTRY.register(Counter(
+    'stockguard_frame_bytes_total', 'In-memory size of OHLCV frames served to the pipeline, cache hits included.',
+    ('endpoint',)))
+
+
+class StageTimer:
+    """
+    Times the stages of one request. Durations accumulate per stage name, are observed
+    into the stage histogram and rendered as a Server-Timing header.
+    A disabled timer does nothing (instrumentation switched off).
+    """
+
+    def __init__(self, endpoint: str, enabled: Optional[bool] = None):
+        if enabled is None:
+            from core import config
+            enabled = config.METRICS_ENABLED
+        self.endpoint = endpoint
+        self.enabled = enabled
+        self.stages: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        STAGE_SECONDS.observe(seconds, endpoint=self.endpoint, stage=name)
+
+    def count(self, counter: Counter, amount: float) -> None:
+        """
+        Adds to a per-endpoint counter (rows processed, frame bytes).
+        """
+        if self.enabled:
+            counter.inc(amount, endpoint=self.endpoint)
+
+    def finish(self) -> float:
+        """
+        Records the 'total' stage (time since the timer was created) and returns it.
+        """
+        total = time.perf_counter() - self._start
+        self.record('total', total)
+        return total
+
+    def header(self) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items())
+
+    def apply(self, response) -> None:
+        """
+        Finishes the timer and sets the Server-Timing header on a response.
+        """
+        if not self.enabled:
+            return
+        self.finish()
+        response.headers['Server-Timing'] = self.header()
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import threading
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from core.anomaly import build_model
+from core.ttl_cache import TTLCache
+
+
+def fingerprint(values: np.ndarray) -> str:
+    """
+    Stable hash of a feature matrix, used to check that cached training rows are unchanged.
+    """
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+@dataclass
+class ModelEntry:
+    model: Any
+    features: List[str]
+    n_train: int
+    fingerprint: str
+    train_raw: np.ndarray  # score_samples of the training rows
+    fitted_at: float
+
+
+def offset_at(train_raw: np.ndarray, contamination: float) -> float:
+    """
+    The model's decision threshold at a contamination level, as IsolationForest.fit sets
+    offset_ (that percentile of the training rows' raw scores).
+    """
+    return float(np.percentile(train_raw, 100.0 * contamination))
+
+
+class ModelRegistry:
+    """
+    Cache of fitted Isolation Forests with a score-only fast path.
+
+    Models are keyed by ticker, feature set and the training window's first row. The trees
+    do not depend on contamination, which only sets the threshold on the training rows' raw
+    scores (offset_at) and the drift check, so every level shares one fit. A cached model is
+    reused while its training rows are unchanged and at most `refit_every` bars have been
+    appended since the fit: only the appended rows are scored. It is refitted when that
+    budget is exceeded or when the appended rows drift (their anomaly rate exceeds
+    `drift_factor` x contamination over at least `min_drift_rows` rows).
+
+    Entries are evicted LRU beyond `max_entries` and expire after `ttl` seconds. With
+    `persist_dir` set, fitted entries are also written to disk and reloaded on a memory miss.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600.0, persist_dir: Optional[str] = None,
+                 refit_every: int = 20, drift_factor: float = 3.0, min_drift_rows: int = 10):
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self.refit_every = refit_every
+        self.drift_factor = drift_factor
+        self.min_drift_rows = min_drift_rows
+        self._lock = threading.Lock()
+        self._stats = {
+            'fits': 0, 'fit_seconds': 0.0, 'refits_window': 0, 'refits_drift': 0, 'refits_changed': 0,
+            'score_only': 0, 'score_seconds': 0.0, 'rows_scored': 0, 'disk_loads': 0,
+        }
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    # --- Keys & persistence ---
+
+    @staticmethod
+    def make_key(ticker: str, features: List[str], values: np.ndarray) -> Tuple:
+        # The training window is identified by its first row
+        return (ticker.upper(), tuple(features), fingerprint(values[:1]))
+
+    def _path(self, key: Tuple) -> str:
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.persist_dir, f"{name}.joblib")
+
+    def _lookup(self, key: Tuple) -> Optional[ModelEntry]:
+        entry = self.cache.get(key)
+        if entry is not None or not self.persist_dir:
+            return entry
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+            os.remove(path)
+            return None
+        entry = joblib.load(path)
+        self.cache.set(key, entry)
+        self._record('disk_loads', 1)
+        return entry
+
+    def _store(self, key: Tuple, entry: ModelEntry) -> None:
+        self.cache.set(key, entry)
+        if self.persist_dir:
+            path = self._path(key)
+            joblib.dump(entry, path + '.tmp')
+            os.replace(path + '.tmp', path)
+
+    def _record(self, name: str, value) -> None:
+        with self._lock:
+            self._stats[name] += value
+
+    # --- Scoring ---
+
+    def _drifted(self, labels: np.ndarray, contamination: float) -> bool:
+        if len(labels) < self.min_drift_rows:
+            return False
+        return float(np.mean(labels == -1)) > self.drift_factor * contamination
+
+    def score(self, ticker: str, X: pd.DataFrame, contamination: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (anomaly labels, decision_function scores) for every row of X,
+        reusing a cached model when the refit policy allows it.
+        """
+        labels, scores, _ = self._score(ticker, X, contamination)
+        return labels, scores
+
+    def score_samples(self, ticker: str, X: pd.DataFrame, contamination: float = 0.05) -> np.ndarray:
+        """
+        Returns the raw scores (IsolationForest.score_samples, lower is more anomalous) for
+        every row of X, with the same reuse and refit policy as score.
+        """
+        return self._score(ticker, X, contamination)[2]
+
+    def _score(self, ticker: str, X: pd.DataFrame, contamination: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        values = X.to_numpy(dtype=np.float64)
+        features = list(X.columns)
+        key = self.make_key(ticker, features, values)
+        entry = self._lookup(key)
+
+        if entry is not None:
+            if len(values) < entry.n_train or fingerprint(values[:entry.n_train]) != entry.fingerprint:
+                self._record('refits_changed', 1)
+            elif len(values) - entry.n_train > self.refit_every:
+                self._record('refits_window', 1)
+            else:
+                new_rows = X.iloc[entry.n_train:]
+                start = time.perf_counter()
+                new_raw = entry.model.score_samples(new_rows) if len(new_rows) else np.empty(0)
+                # Same rules as IsolationForest.decision_function and predict
+                offset = offset_at(entry.train_raw, contamination)
+                new_scores = new_raw - offset
+                new_labels = np.where(new_scores < 0, -1, 1)
+                elapsed = time.perf_counter() - start
+
+                if not self._drifted(new_labels, contamination):
+                    self._record('score_only', 1)
+                    self._record('score_seconds', elapsed)
+                    self._record('rows_scored', len(new_rows))
+                    print(f"Anomaly model for {ticker}: reused, scored {len(new_rows)} new rows in {elapsed:.4f}s.")
+                    raw = np.concatenate([entry.train_raw, new_raw])
+                    scores = raw - offset
+                    return np.where(scores < 0, -1, 1), scores, raw
+                self._record('refits_drift', 1)
+
+        start = time.perf_counter()
+        model = build_model(contamination).fit(X)
+        raw = model.score_samples(X)
+        scores = raw - model.offset_
+        labels = np.where(scores < 0, -1, 1)
+        elapsed = time.perf_counter() - start
+        self._record('fits', 1)
+        self._record('fit_seconds', elapsed)
+        print(f"Anomaly model for {ticker}: fitted on {len(X)} rows in {elapsed:.4f}s.")
+
+        self._store(key, ModelEntry(
+            model=model, features=features, n_train=len(values), fingerprint=fingerprint(values),
+            train_raw=raw, fitted_at=time.time(),
+        ))
+        return labels, scores, raw
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['avg_fit_seconds'] = stats['fit_seconds'] / stats['fits'] if stats['fits'] else 0.0
+        stats['avg_score_seconds'] = stats['score_seconds'] / stats['score_only'] if stats['score_only'] else 0.0
+        stats['cache'] = self.cache.stats()
+        return stats
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Returns the process-wide model registry, built from configuration on first use.
+    """
+    global _registry
+    if _registry is None:
+        from core import config
+        _registry = ModelRegistry(
+            max_entries=config.MODEL_CACHE_SIZE,
+            ttl=config.MODEL_CACHE_TTL,
+            persist_dir=config.MODEL_CACHE_DIR or None,
+            refit_every=config.MODEL_REFIT_EVERY,
+            drift_factor=config.MODEL_DRIFT_FACTOR,
+        )
+    return _registry
+
+
+def set_registry(registry: Optional[ModelRegistry]) -> None:
+    """
+    Replaces the process-wide registry (None rebuilds it from configuration).
+    """
+    global _registry
+    _registry = registry
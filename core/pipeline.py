@@ -0,0 +1,170 @@
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from core.anomaly import FEATURE_COLUMNS, detect_anomalies
+from core.detectors import ISOLATION_FOREST
+from core.features import SIGNAL_COLUMNS, add_technical_indicators
+
+_executor: Optional[Executor] = None
+_executor_workers = 0
+
+
+# Indicator columns an analysis needs: model features, OBV (returned to clients) and the signals
+ANALYSIS_OUTPUTS = tuple(dict.fromkeys(FEATURE_COLUMNS + ['obv'] + SIGNAL_COLUMNS))
+
+
+def compute_features(df: pd.DataFrame, outputs: Optional[Iterable[str]] = ANALYSIS_OUTPUTS) -> pd.DataFrame:
+    """
+    Runs feature engineering on one ticker's OHLCV frame (only the `outputs` columns).
+    Raises ValueError when the history is too short for the indicators.
+    """
+    df = add_technical_indicators(df, outputs=outputs)
+    if df.empty:
+        raise ValueError("Starting data was insufficient to generate technical indicators (requires > 200 days of history).")
+    return df
+
+
+def analyze_frame(df: pd.DataFrame, contamination: float = 0.05, ticker: Optional[str] = None,
+                  method: str = ISOLATION_FOREST) -> pd.DataFrame:
+    """
+    Runs feature engineering and anomaly detection on one ticker's OHLCV frame.
+    Raises ValueError when the history is too short for the indicators.
+    """
+    df = compute_features(df)
+    return detect_anomalies(df, contamination=contamination, ticker=ticker, method=method)
+
+
+def get_executor(max_workers: int) -> Executor:
+    """
+    Returns the shared process pool, (re)creating it when the configured size changes
+    or a worker died and left it broken.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != max_workers or getattr(_executor, '_broken', False):
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        # 'spawn' keeps workers independent of the server's threads
+        _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        _executor_workers = max_workers
+    return _executor
+
+
+def _discard_executor(executor: Executor) -> None:
+    global _executor
+    if _executor is executor:
+        executor.shutdown(wait=False)
+        _executor = None
+
+
+# (func, args, kwargs) of one pool task
+Task = Tuple[Callable[..., Any], Sequence[Any], Dict[str, Any]]
+
+
+def run_tasks(tasks: List[Task], max_workers: int) -> List[Union[Any, Exception]]:
+    """
+    Runs picklable tasks on the shared pool and returns their results, or the exception
+    each one raised, in order. When a worker dies (OOM, a crash in native code) the pool
+    is broken for every task; it is replaced and the affected tasks run once more.
+    """
+    outcomes: List[Union[Any, Exception]] = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    for attempt in range(2):
+        executor = get_executor(max_workers)
+        try:
+            futures = {i: executor.submit(tasks[i][0], *tasks[i][1], **tasks[i][2]) for i in pending}
+        except BrokenProcessPool as e:
+            futures = {}
+            for i in pending:
+                outcomes[i] = e
+        for i, future in futures.items():
+            error = future.exception()
+            outcomes[i] = error if error is not None else future.result()
+        pending = [i for i in pending if isinstance(outcomes[i], BrokenProcessPool)]
+        if not pending:
+            break
+        print(f"Process pool broken ({len(pending)} tasks lost), restarting it.")
+        _discard_executor(executor)
+    return outcomes
+
+
+def _run_shared(name: str, shape: Tuple[int, ...], dtype: str, func: Callable[..., Any], args: Sequence[Any]) -> Any:
+    # Runs in a pool worker: map the parent's array without copying it
+    shm = shared_memory.SharedMemory(name=name)
+    array = None
+    try:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        array.flags.writeable = False
+        return func(array, *args)
+    finally:
+        # The mapping has to be released before the segment can be closed
+        array = None
+        shm.close()
+
+
+def map_shared(array: np.ndarray, func: Callable[..., Any], tasks: List[Sequence[Any]], max_workers: int) -> List[Any]:
+    """
+    Calls func(array, *args) for every args in `tasks` across the process pool. The array is
+    placed once in shared memory and mapped read-only by the workers instead of being
+    pickled for every task. Returns the results in order; raises the first task's error.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+        outcomes = run_tasks([(_run_shared, (shm.name, array.shape, array.dtype.str, func, args), {}) for args in tasks],
+                             max_workers)
+    finally:
+        shm.close()
+        shm.unlink()
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            raise outcome
+    return outcomes
+
+
+def map_frames(func: Callable[..., pd.DataFrame], frames: Dict[str, pd.DataFrame],
+               max_workers: Optional[int] = None, with_ticker: bool = False,
+               **kwargs) -> Dict[str, Union[pd.DataFrame, Exception]]:
+    """
+    Applies a module-level function to every ticker's frame across the process pool.
+
+    Args:
+        func: Picklable function called as func(df, **kwargs).
+        frames: Ticker -> DataFrame.
+        max_workers: Pool size; defaults to config.BATCH_MAX_WORKERS. With 1 (or a single
+            frame) everything runs in the calling process.
+        with_ticker: Also pass ticker=<ticker> to func.
+
+    Returns:
+        Ticker -> result DataFrame, or the exception raised for that ticker.
+    """
+    if max_workers is None:
+        from core import config
+        max_workers = config.BATCH_MAX_WORKERS
+
+    def call_kwargs(ticker: str) -> Dict:
+        return dict(kwargs, ticker=ticker) if with_ticker else kwargs
+
+    results: Dict[str, Union[pd.DataFrame, Exception]] = {}
+    if max_workers <= 1 or len(frames) <= 1:
+        for ticker, df in frames.items():
+            try:
+                results[ticker] = func(df, **call_kwargs(ticker))
+            except Exception as e:
+                results[ticker] = e
+        return results
+
+    outcomes = run_tasks([(func, (df,), call_kwargs(ticker)) for ticker, df in frames.items()], max_workers)
+    return dict(zip(frames, outcomes))
+
+
+def analyze_frames(frames: Dict[str, pd.DataFrame], contamination: float = 0.05,
+                   max_workers: Optional[int] = None, method: str = ISOLATION_FOREST) -> Dict[str, Union[pd.DataFrame, Exception]]:
+    """
+    Fans analyze_frame (features + per-ticker anomaly model) out across the process pool.
+    """
+    return map_frames(analyze_frame, frames, max_workers=max_workers, with_ticker=True, contamination=contamination,
+                      method=method)
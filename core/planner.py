@@ -0,0 +1,54 @@
+"""
+Range planning: how much history to fetch before a requested start date so that the
+requested indicators are warmed up (and their smoothing settled) on the first day.
+
+Warm-up is counted in bars. For intraday intervals it is converted to trading sessions
+of `bars_per_session` bars each (a regular US session; 24h markets over-fetch slightly).
+"""
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+from core.features import warmup_bars
+from core.intervals import DAILY, get_interval
+from core.utils import get_trading_lookback_date
+
+
+@dataclass(frozen=True)
+class RangePlan:
+    start_date: str
+    end_date: str
+    fetch_start: str
+    warmup_bars: int
+    outputs: Optional[Tuple[str, ...]]
+    interval: str = DAILY
+
+
+def plan_range(start_date: str, end_date: str, outputs: Optional[Iterable[str]] = None,
+               margin: Optional[int] = None, extra: int = 0, interval: str = DAILY) -> RangePlan:
+    """
+    Plans the fetch for [start_date, end_date] given the indicator outputs needed.
+
+    Args:
+        outputs: Indicator/signal columns (None for all of them). Raises ValueError for unknown names.
+        margin: Extra bars for unscheduled closures. Defaults to config.WARMUP_MARGIN_BARS.
+        extra: Further sessions needed before start_date once the indicators are warm
+            (e.g. a walk-forward training window).
+        interval: Bar interval; warm-up, margin and extra are bars of this interval.
+    Returns:
+        RangePlan with the trading-calendar fetch start.
+    """
+    if margin is None:
+        from core import config
+        margin = config.WARMUP_MARGIN_BARS
+    outputs = tuple(outputs) if outputs is not None else None
+    bars = warmup_bars(outputs)
+    # Whole sessions holding the bars needed before the start date
+    sessions = math.ceil((bars + margin + extra) / get_interval(interval).bars_per_session)
+    return RangePlan(
+        start_date=start_date,
+        end_date=end_date,
+        fetch_start=get_trading_lookback_date(start_date, sessions),
+        warmup_bars=bars,
+        outputs=outputs,
+        interval=interval,
+    )
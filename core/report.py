@@ -12,7 +12,10 @@ class PDFReport(FPDF):
         self.set_font('Arial', 'I', 8)
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
-def create_pdf_report(ticker: str, analysis: str, anomalies_df: pd.DataFrame, file_path: str):
+def render_pdf_report(ticker: str, analysis: str, anomalies_df: pd.DataFrame) -> bytes:
+    """
+    Renders the anomaly report and returns the PDF document as bytes.
+    """
     pdf = PDFReport()
     pdf.add_page()
     
@@ -58,4 +61,9 @@ def create_pdf_report(ticker: str, analysis: str, anomalies_df: pd.DataFrame, fi
                 pdf.cell(col_widths[i], 10, datum, 1)
             pdf.ln()
             
-    pdf.output(file_path)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def create_pdf_report(ticker: str, analysis: str, anomalies_df: pd.DataFrame, file_path: str):
+    with open(file_path, 'wb') as f:
+        f.write(render_pdf_report(ticker, analysis, anomalies_df))
@@ -0,0 +1,181 @@
+import threading
+import time
+import uuid
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Dict, Optional
+from core.report import render_pdf_report
+from core.ttl_cache import TTLCache
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the report queue already holds its maximum of pending jobs."""
+
+
+@dataclass
+class ReportJob:
+    job_id: str
+    ticker: str
+    status: str = 'queued'  # queued, running, done, failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    size: int = 0
+    result: Optional[SpooledTemporaryFile] = None
+    future: Optional[Future] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def read(self) -> bytes:
+        with self.lock:
+            if self.result is None:
+                raise LookupError(f"Report {self.job_id} has no result.")
+            self.result.seek(0)
+            return self.result.read()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.result is not None:
+                self.result.close()
+                self.result = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        render_seconds = self.finished_at - self.started_at if self.finished_at and self.started_at else None
+        return {
+            'job_id': self.job_id,
+            'ticker': self.ticker,
+            'status': self.status,
+            'size': self.size,
+            'error': self.error,
+            'queued_seconds': (self.started_at or time.time()) - self.created_at,
+            'render_seconds': render_seconds,
+        }
+
+
+class ReportJobManager:
+    """
+    Renders PDF reports on a bounded thread pool.
+
+    Jobs are submitted with the report inputs and polled by id. Finished documents are
+    held in spooled temporary files (in memory up to `spool_bytes`, then an anonymous
+    temp file that disappears when closed) and evicted after `ttl` seconds, beyond
+    `max_jobs` jobs or beyond `max_bytes` of stored documents, oldest first.
+    At most `max_queue` jobs may wait or run at once.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64, max_jobs: int = 256, ttl: Optional[float] = 600.0,
+                 max_bytes: Optional[int] = 128 * 1024 * 1024, spool_bytes: int = 1024 * 1024,
+                 render: Callable[[str, str, pd.DataFrame], bytes] = render_pdf_report):
+        self.jobs = TTLCache(max_entries=max_jobs, ttl=ttl, max_bytes=max_bytes,
+                             sizeof=lambda job: job.size, on_evict=lambda key, job: job.close())
+        self.max_queue = max_queue
+        self.spool_bytes = spool_bytes
+        self._render = render
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report')
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0,
+            'queued': 0, 'running': 0, 'render_seconds': 0.0, 'max_render_seconds': 0.0,
+        }
+
+    def submit(self, ticker: str, analysis: str, anomalies_df: pd.DataFrame) -> ReportJob:
+        """
+        Queues a report; raises QueueFullError when `max_queue` jobs are already pending.
+        """
+        with self._lock:
+            if self._stats['queued'] + self._stats['running'] >= self.max_queue:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"Report queue is full ({self.max_queue} pending jobs).")
+            self._stats['submitted'] += 1
+            self._stats['queued'] += 1
+            job = ReportJob(job_id=uuid.uuid4().hex, ticker=ticker)
+            self.jobs.set(job.job_id, job)
+        job.future = self._executor.submit(self._run, job, analysis, anomalies_df)
+        return job
+
+    def _run(self, job: ReportJob, analysis: str, anomalies_df: pd.DataFrame) -> ReportJob:
+        with self._lock:
+            self._stats['queued'] -= 1
+            self._stats['running'] += 1
+        job.status = 'running'
+        job.started_at = time.time()
+        start = time.perf_counter()
+        try:
+            pdf = self._render(job.ticker, analysis, anomalies_df)
+            spool = SpooledTemporaryFile(max_size=self.spool_bytes)
+            spool.write(pdf)
+            with job.lock:
+                job.result = spool
+                job.size = len(pdf)
+            job.status = 'done'
+        except Exception as e:
+            print(f"Report {job.job_id} for {job.ticker} failed: {e}")
+            job.status = 'failed'
+            job.error = str(e)
+        elapsed = time.perf_counter() - start
+        job.finished_at = time.time()
+
+        with self._lock:
+            self._stats['running'] -= 1
+            self._stats['completed' if job.status == 'done' else 'failed'] += 1
+            self._stats['render_seconds'] += elapsed
+            self._stats['max_render_seconds'] = max(self._stats['max_render_seconds'], elapsed)
+            # Re-store to account the document size (and start its TTL from completion)
+            if job.job_id in self.jobs:
+                self.jobs.set(job.job_id, job)
+            else:
+                job.close()
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self.jobs.get(job_id)
+
+    def purge(self) -> int:
+        """
+        Evicts expired jobs now rather than on their next access.
+        """
+        return self.jobs.purge_expired()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats['completed'] + stats['failed']
+        stats['queue_depth'] = stats['queued']
+        stats['avg_render_seconds'] = stats['render_seconds'] / finished if finished else 0.0
+        stats['store'] = self.jobs.stats()
+        return stats
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.jobs.clear()
+
+
+_manager: Optional[ReportJobManager] = None
+
+
+def get_report_jobs() -> ReportJobManager:
+    """
+    Returns the process-wide report job manager, built from configuration on first use.
+    """
+    global _manager
+    if _manager is None:
+        from core import config
+        _manager = ReportJobManager(
+            max_workers=config.REPORT_WORKERS,
+            max_queue=config.REPORT_MAX_QUEUE,
+            max_jobs=config.REPORT_MAX_JOBS,
+            ttl=config.REPORT_TTL,
+            max_bytes=int(config.REPORT_MAX_MB * 1024 * 1024),
+            spool_bytes=int(config.REPORT_SPOOL_KB * 1024),
+        )
+    return _manager
+
+
+def set_report_jobs(manager: Optional[ReportJobManager]) -> None:
+    """
+    Replaces the process-wide report job manager (None rebuilds it from configuration).
+    """
+    global _manager
+    _manager = manager
@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent async calls: while a call for a key is in flight,
+    later callers with the same key await its result (or exception) instead of
+    starting their own. Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of func() for this key, sharing an in-flight call if there is one.
+        """
+        # Futures belong to one event loop
+        flight_key = (asyncio.get_running_loop(), key)
+        self.calls += 1
+        future = self._inflight.get(flight_key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            future = asyncio.ensure_future(func())
+            self._inflight[flight_key] = future
+            future.add_done_callback(lambda f: self._finish(flight_key, f))
+        # A cancelled caller must not cancel the call others are waiting on
+        return await asyncio.shield(future)
+
+    def _finish(self, flight_key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(flight_key) is future:
+            del self._inflight[flight_key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            future.exception()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': self.in_flight(),
+        }
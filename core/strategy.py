@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
 from typing import Tuple
 
+# Category order for the vectorized signal columns
+SENTIMENT_LABELS = ["BEARISH", "NEUTRAL", "BULLISH"]
+ACTION_LABELS = ["SELL", "HOLD", "BUY"]
+
 def evaluate_market_condition(row: pd.Series) -> Tuple[str, str]:
     """
     Evaluates market condition for a single row of data.
@@ -47,3 +52,41 @@ def evaluate_market_condition(row: pd.Series) -> Tuple[str, str]:
         action = "HOLD"
 
     return sentiment, action
+
+
+def _column(df: pd.DataFrame, name: str, default) -> np.ndarray:
+    if name in df.columns:
+        return df[name].to_numpy(dtype=np.float64)
+    return np.broadcast_to(np.asarray(default, dtype=np.float64), (len(df),))
+
+
+def compute_signals(df: pd.DataFrame) -> Tuple[pd.Categorical, pd.Categorical]:
+    """
+    Column-wise version of evaluate_market_condition over a whole DataFrame.
+    Applies the same sentiment score and RSI action rules to NumPy arrays in one pass.
+
+    Returns:
+        (sentiment, action) as pandas Categoricals aligned with df rows.
+    """
+    rsi = _column(df, 'rsi', 50.0)
+    macd = _column(df, 'macd', 0.0)
+    price = _column(df, 'close', 0.0)
+    ma_50 = _column(df, 'ma_50', price)
+
+    # 1. Sentiment score (comparisons against NaN are False, as in the row-wise rules)
+    score = np.where(price > ma_50, 1.0, -1.0)
+    score += np.where(macd > 0, 1.0, -1.0)
+    score += np.where(rsi > 50, 0.5, np.where(rsi < 50, -0.5, 0.0))
+
+    sentiment_codes = np.ones(len(df), dtype=np.int8)
+    sentiment_codes[score > 1] = 2
+    sentiment_codes[score < -1] = 0
+
+    # 2. Classic RSI action
+    action_codes = np.ones(len(df), dtype=np.int8)
+    action_codes[rsi < 30] = 2
+    action_codes[rsi > 70] = 0
+
+    sentiment = pd.Categorical.from_codes(sentiment_codes, categories=SENTIMENT_LABELS)
+    action = pd.Categorical.from_codes(action_codes, categories=ACTION_LABELS)
+    return sentiment, action
@@ -0,0 +1,127 @@
+import zlib
+import numpy as np
+import pandas as pd
+from core.data_loader import DataProvider, REQUIRED_COLUMNS
+from core.intervals import DAILY, INTERVALS, get_interval
+from core.utils import TRADING_DAY, trades_around_the_clock
+
+# Synthetic histories for a ticker always start here, so any date range is reproducible
+SYNTHETIC_ANCHOR_DATE = "1990-01-01"
+
+
+def generate_ohlcv(n_rows: int, seed: int = 42, start: str = "2000-01-03", freq: str = "B",
+                   s0: float = 100.0, mu: float = 0.08, sigma: float = 0.25,
+                   shock_prob: float = 0.0, shock_scale: float = 0.08,
+                   burst_prob: float = 0.0, burst_scale: float = 4.0, periods_per_year: float = 252) -> pd.DataFrame:
+    """
+    Generates a seeded synthetic OHLCV history following geometric Brownian motion.
+
+    Each component draws from its own random stream, so the first k rows of a
+    longer history are identical to a history of k rows with the same seed.
+
+    Args:
+        n_rows: Number of bars.
+        seed: Random seed.
+        start: Timestamp of the first bar.
+        freq: Pandas frequency of the bars ('B' for business days, 'h', 'min', ...).
+        s0: Initial price.
+        mu: Annualized drift.
+        sigma: Annualized volatility.
+        shock_prob: Per-bar probability of a price shock (a jump in the log return).
+        shock_scale: Standard deviation of a shock's log return.
+        burst_prob: Per-bar probability of a volume burst.
+        burst_scale: Mean extra volume of a burst, as a multiple of the normal volume.
+        periods_per_year: Bars per year, scaling drift and volatility to the bar length.
+
+    Returns:
+        DataFrame with columns date, open, high, low, close, volume.
+    """
+    dt = 1 / periods_per_year
+    ret_rng, high_rng, low_rng, vol_rng = (np.random.default_rng([seed, k]) for k in range(4))
+
+    log_ret = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * ret_rng.standard_normal(n_rows)
+    if shock_prob > 0:
+        shock_hit_rng, shock_size_rng = (np.random.default_rng([seed, k]) for k in (4, 5))
+        shocks = shock_hit_rng.random(n_rows) < shock_prob
+        log_ret = log_ret + np.where(shocks, shock_size_rng.standard_normal(n_rows) * shock_scale, 0.0)
+    close = s0 * np.exp(np.cumsum(log_ret))
+    open_ = np.empty(n_rows)
+    open_[0] = s0
+    open_[1:] = close[:-1]
+
+    # Intrabar range scales with the bar's volatility
+    wick_scale = sigma * np.sqrt(dt) * 0.5
+    high = np.maximum(open_, close) * (1 + np.abs(high_rng.standard_normal(n_rows)) * wick_scale)
+    low = np.minimum(open_, close) * (1 - np.abs(low_rng.standard_normal(n_rows)) * wick_scale)
+
+    volume = vol_rng.lognormal(mean=14.0, sigma=0.3, size=n_rows)
+    if burst_prob > 0:
+        burst_hit_rng, burst_size_rng = (np.random.default_rng([seed, k]) for k in (6, 7))
+        bursts = burst_hit_rng.random(n_rows) < burst_prob
+        volume = volume * np.where(bursts, 1 + burst_size_rng.exponential(burst_scale, n_rows), 1.0)
+    volume = volume.astype(np.int64)
+
+    return pd.DataFrame({
+        'date': pd.date_range(start=start, periods=n_rows, freq=freq),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+    })
+
+
+class SyntheticProvider(DataProvider):
+    """
+    Offline provider serving deterministic per-ticker business-day histories.
+
+    Intraday bars are generated one day at a time from a seed of (ticker, day, interval),
+    starting at the previous daily close, so any range returns the same bars. Crypto
+    tickers ('-USD') trade around the clock; others 09:30-16:00 on trading days.
+    """
+    intervals = tuple(INTERVALS)
+
+    def fetch(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        if interval != DAILY:
+            return self._fetch_intraday(ticker, start_date, end_date, interval)
+        end = pd.Timestamp(end_date)
+        anchor = pd.Timestamp(SYNTHETIC_ANCHOR_DATE)
+        if end <= anchor:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+
+        n_rows = len(pd.bdate_range(anchor, end - pd.Timedelta(days=1)))
+        seed = zlib.crc32(ticker.upper().encode())
+        df = generate_ohlcv(n_rows, seed=seed, start=SYNTHETIC_ANCHOR_DATE, freq="B")
+        mask = (df['date'] >= pd.Timestamp(start_date)) & (df['date'] < end)
+        return df.loc[mask].reset_index(drop=True)
+
+    def _fetch_intraday(self, ticker: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        spec = get_interval(interval)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        daily = self.fetch(ticker, SYNTHETIC_ANCHOR_DATE, end_date)
+        if daily.empty or start >= end:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+
+        around_the_clock = trades_around_the_clock(ticker)
+        if around_the_clock:
+            days, open_time, minutes = pd.date_range(start.normalize(), end, freq='D', inclusive='left'), '00:00', 1440
+        else:
+            days, open_time, minutes = pd.date_range(start.normalize(), end, freq=TRADING_DAY, inclusive='left'), '09:30', 390
+        n_bars = minutes // spec.minutes
+        periods_per_year = (365 if around_the_clock else 252) * n_bars
+        closes = daily['close'].to_numpy()
+        daily_dates = daily['date'].to_numpy()
+
+        frames = []
+        for day in days:
+            prev = int(np.searchsorted(daily_dates, day.to_datetime64(), side='left')) - 1
+            frames.append(generate_ohlcv(
+                n_bars, seed=zlib.crc32(f"{ticker.upper()}|{day:%Y-%m-%d}|{interval}".encode()),
+                start=f"{day:%Y-%m-%d} {open_time}", freq=f"{spec.minutes}min",
+                s0=closes[max(prev, 0)], periods_per_year=periods_per_year,
+            ))
+        if not frames:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS)
+        df = pd.concat(frames, ignore_index=True)
+        df['volume'] = df['volume'] // n_bars
+        return df.loc[df['date'] >= start].reset_index(drop=True)
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe LRU mapping with per-entry time-to-live and an optional size budget.
+
+    Entries are evicted least-recently-used first when `max_entries` or `max_bytes`
+    (measured with `sizeof`) is exceeded, and dropped on access once their TTL has passed.
+    `on_evict(key, value)` is called for every entry that leaves the cache other than by `pop`.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, sizeof: Optional[Callable[[Any], int]] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._on_evict = on_evict
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and self._clock() >= expires_at
+
+    def _remove(self, key: Hashable, notify: bool = True) -> Any:
+        value, _, size = self._data.pop(key)
+        self.bytes -= size
+        if notify and self._on_evict is not None:
+            self._on_evict(key, value)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._expired(entry[1]):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value. `ttl` overrides the cache default for this entry (seconds).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key, notify=False)
+            self._data[key] = (value, expires_at, size)
+            self.bytes += size
+            self._evict_overflow()
+
+    def _evict_overflow(self) -> None:
+        while self._data and (len(self._data) > self.max_entries or
+                              (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key, notify=False)
+
+    def purge_expired(self) -> int:
+        """
+        Drops every expired entry; returns how many were removed.
+        """
+        with self._lock:
+            expired = [k for k, (_, expires_at, _) in self._data.items() if self._expired(expires_at)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._data):
+                self._remove(key)
+
+    def keys(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[1])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
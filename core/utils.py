@@ -1,4 +1,10 @@
 from datetime import datetime, timedelta
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr, USMemorialDay,
+    USPresidentsDay, USThanksgivingDay, nearest_workday,
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
 
 def get_lookback_date(date_str: str, days: int = 365) -> str:
     """
@@ -10,3 +16,47 @@ def get_lookback_date(date_str: str, days: int = 365) -> str:
     dt = datetime.strptime(date_str, "%Y-%m-%d")
     lookback_dt = dt - timedelta(days=days)
     return lookback_dt.strftime("%Y-%m-%d")
+
+
+class TradingCalendar(AbstractHolidayCalendar):
+    """
+    Full-day closures of the US exchanges (NYSE/Nasdaq holiday rules).
+    """
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=nearest_workday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+TRADING_DAY = CustomBusinessDay(calendar=TradingCalendar())
+
+
+def trades_around_the_clock(ticker: str) -> bool:
+    """
+    True for markets open every day (crypto pairs quoted in USD, e.g. 'BTC-USD').
+    """
+    return ticker.upper().endswith('-USD')
+
+
+def get_trading_lookback_date(date_str: str, bars: int) -> str:
+    """
+    Returns the date `bars` trading sessions before `date_str` (weekends and exchange
+    holidays skipped). Markets trading every day (crypto) get a few extra bars.
+    Args:
+        date_str: 'YYYY-MM-DD'
+        bars: number of sessions to look back
+    """
+    dt = datetime.strptime(date_str, "%Y-%m-%d")
+    if bars <= 0:
+        return date_str
+    # Rolling forward first makes a non-trading start date count as its next session
+    lookback_dt = TRADING_DAY.rollforward(dt) - bars * TRADING_DAY
+    return lookback_dt.strftime("%Y-%m-%d")
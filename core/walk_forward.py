@@ -0,0 +1,104 @@
+"""
+Walk-forward anomaly scoring: no model ever sees bars after the ones it scores.
+
+The history is cut into blocks of `refit_every` bars. Each block is scored by an
+Isolation Forest fitted on the `window` bars before it (fewer at the start of the
+history). The first `min_train` bars have nothing before them: they are scored in-sample
+by a model fitted on themselves (burn-in).
+
+Blocks are independent, so they are spread over the shared process pool. The feature
+matrix is placed once in shared memory and mapped read-only by the workers instead of
+being pickled for every task.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from core.anomaly import FEATURE_COLUMNS, build_model
+
+MODES = ('full', 'walk_forward')
+
+# (train_lo, train_hi, lo, hi): fit on rows [train_lo, train_hi), score rows [lo, hi)
+Block = Tuple[int, int, int, int]
+
+
+def walk_forward_blocks(n_rows: int, window: int, refit_every: int, min_train: int = 50) -> List[Block]:
+    if n_rows <= min_train:
+        return [(0, n_rows, 0, n_rows)]
+    blocks = [(0, min_train, 0, min_train)]
+    for lo in range(min_train, n_rows, refit_every):
+        blocks.append((max(0, lo - window), lo, lo, min(lo + refit_every, n_rows)))
+    return blocks
+
+
+def score_blocks(X: np.ndarray, blocks: Sequence[Block],
+                 contamination: float) -> List[Tuple[int, int, np.ndarray, np.ndarray]]:
+    """
+    Fits one model per block and returns (lo, hi, raw scores, decision scores) for each.
+    """
+    results = []
+    for train_lo, train_hi, lo, hi in blocks:
+        model = build_model(contamination).fit(X[train_lo:train_hi])
+        raw = model.score_samples(X[lo:hi])
+        # decision_function without scoring the rows twice
+        results.append((lo, hi, raw, raw - model.offset_))
+    return results
+
+
+def _chunks(blocks: List[Block], n_chunks: int) -> List[List[Block]]:
+    size = max(1, -(-len(blocks) // n_chunks))
+    return [blocks[i:i + size] for i in range(0, len(blocks), size)]
+
+
+def detect_anomalies_walk_forward(df: pd.DataFrame, contamination: float = 0.05, window: Optional[int] = None,
+                                  refit_every: Optional[int] = None, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Walk-forward counterpart of detect_anomalies.
+
+    Args:
+        df: DataFrame with features.
+        window: Trailing training bars per model. Defaults to config.WALK_FORWARD_WINDOW.
+        refit_every: Bars scored by each model. Defaults to config.WALK_FORWARD_REFIT_EVERY.
+        max_workers: Pool size; defaults to config.BATCH_MAX_WORKERS (1 runs in-process).
+
+    Returns:
+        DataFrame with 'anomaly' (-1 for anomaly, 1 for normal), 'anomaly_score' and
+        'anomaly_raw' columns. Raw scores come from each block's own model, so they are
+        only thresholded per block (one contamination level per request).
+    """
+    from core import config
+    window = window or config.WALK_FORWARD_WINDOW
+    refit_every = refit_every or config.WALK_FORWARD_REFIT_EVERY
+    max_workers = max_workers if max_workers is not None else config.BATCH_MAX_WORKERS
+
+    features_to_use = [c for c in FEATURE_COLUMNS if c in df.columns]
+    if not features_to_use:
+        print("No features available for anomaly detection.")
+        return df
+    if len(df) < 50:
+        print("Not enough data points for reliable anomaly detection.")
+        df['anomaly'] = 1
+        df['anomaly_score'] = 0.0
+        df['anomaly_raw'] = 0.0
+        return df
+
+    X = np.ascontiguousarray(df[features_to_use].to_numpy(dtype=np.float64))
+    blocks = walk_forward_blocks(len(X), window, refit_every)
+    scores, raw = np.empty(len(X)), np.empty(len(X))
+
+    if max_workers <= 1 or len(blocks) <= 2:
+        results = score_blocks(X, blocks, contamination)
+    else:
+        from core.pipeline import map_shared
+        # A few chunks per worker keeps the pool busy without one task per block
+        parts = map_shared(X, score_blocks, [(chunk, contamination) for chunk in _chunks(blocks, max_workers * 2)],
+                           max_workers)
+        results = [r for part in parts for r in part]
+
+    for lo, hi, block_raw, block_scores in results:
+        raw[lo:hi] = block_raw
+        scores[lo:hi] = block_scores
+    print(f"Walk-forward: {len(blocks)} models ({window}-bar window, refit every {refit_every}) on {len(X)} rows.")
+    df['anomaly'] = np.where(scores < 0, -1, 1)
+    df['anomaly_score'] = scores
+    df['anomaly_raw'] = raw
+    return df
@@ -0,0 +1,73 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from api.main import app
+from api.response_cache import ResponseCache, set_response_cache
+from core.analysis_store import AnalysisStore, get_analysis_store, set_analysis_store
+from core.data_loader import set_provider
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+BASE = {"ticker": "BTC-USD", "start_date": "2023-01-01", "end_date": "2023-06-30", "contamination": 0.1, "language": "en"}
+
+
+def _analyze(**options):
+    set_provider(SyntheticProvider())
+    try:
+        res = client.post("/api/analyze", json={**BASE, **options})
+    finally:
+        set_provider(None)
+    assert res.status_code == 200
+    return res
+
+
+def test_report_by_handle():
+    set_analysis_store(AnalysisStore())
+    try:
+        result = _analyze().json()
+        handle = result['handle']
+        assert handle and _analyze(format="columnar").json()['handle'] == handle
+
+        # The stored anomalies are the ones the client received
+        stored = get_analysis_store().get(handle)
+        data = pd.DataFrame(result['data'])
+        expected = data[data['anomaly'] == -1]
+        assert list(stored.anomalies['date']) == list(expected['date'])
+        assert stored.llm_analysis == result['llm_analysis']
+
+        report = client.post("/api/report", json={"handle": handle})
+        assert report.status_code == 200 and report.content.startswith(b"%PDF")
+        job = client.post("/api/report/jobs", json={"handle": handle})
+        assert job.status_code == 202 and job.json()['ticker'] == "BTC-USD"
+    finally:
+        set_analysis_store(None)
+
+
+def test_unknown_handle_and_missing_payload():
+    assert client.post("/api/report", json={"handle": "deadbeef"}).status_code == 404
+    assert client.post("/api/report/jobs", json={"ticker": "AAPL"}).status_code == 422
+
+
+def test_cached_response_requires_live_handle():
+    store = AnalysisStore()
+    set_analysis_store(store)
+    set_response_cache(ResponseCache())
+    try:
+        first = _analyze()
+        assert _analyze().headers['x-cache'] == "HIT"
+
+        # Once the handle is gone the cached body would point at nothing: recompute
+        store.cache.clear()
+        again = _analyze()
+        assert again.headers['x-cache'] == "MISS"
+        assert again.json()['handle'] == first.json()['handle'] in store
+    finally:
+        set_response_cache(None)
+        set_analysis_store(None)
+
+
+if __name__ == "__main__":
+    test_report_by_handle()
+    test_unknown_handle_and_missing_payload()
+    test_cached_response_requires_live_handle()
+    print("[SUCCESS] Analysis handle tests passed.")
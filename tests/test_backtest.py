@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from api.main import app
+from core.backtest import METRICS, backtest, evaluate, parameter_grid, positions_from_actions, signal_arrays, sweep
+from core.data_loader import set_provider
+from core.features import add_technical_indicators
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+client = TestClient(app)
+
+
+def _reference(df, params, fee):
+    # Bar-by-bar loop: the RSI action rule with the thresholds swapped in
+    position, equity, peak, drawdown, trades = 0.0, 1.0, 1.0, 0.0, 0
+    closes, rsis = df['close'].to_numpy(), df['rsi'].to_numpy()
+    for i, rsi in enumerate(rsis):
+        if i > 0:
+            equity *= 1 + position * (closes[i] / closes[i - 1] - 1)
+        action = 'BUY' if rsi < params['rsi_buy'] else 'SELL' if rsi > params['rsi_sell'] else 'HOLD'
+        target = {'BUY': 1.0, 'SELL': 0.0}.get(action, position)
+        if target != position:
+            equity *= 1 - fee * abs(target - position)
+            trades += 1
+            position = target
+        peak = max(peak, equity)
+        drawdown = max(drawdown, 1 - equity / peak)
+    return equity - 1, drawdown, trades
+
+
+def test_vectorized_matches_reference_loop():
+    df = add_technical_indicators(generate_ohlcv(900, seed=12))
+    params = parameter_grid({'rsi_buy': [25.0, 30.0, 40.0], 'rsi_sell': [60.0, 70.0]})
+    metrics = evaluate(signal_arrays(df), params, fee=0.001)
+    for i in range(len(params['rsi_buy'])):
+        total, drawdown, trades = _reference(df, {k: v[i] for k, v in params.items()}, 0.001)
+        # Fees are charged additively in the vectorized version: equal to first order
+        assert np.isclose(metrics['total_return'][i], total, rtol=1e-3, atol=1e-3)
+        assert np.isclose(metrics['max_drawdown'][i], drawdown, atol=1e-3)
+        assert metrics['trades'][i] == trades
+
+
+def test_default_parameters_reproduce_the_action_column():
+    df = add_technical_indicators(generate_ohlcv(1200, seed=5))
+    positions = positions_from_actions(df['action'])
+    assert set(np.unique(positions)) <= {0.0, 1.0}
+
+    metrics, curve = backtest(df)
+    from_params, _ = backtest(df, params={})
+    grid = evaluate(signal_arrays(df), parameter_grid({}))
+    for name in METRICS:
+        assert np.isclose(metrics[name], from_params[name]) and np.isclose(metrics[name], grid[name][0]), name
+    assert np.isclose(curve['equity'].iloc[-1] - 1, metrics['total_return'])
+    assert (curve['position'].to_numpy() == positions).all()
+
+    # Sentiment signal, long only vs long/short
+    long_only, _ = backtest(df, params={}, signal='sentiment')
+    long_short, curve = backtest(df, params={}, signal='sentiment', allow_short=True)
+    assert long_only['exposure'] < long_short['exposure'] and (curve['position'] == -1).any()
+
+
+def test_sweep_pool_matches_in_process():
+    frames = {f"T{i}": add_technical_indicators(generate_ohlcv(700, seed=i)) for i in range(3)}
+    grid = {'rsi_buy': list(np.arange(20.0, 45.0, 1.0)), 'rsi_sell': list(np.arange(55.0, 85.0, 1.0))}
+    serial = sweep(frames, grid, max_workers=1)
+    pooled = sweep(frames, grid, max_workers=2)
+    assert len(serial) == 3 * 25 * 30
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_backtest_api():
+    set_provider(SyntheticProvider())
+    try:
+        body = {"start_date": "2022-01-03", "end_date": "2023-12-29"}
+        res = client.post("/api/backtest", json=dict(body, ticker="BT"))
+        assert res.status_code == 200
+        data = res.json()['data']
+        assert data['date'][0] >= body['start_date'] and len(data['equity']) == len(data['date'])
+        assert set(res.json()['metrics']) == set(METRICS)
+        assert client.post("/api/backtest", json=dict(body, ticker="BT", params={"rsi_low": 20})).status_code == 422
+
+        grid = {"rsi_buy": [20, 25, 30, 35], "rsi_sell": [65, 70, 75]}
+        res = client.post("/api/backtest/sweep", json=dict(body, tickers=["BT", "BT2"], grid=grid, top=5))
+        assert res.status_code == 200
+        sweep_result = res.json()
+        assert sweep_result['param_sets'] == 12 and sweep_result['tickers'] == ["BT", "BT2"]
+        sharpes = [r['metrics']['sharpe'] for r in sweep_result['results']]
+        assert len(sharpes) == 5 and sharpes == sorted(sharpes, reverse=True)
+
+        too_big = {"rsi_buy": list(range(1000)), "rsi_sell": list(range(1000))}
+        assert client.post("/api/backtest/sweep", json=dict(body, tickers=["BT"], grid=too_big)).status_code == 422
+    finally:
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_vectorized_matches_reference_loop()
+    test_default_parameters_reproduce_the_action_column()
+    test_sweep_pool_matches_in_process()
+    test_backtest_api()
+    print("[SUCCESS] Backtest tests passed.")
@@ -0,0 +1,115 @@
+from fastapi.testclient import TestClient
+from api.main import app
+from core import config
+from core.data_loader import DataProvider, set_provider
+import os
+from concurrent.futures.process import BrokenProcessPool
+from core.pipeline import analyze_frames, get_executor, map_frames
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+client = TestClient(app)
+
+
+class GroupedFakeProvider(DataProvider):
+    """Local fake provider that serves synthetic bars and counts grouped calls."""
+
+    def __init__(self, missing=()):
+        self.inner = SyntheticProvider()
+        self.missing = set(missing)
+        self.fetch_calls = 0
+        self.fetch_many_calls = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.fetch_calls += 1
+        return self.inner.fetch(ticker, start_date, end_date)
+
+    def fetch_many(self, tickers, start_date, end_date):
+        self.fetch_many_calls.append(list(tickers))
+        return {t: self.inner.fetch(t, start_date, end_date) for t in tickers if t not in self.missing}
+
+
+def _post_batch(provider, tickers, workers):
+    previous = config.BATCH_MAX_WORKERS
+    config.BATCH_MAX_WORKERS = workers
+    set_provider(provider)
+    try:
+        return client.post("/api/analyze/batch", json={
+            "tickers": tickers,
+            "start_date": "2023-01-01",
+            "end_date": "2023-06-30",
+            "contamination": 0.05,
+            "language": "en",
+        })
+    finally:
+        set_provider(None)
+        config.BATCH_MAX_WORKERS = previous
+
+
+def test_batch_uses_one_grouped_fetch():
+    provider = GroupedFakeProvider(missing={"NOPE"})
+    res = _post_batch(provider, ["AAPL", "MSFT", "NOPE", "AAPL"], workers=2)
+    assert res.status_code == 200
+
+    assert provider.fetch_many_calls == [["AAPL", "MSFT", "NOPE"]]
+    assert provider.fetch_calls == 0
+
+    results = {item['ticker']: item for item in res.json()['results']}
+    assert list(results) == ["AAPL", "MSFT", "NOPE"]
+    assert results["NOPE"]['status_code'] == 404 and results["NOPE"]['result'] is None
+    for ticker in ("AAPL", "MSFT"):
+        assert results[ticker]['status_code'] == 200
+        assert results[ticker]['result']['ticker'] == ticker
+        assert len(results[ticker]['result']['data']) > 100
+
+
+def test_batch_matches_single_analysis():
+    set_provider(SyntheticProvider())
+    try:
+        single = client.post("/api/analyze", json={
+            "ticker": "MSFT", "start_date": "2023-01-01", "end_date": "2023-06-30",
+            "contamination": 0.05, "language": "en",
+        }).json()
+    finally:
+        set_provider(None)
+    batch = _post_batch(GroupedFakeProvider(), ["MSFT"], workers=1).json()
+    assert batch['results'][0]['result'] == single
+
+
+def test_pool_reports_per_ticker_errors():
+    frames = {"LONG": generate_ohlcv(600, seed=1), "SHORT": generate_ohlcv(120, seed=2)}
+    results = analyze_frames(frames, contamination=0.05, max_workers=2)
+    assert 'anomaly' in results["LONG"].columns
+    assert isinstance(results["SHORT"], ValueError)
+
+
+def test_pool_recovers_after_a_worker_dies():
+    frames = {"LONG": generate_ohlcv(600, seed=1), "ALSO": generate_ohlcv(600, seed=2)}
+    # Workers that exit abruptly break the pool, also on the retry
+    crashed = map_frames(os._exit, {"A": 3, "B": 3}, max_workers=2)
+    assert all(isinstance(error, BrokenProcessPool) for error in crashed.values())
+    results = analyze_frames(frames, contamination=0.05, max_workers=2)
+    assert all('anomaly' in df.columns for df in results.values())
+
+    # A worker dying while a batch runs: the lost tasks are run again on a new pool
+    get_executor(2).submit(os._exit, 3)
+    results = analyze_frames(frames, contamination=0.05, max_workers=2)
+    assert all('anomaly' in df.columns for df in results.values())
+
+
+def test_batch_limits():
+    previous = config.BATCH_MAX_TICKERS
+    config.BATCH_MAX_TICKERS = 2
+    try:
+        res = _post_batch(GroupedFakeProvider(), ["A", "B", "C"], workers=1)
+        assert res.status_code == 422
+    finally:
+        config.BATCH_MAX_TICKERS = previous
+
+
+if __name__ == "__main__":
+    test_batch_uses_one_grouped_fetch()
+    test_batch_matches_single_analysis()
+    test_pool_reports_per_ticker_errors()
+    test_pool_recovers_after_a_worker_dies()
+    test_batch_limits()
+    print("[SUCCESS] Batch analysis tests passed.")
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import numpy as np
+from benchmarks import suite
+from core.synthetic import generate_ohlcv
+
+
+def test_generator_bursts_and_shocks():
+    plain = generate_ohlcv(2_000, seed=3)
+    noisy = generate_ohlcv(2_000, seed=3, shock_prob=0.01, shock_scale=0.1, burst_prob=0.02, burst_scale=6.0)
+
+    # Same base path; shocks add a few large returns and bursts a few large volumes
+    plain_ret = np.diff(np.log(plain['close'].to_numpy()))
+    noisy_ret = np.diff(np.log(noisy['close'].to_numpy()))
+    assert np.abs(noisy_ret).max() > 3 * np.abs(plain_ret).max()
+    assert (noisy['volume'] > plain['volume'] * 2).sum() > 10
+    assert (noisy['volume'] >= plain['volume']).all()
+    assert (noisy['high'] >= noisy[['open', 'close']].max(axis=1)).all()
+    assert (noisy['low'] <= noisy[['open', 'close']].min(axis=1)).all()
+
+    # Prefix-consistent like the plain generator
+    short = generate_ohlcv(500, seed=3, shock_prob=0.01, shock_scale=0.1, burst_prob=0.02, burst_scale=6.0)
+    assert short.equals(noisy.head(500))
+
+
+def test_run_and_compare():
+    document = suite.run_suite([1_000], stages=['features', 'signals', 'llm'], repeat=1, verbose=False)
+    assert [(r['stage'], r['rows']) for r in document['results']] == [('features', 1000), ('signals', 1000), ('llm', 1000)]
+    assert all(r['min_s'] > 0 for r in document['results'])
+    assert 'python' in document['meta']
+
+    slower = json.loads(json.dumps(document))
+    slower['results'][0]['median_s'] = document['results'][0]['median_s'] * 2 + 0.01
+    rows = suite.compare(document, slower, threshold=0.25)
+    assert [r['regression'] for r in rows] == [True, False, False]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline, current = os.path.join(tmp, 'baseline.json'), os.path.join(tmp, 'current.json')
+        for path, doc in ((baseline, document), (current, slower)):
+            with open(path, 'w') as f:
+                json.dump(doc, f)
+        assert suite.main(['compare', baseline, '--current', baseline]) == 0
+        assert suite.main(['compare', baseline, '--current', current]) == 1
+
+        # A fresh run only repeats the pairs the baseline has
+        partial = dict(document, results=[document['results'][0], dict(document['results'][2], rows=2_000)])
+        with open(baseline, 'w') as f:
+            json.dump(partial, f)
+        rerun = os.path.join(tmp, 'rerun.json')
+        suite.main(['compare', baseline, '--repeat', '1', '--threshold', '100', '--output', rerun])
+        with open(rerun) as f:
+            assert [(r['stage'], r['rows']) for r in json.load(f)['results']] == [('features', 1000), ('llm', 2000)]
+
+
+if __name__ == "__main__":
+    test_generator_bursts_and_shocks()
+    test_run_and_compare()
+    print("[SUCCESS] Benchmark suite tests passed.")
@@ -0,0 +1,158 @@
+import tempfile
+from datetime import date
+import pandas as pd
+from core.cache import OHLCVCache, merge_ranges, missing_ranges
+from core.data_loader import DataProvider, fetch_data
+from core.synthetic import SyntheticProvider
+
+
+class CountingProvider(DataProvider):
+    """Local fake upstream that records every range it is asked for."""
+
+    def __init__(self):
+        self.inner = SyntheticProvider()
+        self.calls = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls.append((ticker, start_date, end_date))
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def _ts(s):
+    return pd.Timestamp(s)
+
+
+def test_range_arithmetic():
+    held = merge_ranges([(_ts("2023-03-01"), _ts("2023-04-01")), (_ts("2023-01-01"), _ts("2023-02-01")),
+                         (_ts("2023-01-15"), _ts("2023-03-01"))])
+    assert held == [(_ts("2023-01-01"), _ts("2023-04-01"))]
+
+    gaps = missing_ranges(_ts("2022-12-01"), _ts("2023-05-01"), held)
+    assert gaps == [(_ts("2022-12-01"), _ts("2023-01-01")), (_ts("2023-04-01"), _ts("2023-05-01"))]
+    assert missing_ranges(_ts("2023-02-01"), _ts("2023-03-01"), held) == []
+
+
+def test_incremental_gap_filling():
+    upstream = CountingProvider()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OHLCVCache(upstream, cache_dir, today=lambda: date(2024, 6, 1))
+
+        first = cache.fetch("AAPL", "2023-01-01", "2023-06-01")
+        assert len(upstream.calls) == 1
+        assert cache.stats()['misses'] == 1
+
+        # Fully held range is served from disk
+        again = cache.fetch("AAPL", "2023-02-01", "2023-05-01")
+        assert len(upstream.calls) == 1
+        assert cache.stats()['hits'] == 1
+        expected = first[(first['date'] >= "2023-02-01") & (first['date'] < "2023-05-01")].reset_index(drop=True)
+        pd.testing.assert_frame_equal(again, expected, check_dtype=False)
+
+        # Extending both ends only fetches the two missing gaps
+        wider = cache.fetch("AAPL", "2022-10-01", "2023-08-01")
+        assert upstream.calls[1:] == [("AAPL", "2022-10-01", "2023-01-01"), ("AAPL", "2023-06-01", "2023-08-01")]
+        direct = SyntheticProvider().fetch("AAPL", "2022-10-01", "2023-08-01")
+        pd.testing.assert_frame_equal(wider, direct, check_dtype=False)
+        assert cache.stats()['bytes_fetched'] > 0
+
+        # A fresh cache instance reads the same files back
+        reopened = OHLCVCache(upstream, cache_dir, today=lambda: date(2024, 6, 1))
+        reopened.fetch("AAPL", "2022-11-01", "2023-07-01")
+        assert len(upstream.calls) == 3
+        assert reopened.stats()['hits'] == 1
+
+
+def test_current_session_is_refetched():
+    upstream = CountingProvider()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OHLCVCache(upstream, cache_dir, today=lambda: date(2024, 6, 3))
+        cache.fetch("MSFT", "2024-01-01", "2024-06-04")
+        cache.fetch("MSFT", "2024-01-01", "2024-06-04")
+        assert upstream.calls[1] == ("MSFT", "2024-06-03", "2024-06-04")
+
+
+class FlakyProvider(CountingProvider):
+    """Returns nothing for the first `failures` calls, like yfinance on a network error."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls.append((ticker, start_date, end_date))
+        if len(self.calls) <= self.failures:
+            return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def test_failed_download_is_not_recorded():
+    upstream = FlakyProvider(failures=1)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # No remembered empty answers: the retry goes upstream at once
+        cache = OHLCVCache(upstream, cache_dir, today=lambda: date(2024, 6, 1), empty_ttl=0)
+        assert cache.fetch("AAPL", "2023-01-01", "2023-02-01").empty
+        assert cache._load_ranges("AAPL") == []
+
+        # The next request asks upstream again and gets the data
+        df = cache.fetch("AAPL", "2023-01-01", "2023-02-01")
+        assert len(upstream.calls) == 2 and len(df) > 0
+        assert cache._load_ranges("AAPL") == [(_ts("2023-01-01"), _ts("2023-02-01"))]
+
+        # A gap without sessions (a weekend) is held even though nothing came back
+        upstream.failures = 3
+        assert cache.fetch("AAPL", "2023-02-04", "2023-02-06").empty
+        cache.fetch("AAPL", "2023-02-04", "2023-02-06")
+        assert len(upstream.calls) == 3
+
+
+class ListedProvider(CountingProvider):
+    """Serves bars from `listed` on only; other tickers are unknown."""
+
+    def __init__(self, listed):
+        super().__init__()
+        self.listed = listed
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls.append((ticker, start_date, end_date))
+        df = self.inner.fetch(ticker, start_date, end_date)
+        if ticker not in self.listed:
+            return df.iloc[:0]
+        return df[df['date'] >= self.listed[ticker]].reset_index(drop=True)
+
+
+def test_empty_answers_are_not_refetched():
+    upstream = ListedProvider({"IPO": "2023-03-01"})
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OHLCVCache(upstream, cache_dir, today=lambda: date(2024, 6, 1))
+        cache.fetch("IPO", "2023-01-01", "2023-06-01")
+
+        # The warm-up reaches before the listing: that gap is held once answered empty
+        for _ in range(2):
+            df = cache.fetch("IPO", "2022-06-01", "2023-06-01")
+        assert len(upstream.calls) == 2 and df['date'].min() >= pd.Timestamp("2023-03-01")
+        assert cache._load_ranges("IPO") == [(_ts("2022-06-01"), _ts("2023-06-01"))]
+
+        # Unknown tickers and ranges without anything known around them are remembered for a while
+        for _ in range(2):
+            assert cache.fetch("NOPE", "2023-01-01", "2023-06-01").empty
+            assert cache.fetch("BTC-USD", "2023-01-07", "2023-01-09").empty
+        assert len(upstream.calls) == 4 and cache.stats()['empty_ranges'] == 2
+        assert cache._load_ranges("NOPE") == [] and cache._load_ranges("BTC-USD") == []
+
+
+def test_fetch_data_with_cache_provider():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OHLCVCache(CountingProvider(), cache_dir)
+        df = fetch_data("BTC-USD", "2023-01-01", "2023-03-01", provider=cache)
+        assert df is not None and len(df) > 0
+        assert list(df.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+if __name__ == "__main__":
+    test_range_arithmetic()
+    test_incremental_gap_filling()
+    test_current_session_is_refetched()
+    test_failed_download_is_not_recorded()
+    test_empty_answers_are_not_refetched()
+    test_fetch_data_with_cache_provider()
+    print("[SUCCESS] Cache tests passed.")
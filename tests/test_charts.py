@@ -0,0 +1,59 @@
+import numpy as np
+from core.pipeline import analyze_frame
+from core.synthetic import generate_ohlcv
+from ui.charts import build_figures, downsample, lttb_indices
+
+
+def _analysis(n_rows):
+    df = analyze_frame(generate_ohlcv(n_rows + 220, seed=2, freq='h'), contamination=0.02).tail(n_rows)
+    return df.assign(date=df['date'].astype(str), action=df['action'].astype(str)).reset_index(drop=True)
+
+
+def test_lttb():
+    x = np.arange(10_000)
+    y = np.sin(x / 500.0)
+    y[4321] = 50.0  # a spike must survive
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500 and idx[0] == 0 and idx[-1] == 9_999
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+    # Short series are returned whole
+    assert np.array_equal(lttb_indices(x[:100], y[:100], 500), np.arange(100))
+
+
+def test_downsample_keeps_marked_rows():
+    data = _analysis(5_000)
+    keep = data['anomaly'] == -1
+    reduced = downsample(data, 'close', 300, keep=keep)
+    assert len(reduced) <= 300 + keep.sum()
+    assert set(data.index[keep]) <= set(reduced.index)
+    assert reduced.index.is_monotonic_increasing
+    assert len(downsample(data.head(200), 'close', 300)) == 200
+
+
+def test_figures_switch_to_webgl():
+    small = build_figures(_analysis(500), "RSI")
+    assert [type(t).__name__ for t in small['price'].data][0] == 'Candlestick'
+    assert type(small['macd'].data[0]).__name__ == 'Bar'
+
+    data = _analysis(20_000)
+    figures = build_figures(data, "RSI", max_points=1_000)
+    assert set(figures) == {'price', 'rsi', 'macd', 'adx'}
+    for fig in figures.values():
+        assert all(type(trace).__name__ == 'Scattergl' for trace in fig.data)
+        assert all(len(trace.x) <= 1_000 + (data['action'] != 'HOLD').sum() + (data['anomaly'] == -1).sum() for trace in fig.data)
+
+    # Every anomaly and signal is drawn; the RSI line passes through each signal row
+    names = {trace.name: trace for trace in figures['price'].data}
+    assert len(names['Anomaly'].x) == (data['anomaly'] == -1).sum()
+    rsi = {trace.name: trace for trace in figures['rsi'].data}
+    signals = data[data['action'].isin(['BUY', 'SELL'])]
+    assert len(rsi['Buy Signal'].x) == (data['action'] == 'BUY').sum()
+    assert set(signals['date']) <= set(rsi['RSI'].x)
+
+
+if __name__ == "__main__":
+    test_lttb()
+    test_downsample_keeps_marked_rows()
+    test_figures_switch_to_webgl()
+    print("[SUCCESS] Dashboard chart tests passed.")
@@ -0,0 +1,86 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from api.main import app
+from core.anomaly import FEATURE_COLUMNS, contamination_labels, detect_anomalies
+from core.data_loader import set_provider
+from core.detectors import METHODS
+from core.features import add_technical_indicators
+from core.model_registry import ModelRegistry
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+client = TestClient(app)
+LEVELS = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.1]
+
+
+def test_labels_match_a_fresh_fit_at_each_level():
+    df = add_technical_indicators(generate_ohlcv(900, seed=7))
+    for method in METHODS:
+        one_fit = detect_anomalies(df.copy(), contamination=0.05, method=method)
+        labels = contamination_labels(one_fit, LEVELS)
+        for level in LEVELS:
+            fresh = detect_anomalies(df.copy(), contamination=level, method=method)
+            assert (labels[level] == fresh['anomaly']).all(), (method, level)
+            assert np.array_equal(fresh['anomaly_raw'], one_fit['anomaly_raw']), (method, level)
+
+
+def test_registry_raw_scores_follow_the_reuse_policy():
+    X = add_technical_indicators(generate_ohlcv(800, seed=13))[FEATURE_COLUMNS]
+    registry = ModelRegistry(refit_every=5, drift_factor=1e9)
+    raw = registry.score_samples("AAPL", X.iloc[:500], 0.05)
+    labels, scores = registry.score("AAPL", X.iloc[:503], 0.05)
+    entry = next(iter(registry.cache._data.values()))[0]
+    assert registry.stats()['fits'] == 1 and registry.stats()['score_only'] == 1
+    np.testing.assert_array_equal(raw, entry.model.score_samples(X.iloc[:500]))
+    np.testing.assert_allclose(scores, entry.model.decision_function(X.iloc[:503]))
+    assert (labels == np.where(scores < 0, -1, 1)).all()
+
+
+def test_api_returns_thresholds_for_levels():
+    set_provider(SyntheticProvider())
+    try:
+        body = {"ticker": "LVL", "start_date": "2023-01-02", "end_date": "2023-12-29", "contamination": 0.05,
+                "method": "hbos", "levels": [0.02, 0.08]}
+        res = client.post("/api/analyze", json=body)
+        assert res.status_code == 200
+        result = res.json()
+        assert set(result['thresholds']) == {"0.02", "0.08"}
+
+        # Reclassified on the client side = what a request at that level returns
+        raw = np.array([point['anomaly_raw'] for point in result['data']])
+        local = np.where(raw < result['thresholds']["0.08"], -1, 1)
+        refit = client.post("/api/analyze", json=dict(body, contamination=0.08, levels=None)).json()
+        assert refit['thresholds'] is None
+        assert local.tolist() == [point['anomaly'] for point in refit['data']]
+
+        columnar = client.post("/api/analyze", json=dict(body, format="columnar")).json()
+        assert columnar['thresholds'] == result['thresholds']
+
+        assert client.post("/api/analyze", json=dict(body, levels=[0.0])).status_code == 422
+        assert client.post("/api/analyze", json=dict(body, method="isolation_forest", mode="walk_forward")).status_code == 422
+    finally:
+        set_provider(None)
+
+
+def test_rounded_responses_reclassify_like_a_fresh_fit():
+    # The dashboard asks for precision=6; labels from the rounded payload must still match
+    set_provider(SyntheticProvider())
+    try:
+        for ticker in ("PRC1", "PRC2", "PRC3"):
+            body = {"ticker": ticker, "start_date": "2023-01-02", "end_date": "2024-12-31", "contamination": 0.05,
+                    "precision": 6, "format": "columnar", "levels": LEVELS}
+            result = client.post("/api/analyze", json=body).json()
+            raw = np.array(result['data']['anomaly_raw'])
+            for level in LEVELS:
+                local = np.where(raw < result['thresholds'][f"{level:g}"], -1, 1)
+                fresh = client.post("/api/analyze", json=dict(body, contamination=level, levels=None)).json()
+                assert local.tolist() == fresh['data']['anomaly'], (ticker, level)
+    finally:
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_labels_match_a_fresh_fit_at_each_level()
+    test_registry_raw_scores_follow_the_reuse_policy()
+    test_api_returns_thresholds_for_levels()
+    test_rounded_responses_reclassify_like_a_fresh_fit()
+    print("[SUCCESS] Contamination level tests passed.")
@@ -0,0 +1,64 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from api.main import app
+from core.anomaly import FEATURE_COLUMNS, detect_anomalies
+from core.data_loader import set_provider
+from core.detectors import METHODS, HalfSpaceTrees, robust_z_scores
+from core.features import add_technical_indicators
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+client = TestClient(app)
+
+
+def _features(n_rows=1500, seed=7):
+    return add_technical_indicators(generate_ohlcv(n_rows, seed=seed, shock_prob=0.01, shock_scale=0.15))
+
+
+def test_detectors_share_the_contract():
+    df = _features()
+    shocks = df['log_returns'].abs() > 0.1
+    assert shocks.sum() >= 5
+    for method in METHODS:
+        out = detect_anomalies(df.copy(), contamination=0.05, method=method)
+        flagged = out['anomaly'] == -1
+        assert set(out['anomaly'].unique()) == {-1, 1}, method
+        assert abs(flagged.mean() - 0.05) < 0.01, method
+        # Negative scores are exactly the anomalies, as with IsolationForest.decision_function
+        assert ((out['anomaly_score'] < 0) == flagged).all(), method
+        # Injected price shocks are caught by every detector
+        assert (flagged & shocks).sum() == shocks.sum(), method
+
+
+def test_streaming_detectors_only_look_back():
+    X = _features(1300, seed=3)[FEATURE_COLUMNS]
+    # Rolling z-scores of a prefix do not change when rows are appended
+    assert np.allclose(robust_z_scores(X.iloc[:800]), robust_z_scores(X)[:800])
+
+    # Half-space trees scored in two calls (on window boundaries) equal one call
+    trees = HalfSpaceTrees(window_size=250)
+    split = np.concatenate([trees.score_stream(X.iloc[:500]), trees.score_stream(X.iloc[500:])])
+    assert np.allclose(split, HalfSpaceTrees(window_size=250).score_stream(X))
+
+
+def test_method_on_the_api():
+    set_provider(SyntheticProvider())
+    try:
+        body = {"ticker": "DET", "start_date": "2023-01-03", "end_date": "2023-09-29", "language": "en"}
+        res = client.post("/api/analyze", json=dict(body, method="hbos"))
+        assert res.status_code == 200
+        assert 0 < res.json()['anomalies_count'] < len(res.json()['data'])
+        assert client.post("/api/analyze", json=dict(body, method="lof")).status_code == 422
+        assert client.post("/api/analyze", json=dict(body, method="hbos", mode="walk_forward")).status_code == 422
+
+        batch = client.post("/api/analyze/batch", json={"tickers": ["DET", "DET2"], "start_date": body["start_date"],
+                                                        "end_date": body["end_date"], "method": "robust_z"})
+        assert [item['result'] is not None for item in batch.json()['results']] == [True, True]
+    finally:
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_detectors_share_the_contract()
+    test_streaming_detectors_only_look_back()
+    test_method_on_the_api()
+    print("[SUCCESS] Anomaly detector tests passed.")
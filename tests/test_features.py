@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.features import add_technical_indicators, INDICATOR_COLUMNS
+from core.synthetic import generate_ohlcv
+
+
+def _assert_engines_match(df):
+    reference = add_technical_indicators(df, engine='ta')
+    fused = add_technical_indicators(df, engine='numpy')
+
+    assert list(fused.columns) == list(reference.columns)
+    assert fused.index.equals(reference.index)
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(fused[col].to_numpy(float), reference[col].to_numpy(float),
+                                   rtol=1e-9, atol=1e-9, err_msg=col)
+    assert list(fused['sentiment']) == list(reference['sentiment'])
+    assert list(fused['action']) == list(reference['action'])
+
+
+def test_numpy_engine_matches_ta():
+    _assert_engines_match(generate_ohlcv(2500, seed=11))
+
+
+def test_numpy_engine_handles_unsorted_and_missing_rows():
+    df = generate_ohlcv(800, seed=5)
+    df.loc[[10, 300, 301], 'close'] = np.nan
+    df.loc[450, 'volume'] = np.nan
+    df = df.sample(frac=1.0, random_state=0)
+    _assert_engines_match(df)
+
+
+def test_numpy_engine_rejects_short_history():
+    with pytest.raises(ValueError):
+        add_technical_indicators(generate_ohlcv(30), engine='numpy')
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        add_technical_indicators(generate_ohlcv(300), engine='pandas')
+
+
+if __name__ == "__main__":
+    test_numpy_engine_matches_ta()
+    test_numpy_engine_handles_unsorted_and_missing_rows()
+    test_numpy_engine_rejects_short_history()
+    test_unknown_engine()
+    print("[SUCCESS] Fused engine matches the ta reference.")
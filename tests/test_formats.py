@@ -0,0 +1,80 @@
+import io
+import pandas as pd
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from api.main import app
+from api.serialization import DATA_FIELDS
+from core.data_loader import set_provider
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+BASE = {
+    "ticker": "AAPL", "start_date": "2023-01-01", "end_date": "2023-06-30",
+    "contamination": 0.05, "language": "en",
+}
+
+
+def _post(**options):
+    set_provider(SyntheticProvider())
+    try:
+        return client.post("/api/analyze", json={**BASE, **options})
+    finally:
+        set_provider(None)
+
+
+def test_columnar_matches_records():
+    records = _post().json()
+    columnar = _post(format="columnar").json()
+
+    assert columnar['format'] == "columnar"
+    for key in ("ticker", "anomalies_count", "llm_analysis", "sentiment", "action"):
+        assert columnar[key] == records[key]
+
+    # The UI reads both shapes with the same call
+    expected = pd.DataFrame(records['data'])
+    actual = pd.DataFrame(columnar['data'])
+    assert list(actual.columns) == DATA_FIELDS
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+def test_fields_and_precision():
+    res = _post(format="columnar", fields=["date", "close", "rsi", "anomaly"], precision=2)
+    data = res.json()['data']
+    assert list(data) == ["date", "close", "rsi", "anomaly"]
+    assert all(v is None or round(v, 2) == v for v in data['close'] + data['rsi'])
+    assert set(data['anomaly']) <= {-1, 1}
+
+    records = _post(fields=["date", "close"]).json()
+    assert list(records['data'][0]) == ["date", "close"]
+
+
+def test_gzip_and_arrow():
+    plain = _post(format="columnar")
+    compressed = _post(format="columnar", compression="gzip")
+    assert compressed.headers['content-encoding'] == "gzip"
+    # The test client decodes Content-Encoding transparently
+    assert compressed.json() == plain.json()
+
+    res = _post(format="arrow", compression="zstd")
+    assert res.headers['content-type'] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(io.BytesIO(res.content)).read_all()
+    meta = {k.decode(): v.decode() for k, v in table.schema.metadata.items()}
+    assert meta['ticker'] == "AAPL"
+    assert int(meta['anomalies_count']) == plain.json()['anomalies_count']
+    assert table.column_names == DATA_FIELDS
+    assert table.num_rows == len(plain.json()['data']['date'])
+
+
+def test_invalid_options():
+    assert _post(format="xml").status_code == 422
+    assert _post(fields=["close", "nope"]).status_code == 422
+    assert _post(format="columnar", compression="zstd").status_code == 422
+
+
+if __name__ == "__main__":
+    test_columnar_matches_records()
+    test_fields_and_precision()
+    test_gzip_and_arrow()
+    test_invalid_options()
+    print("[SUCCESS] Response format tests passed.")
@@ -0,0 +1,65 @@
+import json
+import pickle
+import numpy as np
+import pandas as pd
+from core.anomaly import FEATURE_COLUMNS
+from core.features import IndicatorState, INDICATOR_COLUMNS, add_technical_indicators
+from core.synthetic import generate_ohlcv
+
+
+def _check_row(row, expected):
+    for col in INDICATOR_COLUMNS:
+        assert np.isclose(row[col], expected[col], rtol=1e-9, atol=1e-9), col
+    assert row['sentiment'] == expected['sentiment']
+    assert row['action'] == expected['action']
+
+
+def test_updates_match_batch_computation():
+    df = generate_ohlcv(900, seed=21)
+    batch = add_technical_indicators(df).set_index('date')
+
+    state = IndicatorState.from_history(df.iloc[:600])
+    for bar in df.iloc[600:].to_dict(orient='records'):
+        row = state.update(bar)
+        _check_row(row, batch.loc[bar['date']])
+
+        X = pd.DataFrame([batch.loc[bar['date'], state.features_used]])
+        assert np.isclose(row['anomaly_score'], state.model.decision_function(X)[0])
+        assert row['anomaly'] == state.model.predict(X)[0]
+
+
+def test_warm_up_and_missing_bars():
+    df = generate_ohlcv(260, seed=4)
+    state = IndicatorState.from_history(df.iloc[:0], fit_model=False)
+    rows = [state.update(bar) for bar in df.to_dict(orient='records')]
+    # First valid row is the one where the 200-bar MA is defined
+    assert all(r is None for r in rows[:199]) and rows[199] is not None
+
+    bar = dict(df.iloc[-1])
+    bar['close'] = float('nan')
+    count = state.count
+    assert state.update(bar) is None
+    assert state.count == count
+
+
+def test_state_round_trips():
+    df = generate_ohlcv(700, seed=8)
+    state = IndicatorState.from_history(df.iloc[:500])
+    restored = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    pickled = pickle.loads(pickle.dumps(state))
+
+    for bar in df.iloc[500:].to_dict(orient='records'):
+        row = state.update(bar)
+        json_row = restored.update(bar)
+        pickled_row = pickled.update(bar)
+        for col in INDICATOR_COLUMNS:
+            assert json_row[col] == row[col]
+        assert pickled_row['anomaly_score'] == row['anomaly_score']
+    assert set(state.features_used) == set(FEATURE_COLUMNS)
+
+
+if __name__ == "__main__":
+    test_updates_match_batch_computation()
+    test_warm_up_and_missing_bars()
+    test_state_round_trips()
+    print("[SUCCESS] IndicatorState matches the batch computation.")
@@ -0,0 +1,168 @@
+import os
+import tempfile
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+import core.data_loader as data_loader
+from api.main import app
+from core.cache import OHLCVCache
+from core.data_loader import DataProvider, YFinanceProvider, fetch_data, set_provider
+from core.features import add_technical_indicators
+from core.intervals import get_interval, split_range
+from core.local_store import LocalStore
+from core.planner import plan_range
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+
+class DailyOnlyProvider(DataProvider):
+    def __init__(self):
+        self.inner = SyntheticProvider()
+
+    def fetch(self, ticker, start_date, end_date):
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def test_split_range_within_provider_limits():
+    today = pd.Timestamp("2024-06-30")
+    chunks = split_range("2024-06-10", "2024-06-30", '1m', today=today)
+    assert chunks == [("2024-06-10", "2024-06-17"), ("2024-06-17", "2024-06-24"), ("2024-06-24", "2024-06-30")]
+    # Older than upstream keeps: start moved up, or nothing at all
+    assert split_range("2024-01-01", "2024-06-30", '1m', today=today)[0][0] == "2024-06-01"
+    assert split_range("2024-01-01", "2024-02-01", '5m', today=today) == []
+    assert split_range("2000-01-01", "2024-06-30", '1d', today=today) == [("2000-01-01", "2024-06-30")]
+    with pytest.raises(ValueError):
+        get_interval('7m')
+
+
+def test_yfinance_fetch_is_chunked():
+    calls = []
+
+    def download(tickers, start, end, interval, progress, **kwargs):
+        calls.append((start, end, interval))
+        index = pd.date_range(f"{start} 09:30", periods=3, freq='1min', tz='America/New_York', name='Datetime')
+        return pd.DataFrame({'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 10}, index=index)
+
+    start = (pd.Timestamp.today() - pd.Timedelta(days=20)).strftime('%Y-%m-%d')
+    end = pd.Timestamp.today().strftime('%Y-%m-%d')
+    original, data_loader.yf.download = data_loader.yf.download, download
+    try:
+        df = YFinanceProvider().fetch("AAPL", start, end, interval='1m')
+    finally:
+        data_loader.yf.download = original
+    assert len(calls) == 3 and all(i == '1m' for _, _, i in calls)
+    assert list(df.columns) == ['date', 'open', 'high', 'low', 'close', 'volume'] and len(df) == 9
+    # Exchange wall-clock time, tz-naive like daily bars
+    assert df['date'].dt.tz is None and df['date'].iloc[0].strftime('%H:%M') == '09:30'
+
+
+def test_synthetic_intraday_bars():
+    provider = SyntheticProvider()
+    month = provider.fetch("BTC-USD", "2024-01-01", "2024-02-01", interval='1m')
+    assert len(month) == 31 * 1440
+    # Any sub-range returns the same bars
+    part = provider.fetch("BTC-USD", "2024-01-10 12:00", "2024-01-12", interval='1m')
+    expected = month[(month['date'] >= "2024-01-10 12:00") & (month['date'] < "2024-01-12")].reset_index(drop=True)
+    pd.testing.assert_frame_equal(part, expected)
+    # Equities trade the regular session on trading days only
+    stock = provider.fetch("AAPL", "2024-01-12", "2024-01-17", interval='5m')
+    assert len(stock) == 2 * 78  # Friday and Tuesday; MLK Day closed
+    assert stock['date'].dt.strftime('%H:%M').min() == '09:30' and stock['date'].dt.strftime('%H:%M').max() == '15:55'
+
+
+def test_compact_dtypes():
+    df = fetch_data("BTC-USD", "2024-01-01", "2024-01-08", provider=SyntheticProvider(), interval='1m')
+    assert all(df[c].dtype == np.float32 for c in ('open', 'high', 'low', 'close'))
+    assert df['volume'].dtype == np.int64
+    daily = fetch_data("AAPL", "2023-01-01", "2023-06-01", provider=SyntheticProvider())
+    assert daily['close'].dtype == np.float64
+
+    compact = add_technical_indicators(df)
+    wide = add_technical_indicators(df.astype({c: np.float64 for c in ('open', 'high', 'low', 'close')}))
+    assert compact['rsi'].dtype == np.float32 and wide['rsi'].dtype == np.float64
+    assert compact.memory_usage().sum() < 0.6 * wide.memory_usage().sum()
+    np.testing.assert_allclose(compact['rsi'], wide['rsi'], atol=0.05)
+
+
+def test_compact_drops_bars_without_volume():
+    raw = SyntheticProvider().fetch("AAPL", "2024-01-02", "2024-01-06", interval='5m')
+    raw['volume'] = raw['volume'].astype(np.float64)
+    raw.loc[[100, 101, 250], 'volume'] = np.nan
+    compact = data_loader.compact_ohlcv(raw)
+    assert len(compact) == len(raw) - 3 and compact['volume'].dtype == np.int64
+    assert (compact['volume'] > 0).all()
+
+    # Same indicators as the full-width frame, whose NaN rows the engine drops
+    expected = add_technical_indicators(raw.copy()).reset_index(drop=True)
+    features = add_technical_indicators(compact).reset_index(drop=True)
+    for col in ('obv', 'vol_spike'):
+        np.testing.assert_allclose(features[col], expected[col], rtol=1e-4)
+
+
+def test_intraday_warm_up_in_bars():
+    daily = plan_range("2024-03-04", "2024-03-08", ['rsi'])
+    minute = plan_range("2024-03-04", "2024-03-08", ['rsi'], interval='1m')
+    hourly = plan_range("2024-03-04", "2024-03-08", ['rsi'], interval='1h')
+    assert daily.warmup_bars == minute.warmup_bars
+    # 100-odd one-minute bars fit in the previous session; hourly bars need weeks
+    assert minute.fetch_start == "2024-03-01"
+    assert daily.fetch_start < hourly.fetch_start < minute.fetch_start
+
+
+def test_cache_and_store_keep_intervals_apart():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = OHLCVCache(SyntheticProvider(), tmp, today=lambda: date(2024, 6, 1))
+        minute = cache.fetch("AAPL", "2024-01-02", "2024-01-04", interval='1m')
+        day = cache.fetch("AAPL", "2023-01-02", "2024-01-04")
+        assert len(minute) == 2 * 390 and len(day) > 250
+        assert sorted(os.listdir(tmp)) == ['AAPL.json', 'AAPL.parquet', 'AAPL@1m.json', 'AAPL@1m.parquet']
+        pd.testing.assert_frame_equal(cache.fetch("AAPL", "2024-01-02", "2024-01-04", interval='1m'), minute)
+        cache.clear("AAPL")
+        assert os.listdir(tmp) == []
+
+        store = LocalStore(os.path.join(tmp, 'store'))
+        store.write("AAPL", minute, interval='1m')
+        store.write("AAPL", day)
+        assert store.tickers() == ["AAPL"] and store.tickers('1m') == ["AAPL"] and store.tickers('5m') == []
+        assert len(store.fetch("AAPL", "2024-01-03", "2024-01-04", interval='1m')) == 390
+        assert store.fetch("AAPL", "2024-01-03", "2024-01-04", interval='5m').empty
+
+
+def test_analyze_intraday():
+    set_provider(SyntheticProvider())
+    try:
+        body = {"ticker": "ETH-USD", "start_date": "2024-01-08", "end_date": "2024-01-10", "interval": "5m",
+                "language": "en", "format": "columnar"}
+        res = client.post("/api/analyze", json=body)
+        assert res.status_code == 200
+        data = res.json()['data']
+        assert len(data['date']) == 2 * 288 and data['date'][1] == "2024-01-08 00:05:00"
+        # float32 prices are written without representation noise
+        assert all(len(repr(v).split('.')[-1]) <= 6 for v in data['close'][:50])
+        daily = client.post("/api/analyze", json=dict(body, interval="1d"))
+        assert res.json()['handle'] != daily.json()['handle']
+
+        assert client.post("/api/analyze", json=dict(body, interval="7m")).status_code == 422
+        res = client.post("/api/indicators", json={"ticker": "AAPL", "start_date": "2024-01-08", "end_date": "2024-01-09",
+                                                   "interval": "1h", "indicators": ["rsi"]})
+        assert res.status_code == 200 and res.json()['data']['date'][0] == "2024-01-08 09:30:00"
+
+        set_provider(DailyOnlyProvider())
+        assert client.post("/api/analyze", json=body).status_code == 422
+    finally:
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_split_range_within_provider_limits()
+    test_yfinance_fetch_is_chunked()
+    test_synthetic_intraday_bars()
+    test_compact_dtypes()
+    test_compact_drops_bars_without_volume()
+    test_intraday_warm_up_in_bars()
+    test_cache_and_store_keep_intervals_apart()
+    test_analyze_intraday()
+    print("[SUCCESS] Interval tests passed.")
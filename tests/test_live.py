@@ -0,0 +1,178 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from api.main import app
+from core.data_loader import fetch_data, set_provider
+from core.features import add_technical_indicators
+from core.live import LiveMonitor, ReplayFeed, set_monitor
+from core.planner import plan_range
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+START, END = "2023-06-01", "2023-12-29"
+
+
+def _feed(**kwargs):
+    return ReplayFeed(START, END, speed=0, provider=SyntheticProvider(), **kwargs)
+
+
+async def _drain(queue):
+    messages = []
+    while not messages or messages[-1]['event'] != 'end':
+        messages.append(json.loads(await queue.get()))
+    return messages
+
+
+def _expected_changes(ticker):
+    plan = plan_range(START, END, extra=252)
+    batch = add_technical_indicators(fetch_data(ticker, plan.fetch_start, END, provider=SyntheticProvider()))
+    # From the last bar before the replay start
+    first = batch.index[batch['date'] >= START][0]
+    batch = batch.loc[batch.index[batch.index.get_loc(first) - 1]:]
+    signals = [str(d) for d, changed in zip(batch['date'], batch['action'].ne(batch['action'].shift())) if changed][1:]
+    sentiments = [str(d) for d, changed in zip(batch['date'], batch['sentiment'].ne(batch['sentiment'].shift())) if changed][1:]
+    return signals, sentiments
+
+
+def test_subscribers_share_one_state():
+    monitor = LiveMonitor(_feed())
+
+    async def run():
+        first, second = monitor.queue(), monitor.queue()
+        await asyncio.gather(monitor.subscribe('live', first), monitor.subscribe('LIVE', second))
+        return await _drain(first), await _drain(second)
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert monitor.stats()['seeds'] == 1
+    assert first[0]['event'] == 'subscribed' and first[0]['date'] < START
+
+    signals, sentiments = _expected_changes('LIVE')
+    assert [m['date'] for m in first if m['event'] == 'signal'] == signals
+    assert [m['date'] for m in first if m['event'] == 'sentiment'] == sentiments
+    anomalies = [m for m in first if m['event'] == 'anomaly']
+    assert anomalies and all(m['anomaly_score'] < 0 for m in anomalies)
+    # Events only: far fewer messages than replayed bars
+    assert len(first) < monitor.stats()['bars']
+
+
+def test_state_stays_warm_between_subscriptions():
+    full = LiveMonitor(_feed())
+    resumed = LiveMonitor(_feed())
+
+    async def run():
+        queue = full.queue()
+        await full.subscribe('WARM', queue)
+        expected = await _drain(queue)
+
+        queue = resumed.queue()
+        await resumed.subscribe('WARM', queue)
+        received = [json.loads(await queue.get())]
+        while received[-1]['event'] != 'signal':
+            received.append(json.loads(await queue.get()))
+        resumed.unsubscribe('WARM', queue)
+        while not queue.empty():
+            received.append(json.loads(queue.get_nowait()))
+        assert resumed.streams['WARM'].task is None
+
+        # A new subscriber continues from the last bar the warm state has seen
+        queue = resumed.queue()
+        await resumed.subscribe('WARM', queue)
+        rest = await _drain(queue)
+        assert rest[0]['event'] == 'subscribed'
+        return expected, received + rest[1:]
+
+    expected, received = asyncio.run(run())
+    assert received == expected
+    assert resumed.stats()['seeds'] == 1
+
+
+def test_unknown_ticker_and_slow_subscriber():
+    async def run():
+        empty = LiveMonitor(ReplayFeed("1985-01-02", "1985-06-01", speed=0, provider=SyntheticProvider()))
+        try:
+            await empty.subscribe('OLD', empty.queue())
+            raise AssertionError("expected LookupError")
+        except LookupError:
+            pass
+
+        monitor = LiveMonitor(_feed(), queue_size=2)
+        slow, fast = monitor.queue(), asyncio.Queue()
+        await monitor.subscribe('SLOW', slow)
+        await monitor.subscribe('SLOW', fast)
+        messages = await _drain(fast)
+        return monitor, slow, messages
+
+    monitor, slow, messages = asyncio.run(run())
+    # The full queue kept only the newest messages; the other subscriber got everything
+    assert [json.loads(slow.get_nowait()) for _ in range(2)] == messages[-2:]
+    assert monitor.stats()['dropped'] > 0
+
+
+def test_websocket_protocol():
+    set_provider(SyntheticProvider())
+    set_monitor(LiveMonitor(_feed()))
+    try:
+        with client.websocket_connect("/api/live?tickers=WS") as ws:
+            assert ws.receive_json()['event'] == 'subscribed'
+            ws.send_json({"action": "watch"})
+            events = []
+            while not events or events[-1]['event'] != 'end':
+                events.append(ws.receive_json())
+            assert {'error', 'signal', 'end'} <= {e['event'] for e in events}
+            assert all(e.get('ticker') in ('WS', None) for e in events)
+
+            ws.send_json({"action": "subscribe", "tickers": ["WS2"]})
+            assert ws.receive_json()['ticker'] == 'WS2'
+
+        stats = client.get("/api/admin/stats").json()['live']
+        assert stats['tickers'] == 2 and stats['subscribers'] == 0
+    finally:
+        set_monitor(None)
+        set_provider(None)
+
+
+class FailingFeed(ReplayFeed):
+    """Replay feed whose history for 'BAD' cannot be turned into indicators."""
+
+    def history(self, ticker):
+        if ticker == 'BAD':
+            raise ValueError("Feature engineering failed.")
+        return super().history(ticker)
+
+
+def test_websocket_survives_bad_input():
+    set_provider(SyntheticProvider())
+    set_monitor(LiveMonitor(FailingFeed(START, END, speed=0, provider=SyntheticProvider())))
+    try:
+        with client.websocket_connect("/api/live?tickers=BAD") as ws:
+            error = ws.receive_json()
+            assert error == {'event': 'error', 'ticker': 'BAD', 'detail': "Feature engineering failed."}
+            ws.send_text("{not json")
+            assert ws.receive_json()['event'] == 'error'
+            ws.send_bytes(b"\x00")
+            assert ws.receive_json()['event'] == 'error'
+            # Still connected
+            ws.send_json({"action": "subscribe", "tickers": ["OK"]})
+            assert ws.receive_json()['event'] == 'subscribed'
+    finally:
+        set_monitor(None)
+        set_provider(None)
+
+
+def test_replay_feed_keeps_a_bounded_number_of_frames():
+    feed = _feed(max_frames=2)
+    for ticker in ('F1', 'F2', 'F1', 'F3'):
+        assert feed.history(ticker) is not None
+    assert list(feed._frames) == ['F1', 'F3']
+
+
+if __name__ == "__main__":
+    test_subscribers_share_one_state()
+    test_state_stays_warm_between_subscriptions()
+    test_unknown_ticker_and_slow_subscriber()
+    test_websocket_protocol()
+    test_websocket_survives_bad_input()
+    test_replay_feed_keeps_a_bounded_number_of_frames()
+    print("[SUCCESS] Live monitoring tests passed.")
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from fastapi.testclient import TestClient
+from api.main import app
+from core.anomaly import detect_anomalies
+from core.data_loader import set_provider
+from core.features import add_technical_indicators
+from core.llm import HTTPLLM, LLMService, MockLLM, build_prompt, market_context, set_llm
+from core.llm_stub import StubLLMServer
+from core.synthetic import SyntheticProvider, generate_ohlcv
+
+client = TestClient(app)
+FRAME = detect_anomalies(add_technical_indicators(generate_ohlcv(600, seed=4)))
+ANOMALIES = FRAME[FRAME['anomaly'] == -1]
+
+
+def _contexts(n, language='en'):
+    return [market_context(f"T{i}", ANOMALIES, FRAME.iloc[-1 - i], language) for i in range(n)]
+
+
+def test_context_key_and_prompt():
+    first, again = market_context("AAA", ANOMALIES, FRAME.iloc[-1]), market_context("AAA", ANOMALIES, FRAME.iloc[-1])
+    assert first.key() == again.key()
+    assert market_context("AAA", ANOMALIES, FRAME.iloc[-1], 'pl').key() != first.key()
+    assert market_context("AAA", ANOMALIES.iloc[:-1], FRAME.iloc[-1]).key() != first.key()
+
+    prompt = build_prompt(_contexts(3))
+    assert "### T0" in prompt and "### T2" in prompt and "JSON" in prompt
+    assert MockLLM().generate(first) == MockLLM().generate_analysis("AAA", ANOMALIES, FRAME.iloc[-1], language='en')
+
+
+def test_batches_prompts_and_caches_answers():
+    with StubLLMServer(latency=0.05) as stub:
+        service = LLMService(HTTPLLM(stub.url, max_batch=4))
+        try:
+            contexts = _contexts(6) + _contexts(2, language='pl')
+            results = service.analyze_many(contexts)
+            assert [r['text'] for r in results] == [f"Stub analysis for {c.ticker}." for c in contexts]
+            assert [r['action'] for r in results] == [c.action for c in contexts]
+            # 6 English tickers in prompts of 4 and 2, the Polish ones in a prompt of their own
+            assert sorted(len(p) for p in stub.prompts) == [2, 2, 4]
+
+            assert service.analyze_many(contexts) == results
+            assert stub.requests == 3 and service.stats()['cache']['hits'] == len(contexts)
+        finally:
+            service.close()
+
+
+def test_concurrency_limit_and_coalescing():
+    with StubLLMServer(latency=0.1) as stub:
+        service = LLMService(HTTPLLM(stub.url, max_concurrency=2, max_batch=1))
+
+        async def run():
+            contexts = _contexts(6)
+            # Three callers ask for the same contexts at once
+            return await asyncio.gather(*(service.aanalyze_many(contexts) for _ in range(3)))
+
+        try:
+            first, second, third = asyncio.run(run())
+            assert first == second == third
+            assert stub.requests == 6 and stub.max_in_flight == 2
+            assert service.stats()['coalesced'] == 12
+        finally:
+            service.close()
+
+
+def test_timeout_falls_back_to_mock():
+    with StubLLMServer(latency=1.0) as stub:
+        service = LLMService(HTTPLLM(stub.url), timeout=0.2)
+        try:
+            context = _contexts(1)[0]
+            started = time.perf_counter()
+            result = service.analyze(context)
+            assert time.perf_counter() - started < 0.8
+            assert result == dict(MockLLM().generate(context), fallback=True)
+            stats = service.stats()
+            assert stats['timeouts'] == 1 and stats['fallbacks'] == 1 and stats['cache']['entries'] == 0
+        finally:
+            service.close()
+
+
+def test_analyze_endpoints_use_the_service():
+    set_provider(SyntheticProvider())
+    with StubLLMServer(latency=0.05) as stub:
+        set_llm(LLMService(HTTPLLM(stub.url, max_batch=8)))
+        try:
+            body = {"start_date": "2023-01-02", "end_date": "2023-12-29", "language": "en"}
+            res = client.post("/api/analyze", json=dict(body, ticker="LLM1"))
+            assert res.status_code == 200 and res.json()['llm_analysis'] == "Stub analysis for LLM1."
+
+            res = client.post("/api/analyze/batch", json=dict(body, tickers=["LLM2", "LLM3", "LLM4"]))
+            assert [item['result']['llm_analysis'] for item in res.json()['results']] == \
+                   [f"Stub analysis for LLM{i}." for i in (2, 3, 4)]
+            # One prompt for the whole watchlist
+            assert stub.prompts[-1] == ["LLM2", "LLM3", "LLM4"] and stub.requests == 2
+            assert client.get("/api/admin/stats").json()['llm']['generated'] == 4
+        finally:
+            set_llm(None)
+            set_provider(None)
+
+
+def test_fallback_responses_are_not_cached():
+    set_provider(SyntheticProvider())
+    with StubLLMServer(latency=1.0) as stub:
+        set_llm(LLMService(HTTPLLM(stub.url), timeout=0.2))
+        try:
+            body = {"ticker": "LLM5", "start_date": "2023-01-02", "end_date": "2023-12-29", "language": "en"}
+            first = client.post("/api/analyze", json=body)
+            assert first.json()['llm_analysis'] != "Stub analysis for LLM5."
+            assert first.headers['Cache-Control'].endswith('max-age=0')
+
+            # The model recovers: the next request asks it again instead of replaying the canned text
+            stub.latency = 0.0
+            second = client.post("/api/analyze", json=body)
+            assert second.headers['X-Cache'] == 'MISS' and second.json()['llm_analysis'] == "Stub analysis for LLM5."
+            assert client.post("/api/analyze", json=body).headers['X-Cache'] == 'HIT'
+            assert stub.requests == 2
+        finally:
+            set_llm(None)
+            set_provider(None)
+
+
+if __name__ == "__main__":
+    test_context_key_and_prompt()
+    test_batches_prompts_and_caches_answers()
+    test_concurrency_limit_and_coalescing()
+    test_timeout_falls_back_to_mock()
+    test_analyze_endpoints_use_the_service()
+    test_fallback_responses_are_not_cached()
+    print("[SUCCESS] LLM service tests passed.")
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from api.main import app
+from core import config
+from core.data_loader import get_provider, set_provider
+from core.features import add_technical_indicators
+from core.local_store import LocalStore, import_files, main as store_main
+from core.synthetic import generate_ohlcv
+
+client = TestClient(app)
+
+
+def test_slices_match_pandas_mask():
+    history = generate_ohlcv(3_000, seed=5, start="2005-01-03")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(tmp)
+        assert store.write("aapl", history) == len(history)
+        assert store.tickers() == ["AAPL"]
+
+        for start, end in [("2006-03-04", "2007-01-01"), ("1990-01-01", "2030-01-01"), ("2005-01-03", "2005-01-04")]:
+            expected = history[(history['date'] >= start) & (history['date'] < end)].reset_index(drop=True)
+            expected['date'] = expected['date'].astype('datetime64[ns]')
+            pd.testing.assert_frame_equal(store.fetch("AAPL", start, end), expected)
+
+        assert store.fetch("AAPL", "2030-01-01", "2031-01-01").empty
+        assert store.fetch("MSFT", "2005-01-01", "2006-01-01").empty
+
+        # Zero-copy views of the mapped file unless copy=True
+        mapped = store._open("AAPL")[1]['close']
+        view = store.fetch("AAPL", "2006-01-01", "2007-01-01")
+        assert np.shares_memory(view['close'].to_numpy(), mapped)
+        owned = LocalStore(tmp, copy=True).fetch("AAPL", "2006-01-01", "2007-01-01")
+        assert not np.shares_memory(owned['close'].to_numpy(), mapped)
+
+
+def test_merge_and_remap_after_write():
+    history = generate_ohlcv(1_000, seed=6)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(tmp)
+        store.write("X", history.iloc[:600])
+        assert len(store.fetch("X", "1990-01-01", "2030-01-01")) == 600
+
+        # Overlapping append: later rows win, the open map is replaced
+        revised = history.iloc[500:].copy()
+        revised.loc[revised.index[0], 'close'] = -1.0
+        assert store.write("X", revised) == 1_000
+        merged = store.fetch("X", "1990-01-01", "2030-01-01")
+        assert len(merged) == 1_000 and merged['close'].iloc[500] == -1.0
+        assert merged['date'].is_monotonic_increasing
+
+
+def test_import_csv_and_parquet():
+    a = generate_ohlcv(300, seed=1)
+    b = generate_ohlcv(200, seed=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        # yfinance-style single-ticker CSV (capitalized columns, tz-aware timestamps)
+        single = a.rename(columns=str.capitalize).rename(columns={'Date': 'Datetime'})
+        single['Datetime'] = single['Datetime'].dt.tz_localize('America/New_York')
+        single['Adj Close'] = single['Close']
+        single.to_csv(os.path.join(tmp, "spy.csv"), index=False)
+        # Long Parquet dump with several tickers
+        long = pd.concat([a.assign(symbol="AAA"), b.assign(symbol="BBB")])
+        long.to_parquet(os.path.join(tmp, "dump.parquet"), index=False)
+
+        store = LocalStore(os.path.join(tmp, "store"))
+        stored = import_files(store, [os.path.join(tmp, "spy.csv"), os.path.join(tmp, "dump.parquet")])
+        assert stored == {"SPY": 300, "AAA": 300, "BBB": 200}
+        spy = store.fetch("SPY", "1990-01-01", "2030-01-01")
+        assert list(spy.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+        # Converted to UTC, naive
+        assert spy['date'].iloc[0] == a['date'].iloc[0] + pd.Timedelta(hours=5)
+
+        store_main(['import', os.path.join(tmp, "spy.csv"), '--ticker', 'QQQ', '--root', store.root])
+        assert "QQQ" in LocalStore(store.root).tickers()
+
+
+def test_missing_volume_matches_other_providers():
+    history = generate_ohlcv(600, seed=8)
+    history.loc[[250, 400, 401], 'volume'] = np.nan
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(tmp)
+        assert store.write("GAPS", history) == len(history) - 3
+        stored = store.fetch("GAPS", "1990-01-01", "2030-01-01")
+        assert stored['volume'].dtype == np.int64 and (stored['volume'] > 0).all()
+
+        # Same indicators as from a provider that returns the bars with NaN volume
+        expected = add_technical_indicators(history.copy()).reset_index(drop=True)
+        features = add_technical_indicators(stored.copy()).reset_index(drop=True)
+        for col in ('obv', 'vol_spike'):
+            np.testing.assert_allclose(features[col], expected[col])
+
+
+def test_configured_local_provider_serves_api():
+    previous = (config.DATA_PROVIDER, config.LOCAL_STORE_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        LocalStore(tmp).write("OFFLINE", generate_ohlcv(800, seed=9, start="2021-01-04"))
+        config.DATA_PROVIDER, config.LOCAL_STORE_DIR = "local", tmp
+        set_provider(None)
+        try:
+            assert isinstance(get_provider(), LocalStore)
+            res = client.post("/api/analyze", json={
+                "ticker": "OFFLINE", "start_date": "2023-01-01", "end_date": "2023-06-30", "language": "en",
+            })
+            assert res.status_code == 200 and len(res.json()['data']) > 100
+        finally:
+            config.DATA_PROVIDER, config.LOCAL_STORE_DIR = previous
+            set_provider(None)
+
+
+if __name__ == "__main__":
+    test_slices_match_pandas_mask()
+    test_merge_and_remap_after_write()
+    test_import_csv_and_parquet()
+    test_missing_volume_matches_other_providers()
+    test_configured_local_provider_serves_api()
+    print("[SUCCESS] Local store tests passed.")
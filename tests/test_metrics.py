@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+from api.main import app
+from api.response_cache import ResponseCache, set_response_cache
+from core import config
+from core.data_loader import set_provider
+from core.metrics import FRAME_BYTES, ROWS_PROCESSED, STAGE_SECONDS, Counter, Histogram, StageTimer
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+BASE = {"ticker": "METRICS", "start_date": "2023-01-01", "end_date": "2023-06-30", "contamination": 0.05, "language": "en"}
+
+
+def _stages(header):
+    return [part.split(';')[0] for part in header.split(', ')]
+
+
+def test_text_format():
+    counter = Counter('demo_total', 'Demo counter.', ('kind',))
+    counter.inc(2, kind='a"b')
+    histogram = Histogram('demo_seconds', 'Demo histogram.', ('stage',), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage='x')
+    histogram.observe(5.0, stage='x')
+
+    assert counter.render()[-1] == 'demo_total{kind="a\\"b"} 2.0'
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="x",le="1.0"} 1' in lines
+    assert 'demo_seconds_bucket{stage="x",le="+Inf"} 2' in lines
+    assert 'demo_seconds_count{stage="x"} 2' in lines
+
+    timer = StageTimer('demo', enabled=False)
+    with timer.stage('work'):
+        pass
+    assert timer.stages == {} and timer.header() is None
+
+
+def test_stage_timings_exported():
+    set_response_cache(ResponseCache())
+    set_provider(SyntheticProvider())
+    previous = STAGE_SECONDS.count(endpoint='analyze', stage='fetch')
+    rows, fetched = ROWS_PROCESSED.value(endpoint='analyze'), FRAME_BYTES.value(endpoint='analyze')
+    try:
+        res = client.post("/api/analyze", json=BASE)
+        assert res.status_code == 200
+        stages = _stages(res.headers['Server-Timing'])
+        for stage in ('cache', 'fetch', 'features', 'anomalies', 'filter', 'llm', 'serialize', 'total'):
+            assert stage in stages
+
+        # Cache hit: only the lookup is timed
+        hit = client.post("/api/analyze", json=BASE)
+        assert hit.headers['X-Cache'] == 'HIT'
+        assert _stages(hit.headers['Server-Timing']) == ['cache', 'total']
+
+        report = client.post("/api/report", json={"handle": res.json()['handle']})
+        assert report.status_code == 200
+        assert _stages(report.headers['Server-Timing']) == ['inputs', 'queue', 'render', 'read', 'total']
+    finally:
+        set_provider(None)
+        set_response_cache(None)
+
+    assert STAGE_SECONDS.count(endpoint='analyze', stage='fetch') == previous + 1
+    assert ROWS_PROCESSED.value(endpoint='analyze') > rows
+    assert FRAME_BYTES.value(endpoint='analyze') > fetched
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers['content-type'].startswith('text/plain')
+    text = metrics.text
+    for stage in ('fetch', 'features', 'anomalies', 'llm', 'serialize'):
+        assert f'stockguard_stage_seconds_bucket{{endpoint="analyze",stage="{stage}",le="+Inf"}}' in text
+    assert 'stockguard_stage_seconds_count{endpoint="report",stage="render"}' in text
+    assert 'stockguard_rows_processed_total{endpoint="analyze"}' in text
+    assert 'stockguard_frame_bytes_total{endpoint="analyze"}' in text
+    assert 'stockguard_model_fits_total{kind="fit"}' in text
+
+
+def test_disabled():
+    previous = config.METRICS_ENABLED
+    config.METRICS_ENABLED = False
+    set_provider(SyntheticProvider())
+    try:
+        res = client.post("/api/analyze", json={**BASE, "ticker": "UNTIMED"})
+        assert res.status_code == 200
+        assert 'Server-Timing' not in res.headers
+        assert client.get("/metrics").status_code == 404
+    finally:
+        config.METRICS_ENABLED = previous
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_text_format()
+    test_stage_timings_exported()
+    test_disabled()
+    print("[SUCCESS] Metrics tests passed.")
@@ -0,0 +1,101 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from core.anomaly import FEATURE_COLUMNS, detect_anomalies
+from core.features import add_technical_indicators
+from core.model_registry import ModelRegistry
+from core.synthetic import generate_ohlcv
+
+FEATURES = add_technical_indicators(generate_ohlcv(1000, seed=13))
+X_ALL = FEATURES[FEATURE_COLUMNS]
+
+
+def test_first_call_matches_fresh_fit():
+    registry = ModelRegistry()
+    X = X_ALL.iloc[:500]
+    labels, scores = registry.score("AAPL", X, 0.05)
+
+    reference = detect_anomalies(FEATURES.iloc[:500].copy(), contamination=0.05)
+    np.testing.assert_array_equal(labels, reference['anomaly'].to_numpy())
+    np.testing.assert_allclose(scores, reference['anomaly_score'].to_numpy())
+    assert registry.stats()['fits'] == 1
+
+
+def test_appended_rows_are_only_scored():
+    registry = ModelRegistry(refit_every=5, drift_factor=1e9)
+    labels, scores = registry.score("AAPL", X_ALL.iloc[:500], 0.05)
+    entry = next(iter(registry.cache._data.values()))[0]
+
+    new_labels, new_scores = registry.score("AAPL", X_ALL.iloc[:503], 0.05)
+    stats = registry.stats()
+    assert stats['fits'] == 1 and stats['score_only'] == 1 and stats['rows_scored'] == 3
+    np.testing.assert_array_equal(new_labels[:500], labels)
+    np.testing.assert_allclose(new_scores[500:], entry.model.decision_function(X_ALL.iloc[500:503]))
+
+    # More than refit_every new bars -> refit
+    registry.score("AAPL", X_ALL.iloc[:510], 0.05)
+    assert registry.stats()['fits'] == 2 and registry.stats()['refits_window'] == 1
+
+
+def test_changed_history_and_other_keys_refit():
+    registry = ModelRegistry()
+    registry.score("AAPL", X_ALL.iloc[:500], 0.05)
+
+    revised = X_ALL.iloc[:500].copy()
+    revised.iloc[100, 0] += 1.0
+    registry.score("AAPL", revised, 0.05)
+    assert registry.stats()['refits_changed'] == 1
+
+    registry.score("MSFT", X_ALL.iloc[:500], 0.05)       # other ticker
+    registry.score("AAPL", X_ALL.iloc[50:550], 0.05)     # other window start
+    assert registry.stats()['fits'] == 4
+
+
+def test_contamination_levels_share_one_fit():
+    registry = ModelRegistry(refit_every=5, drift_factor=1e9)
+    for level in (0.05, 0.01, 0.1):
+        labels, scores = registry.score("AAPL", X_ALL.iloc[:503], level)
+        # Same labels and scores as a model fitted at that level
+        reference = detect_anomalies(FEATURES.iloc[:503].copy(), contamination=level)
+        np.testing.assert_array_equal(labels, reference['anomaly'].to_numpy())
+        np.testing.assert_allclose(scores, reference['anomaly_score'].to_numpy())
+    assert registry.stats()['fits'] == 1 and registry.stats()['score_only'] == 2 and len(registry.cache) == 1
+
+
+def test_drift_triggers_refit():
+    registry = ModelRegistry(refit_every=100, drift_factor=2.0, min_drift_rows=10)
+    registry.score("AAPL", X_ALL.iloc[:500], 0.05)
+    shocked = pd.concat([X_ALL.iloc[:500], X_ALL.iloc[500:520] * 25])
+    registry.score("AAPL", shocked, 0.05)
+    assert registry.stats()['refits_drift'] == 1
+
+
+def test_ttl_lru_and_persistence():
+    registry = ModelRegistry(max_entries=1)
+    registry.score("AAPL", X_ALL.iloc[:500], 0.05)
+    registry.score("MSFT", X_ALL.iloc[:500], 0.05)
+    assert len(registry.cache) == 1 and registry.cache.stats()['evictions'] == 1
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        first = ModelRegistry(persist_dir=persist_dir)
+        labels, _ = first.score("AAPL", X_ALL.iloc[:500], 0.05)
+
+        # A new process-level registry picks the fitted model up from disk
+        second = ModelRegistry(persist_dir=persist_dir)
+        reloaded, _ = second.score("AAPL", X_ALL.iloc[:501], 0.05)
+        assert second.stats()['disk_loads'] == 1 and second.stats()['fits'] == 0
+        np.testing.assert_array_equal(reloaded[:500], labels)
+
+        expired = ModelRegistry(persist_dir=persist_dir, ttl=-1)
+        expired.score("AAPL", X_ALL.iloc[:500], 0.05)
+        assert expired.stats()['fits'] == 1
+
+
+if __name__ == "__main__":
+    test_first_call_matches_fresh_fit()
+    test_appended_rows_are_only_scored()
+    test_changed_history_and_other_keys_refit()
+    test_contamination_levels_share_one_fit()
+    test_drift_triggers_refit()
+    test_ttl_lru_and_persistence()
+    print("[SUCCESS] Model registry tests passed.")
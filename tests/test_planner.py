@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from core.data_loader import DataProvider, set_provider
+from core.features import INDICATOR_COLUMNS, add_technical_indicators, resolve_indicators, warmup_bars
+from core.pipeline import ANALYSIS_OUTPUTS
+from core.planner import plan_range
+from core.synthetic import SyntheticProvider, generate_ohlcv
+from core.utils import TRADING_DAY, get_trading_lookback_date
+
+client = TestClient(app)
+
+
+class RecordingProvider(DataProvider):
+    def __init__(self):
+        self.inner = SyntheticProvider()
+        self.calls = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def test_dependency_graph():
+    assert warmup_bars(['ma_200']) == 199
+    assert warmup_bars(['volatility_14']) == 14
+    assert warmup_bars(['rsi']) < warmup_bars(ANALYSIS_OUTPUTS) <= warmup_bars()
+    assert resolve_indicators(['bb_width']) == ['bb_mid', '_bb_std', 'bb_upper', 'bb_lower', 'bb_width']
+    # Signals pull in their inputs; nodes are computed once, in dependency order
+    order = resolve_indicators(['action'])
+    assert {'rsi', 'macd', 'ma_50'} <= set(order) and order.index('_prev_close') < order.index('rsi')
+    with pytest.raises(ValueError):
+        warmup_bars(['rsi', 'nope'])
+
+
+def test_subset_matches_full_computation():
+    df = generate_ohlcv(1200, seed=17)
+    full = add_technical_indicators(df)
+    for engine in ('numpy', 'ta'):
+        rsi = add_technical_indicators(df, engine=engine, outputs=['rsi'])
+        assert list(rsi.columns) == list(df.columns) + ['rsi']
+        # Only RSI's own warm-up is dropped
+        assert len(rsi) == len(df) - 13
+        np.testing.assert_allclose(rsi.loc[full.index, 'rsi'], full['rsi'], rtol=1e-9)
+
+    analysis = add_technical_indicators(df, outputs=ANALYSIS_OUTPUTS)
+    assert 'bb_width' not in analysis.columns and 'vol_ma_20' not in analysis.columns
+    assert analysis.index.equals(full.index)
+    assert list(analysis['action']) == list(full['action'])
+
+
+def test_planned_warm_up_reproduces_full_history():
+    history = generate_ohlcv(3000, seed=8, start="2010-01-04")
+    full = add_technical_indicators(history).set_index('date')
+    for outputs, atol in ((ANALYSIS_OUTPUTS, 1e-4), (('rsi',), 1e-2)):
+        plan = plan_range("2018-03-01", "2018-06-29", outputs, margin=0)
+        fetched = history[history['date'] >= plan.fetch_start]
+        got = add_technical_indicators(fetched, outputs=outputs).set_index('date').loc["2018-03-01":"2018-06-29"]
+        assert len(got) == len(full.loc["2018-03-01":"2018-06-29"])
+        # OBV is a running total, its level depends on where the history starts
+        for col in [c for c in INDICATOR_COLUMNS if c in got.columns and c != 'obv']:
+            np.testing.assert_allclose(got[col], full.loc[got.index, col], atol=atol, err_msg=col)
+
+
+def test_trading_calendar():
+    assert get_trading_lookback_date("2024-01-02", 1) == "2023-12-29"  # New Year's Day
+    assert get_trading_lookback_date("2024-04-01", 1) == "2024-03-28"  # Good Friday
+    assert get_trading_lookback_date("2024-01-06", 1) == "2024-01-05"  # Saturday counts as Monday
+    assert get_trading_lookback_date("2024-01-08", 0) == "2024-01-08"
+    # NYSE had 250 sessions in 2023
+    assert pd.date_range("2023-01-01", "2023-12-31", freq=TRADING_DAY).size == 250
+
+
+def test_endpoints_fetch_planned_range():
+    provider = RecordingProvider()
+    set_provider(provider)
+    try:
+        body = {"ticker": "PLAN", "start_date": "2023-01-03", "end_date": "2023-03-31"}
+        res = client.post("/api/indicators", json=body)
+        assert res.status_code == 200
+        data = res.json()
+        assert data['warmup_bars'] == warmup_bars(['rsi'])
+        assert list(data['data']) == ['date', 'rsi'] and data['data']['date'][0] == "2023-01-03"
+        rsi_start = provider.calls[-1][0]
+
+        res = client.post("/api/analyze", json=dict(body, language="en"))
+        assert res.status_code == 200 and res.json()['data'][0]['date'] == "2023-01-03"
+        analysis_start = provider.calls[-1][0]
+        # Both far shorter than the former fixed 365 calendar days
+        assert "2022-01-03" < analysis_start < rsi_start
+
+        assert client.post("/api/indicators", json=dict(body, indicators=["rsi", "bogus"])).status_code == 422
+    finally:
+        set_provider(None)
+
+
+if __name__ == "__main__":
+    test_dependency_graph()
+    test_subset_matches_full_computation()
+    test_planned_warm_up_reproduces_full_history()
+    test_trading_calendar()
+    test_endpoints_fetch_planned_range()
+    print("[SUCCESS] Range planner tests passed.")
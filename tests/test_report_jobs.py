@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+import pandas as pd
+from fastapi.testclient import TestClient
+from api.main import app
+from core.report_jobs import QueueFullError, ReportJobManager, set_report_jobs
+
+client = TestClient(app)
+
+ANOMALIES = [
+    {"date": "2023-03-01", "close": 101.5, "rsi": 71.2, "vol_spike": 2.4, "atr": 1.9, "adx": 31.0},
+    {"date": "2023-03-09", "close": 97.25, "rsi": 28.4, "vol_spike": 3.1, "atr": 2.2, "adx": 27.5},
+]
+PAYLOAD = {"ticker": "AAPL", "analysis": "**Test** analysis.\n\nSecond paragraph.", "anomalies_json": json.dumps(ANOMALIES)}
+
+
+def _wait(job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/report/jobs/{job_id}").json()
+        if status['status'] not in ('queued', 'running'):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("report job did not finish")
+
+
+def test_job_lifecycle():
+    manager = ReportJobManager(max_workers=2, spool_bytes=64)
+    set_report_jobs(manager)
+    try:
+        submitted = client.post("/api/report/jobs", json=PAYLOAD)
+        assert submitted.status_code == 202
+        job_id = submitted.json()['job_id']
+
+        status = _wait(job_id)
+        assert status['status'] == "done" and status['size'] > 0
+        download = client.get(f"/api/report/jobs/{job_id}/download")
+        assert download.status_code == 200
+        assert download.headers['content-type'] == "application/pdf"
+        assert download.content.startswith(b"%PDF") and len(download.content) == status['size']
+        # Above spool_bytes the document lives in an anonymous temp file, not in temp_reports/
+        assert manager.get(job_id).result._rolled
+
+        # The synchronous endpoint goes through the same pool
+        direct = client.post("/api/report", json=PAYLOAD)
+        assert direct.status_code == 200 and direct.content.startswith(b"%PDF")
+
+        stats = manager.stats()
+        assert stats['completed'] == 2 and stats['queue_depth'] == 0 and stats['avg_render_seconds'] > 0
+        assert client.get("/api/admin/stats").json()['report_jobs']['completed'] == 2
+        assert client.get("/api/report/jobs/unknown").status_code == 404
+        assert client.post("/api/report/jobs", json=dict(PAYLOAD, anomalies_json="not json")).status_code == 422
+    finally:
+        manager.shutdown()
+        set_report_jobs(None)
+
+
+def test_queue_limit_and_pending_download():
+    release = threading.Event()
+
+    def slow_render(ticker, analysis, anomalies_df):
+        release.wait(5)
+        return b"%PDF-fake"
+
+    manager = ReportJobManager(max_workers=1, max_queue=2, render=slow_render)
+    set_report_jobs(manager)
+    try:
+        first = client.post("/api/report/jobs", json=PAYLOAD).json()['job_id']
+        client.post("/api/report/jobs", json=PAYLOAD)
+        rejected = client.post("/api/report/jobs", json=PAYLOAD)
+        assert rejected.status_code == 503
+        assert client.get(f"/api/report/jobs/{first}/download").status_code == 409
+        stats = manager.stats()
+        assert stats['rejected'] == 1 and stats['queued'] + stats['running'] == 2
+
+        release.set()
+        assert _wait(first)['status'] == "done"
+        assert client.get(f"/api/report/jobs/{first}/download").content == b"%PDF-fake"
+    finally:
+        release.set()
+        manager.shutdown()
+        set_report_jobs(None)
+
+
+def test_size_and_age_eviction():
+    clock = [0.0]
+    manager = ReportJobManager(max_workers=1, max_bytes=25, ttl=60, render=lambda t, a, df: b"x" * 10)
+    manager.jobs._clock = lambda: clock[0]
+    jobs = [manager.submit(t, "", pd.DataFrame()) for t in ("A", "B", "C")]
+    for job in jobs:
+        job.future.result()
+
+    # 30 bytes of documents against a 25 byte budget: the oldest is evicted and closed
+    assert manager.get(jobs[0].job_id) is None and jobs[0].result is None
+    assert manager.get(jobs[2].job_id).read() == b"x" * 10
+
+    clock[0] = 61.0
+    assert manager.purge() == 2
+    assert jobs[2].result is None and manager.stats()['store']['bytes'] == 0
+    manager.shutdown()
+
+    try:
+        ReportJobManager(max_workers=1, max_queue=0).submit("A", "", pd.DataFrame())
+        raise AssertionError("expected QueueFullError")
+    except QueueFullError:
+        pass
+
+
+if __name__ == "__main__":
+    test_job_lifecycle()
+    test_queue_limit_and_pending_download()
+    test_size_and_age_eviction()
+    print("[SUCCESS] Report job tests passed.")
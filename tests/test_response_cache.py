@@ -0,0 +1,108 @@
+import tempfile
+from datetime import date
+from fastapi.testclient import TestClient
+from api.main import app
+from api.response_cache import ResponseCache, etag_matches, set_response_cache
+from core.data_loader import DataProvider, set_provider
+from core.synthetic import SyntheticProvider
+
+client = TestClient(app)
+
+HISTORICAL = {"ticker": "AAPL", "start_date": "2023-01-01", "end_date": "2023-06-30", "contamination": 0.05, "language": "en"}
+
+
+class CountingProvider(DataProvider):
+    def __init__(self):
+        self.inner = SyntheticProvider()
+        self.calls = 0
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls += 1
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def _with_cache(cache, requests):
+    """Posts each (payload, headers) pair against a fresh provider and the given cache."""
+    provider = CountingProvider()
+    set_provider(provider)
+    set_response_cache(cache)
+    try:
+        return provider, [client.post("/api/analyze", json=payload, headers=headers or {}) for payload, headers in requests]
+    finally:
+        set_provider(None)
+        set_response_cache(None)
+
+
+def test_historical_range_is_served_from_cache():
+    cache = ResponseCache(today=lambda: date(2024, 1, 2))
+    provider, (first, second, columnar) = _with_cache(cache, [
+        (HISTORICAL, None), (dict(HISTORICAL, ticker=" aapl"), None), (dict(HISTORICAL, format="columnar"), None),
+    ])
+    assert first.status_code == second.status_code == 200
+    assert first.headers['x-cache'] == "MISS" and second.headers['x-cache'] == "HIT"
+    assert first.content == second.content
+    assert first.headers['etag'] == second.headers['etag']
+    assert columnar.headers['etag'] != first.headers['etag']
+    # Two computations: records and columnar
+    assert provider.calls == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['entries'] == 2
+    assert cache.ttl_for("2023-06-30") == cache.ttl_historical
+
+
+def test_live_range_uses_short_ttl():
+    cache = ResponseCache(ttl_live=0.0)
+    live = dict(HISTORICAL, end_date=str(date.today()))
+    assert cache.ttl_for(live['end_date']) == 0.0
+    provider, responses = _with_cache(cache, [(live, None), (live, None)])
+    assert [r.headers['x-cache'] for r in responses] == ["MISS", "MISS"]
+    assert provider.calls == 2
+
+
+def test_if_none_match_returns_304():
+    cache = ResponseCache(today=lambda: date(2024, 1, 2))
+    provider, (first,) = _with_cache(cache, [(HISTORICAL, None)])
+    etag = first.headers['etag']
+    assert etag.startswith('"') and not etag.startswith('W/')
+
+    _, (hit, stale, weak) = _with_cache(cache, [
+        (HISTORICAL, {"If-None-Match": etag}),
+        (HISTORICAL, {"If-None-Match": '"other"'}),
+        (HISTORICAL, {"If-None-Match": f'"other", W/{etag}'}),
+    ])
+    assert hit.status_code == 304 and hit.content == b"" and hit.headers['etag'] == etag
+    assert stale.status_code == 200 and stale.content == first.content
+    assert weak.status_code == 304
+    assert etag_matches("*", etag) and not etag_matches(None, etag)
+
+
+def test_disk_tier_and_admin_stats():
+    with tempfile.TemporaryDirectory() as tmp:
+        today = lambda: date(2024, 1, 2)
+        _with_cache(ResponseCache(persist_dir=tmp, today=today), [(HISTORICAL, None)])
+
+        # A new process-level cache (e.g. after a restart) reloads the entry from disk
+        cache = ResponseCache(max_entries=1, persist_dir=tmp, today=today)
+        provider, (res,) = _with_cache(cache, [(HISTORICAL, None)])
+        assert res.headers['x-cache'] == "HIT" and provider.calls == 0
+        assert cache.stats()['disk_hits'] == 1
+
+        set_response_cache(cache)
+        try:
+            set_provider(CountingProvider())
+            client.post("/api/analyze", json=dict(HISTORICAL, ticker="MSFT"))
+            stats = client.get("/api/admin/stats").json()
+        finally:
+            set_provider(None)
+            set_response_cache(None)
+    assert stats['response_cache']['entries'] == 1
+    assert stats['response_cache']['evictions'] == 1
+    assert 0 < stats['response_cache']['hit_ratio'] < 1
+    assert {'coalescing', 'model_registry', 'data_cache'} <= set(stats)
+
+
+if __name__ == "__main__":
+    test_historical_range_is_served_from_cache()
+    test_live_range_uses_short_ttl()
+    test_if_none_match_returns_304()
+    test_disk_tier_and_admin_stats()
+    print("[SUCCESS] Response cache tests passed.")
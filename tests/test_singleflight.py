@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+import httpx
+from api.main import app
+from api.routers.analyze import analysis_flight
+from core import config
+from core.data_loader import DataProvider, set_provider
+from core.singleflight import SingleFlight
+from core.synthetic import SyntheticProvider
+
+BASE = {"start_date": "2023-01-01", "end_date": "2023-06-30", "contamination": 0.05, "language": "en"}
+
+
+class SlowFakeProvider(DataProvider):
+    """Local fake provider that takes `delay` seconds per fetch and counts calls."""
+
+    def __init__(self, delay=0.5, empty=False):
+        self.inner = SyntheticProvider()
+        self.delay = delay
+        self.empty = empty
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker, start_date, end_date):
+        with self._lock:
+            self.calls.append(ticker)
+        time.sleep(self.delay)
+        if self.empty:
+            return self.inner.fetch(ticker, "1980-01-01", "1980-01-02")
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+async def _post_concurrently(payloads):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        return await asyncio.gather(*(client.post("/api/analyze", json=p) for p in payloads))
+
+
+def _run(provider, payloads):
+    # Measure coalescing alone, without the response cache
+    previous = config.RESPONSE_CACHE_ENABLED
+    config.RESPONSE_CACHE_ENABLED = False
+    set_provider(provider)
+    try:
+        return asyncio.run(_post_concurrently(payloads))
+    finally:
+        set_provider(None)
+        config.RESPONSE_CACHE_ENABLED = previous
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    provider = SlowFakeProvider()
+    before = analysis_flight.stats()
+    # Same request up to ticker case/whitespace and date formatting
+    payloads = [{**BASE, "ticker": "AAPL"} for _ in range(6)]
+    payloads += [{**BASE, "ticker": " aapl", "start_date": "2023-01-01T00:00:00"}, {**BASE, "ticker": "Aapl", "language": "pl"}]
+    responses = _run(provider, payloads)
+
+    assert [r.status_code for r in responses] == [200] * len(payloads)
+    assert provider.calls == ["AAPL"]
+    after = analysis_flight.stats()
+    assert after['executions'] - before['executions'] == 1
+    assert after['coalesced'] - before['coalesced'] == len(payloads) - 1
+    assert after['in_flight'] == 0
+
+    first = responses[0].json()
+    for res in responses[1:6]:
+        assert res.json() == first
+    # Per-request parts (language) are not shared
+    assert responses[7].json()['data'] == first['data']
+    assert responses[7].json()['ticker'] == "Aapl"
+
+
+def test_distinct_requests_are_not_coalesced():
+    provider = SlowFakeProvider(delay=0.2)
+    payloads = [{**BASE, "ticker": "AAPL"}, {**BASE, "ticker": "MSFT"}, {**BASE, "ticker": "AAPL", "contamination": 0.1}]
+    responses = _run(provider, payloads)
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert sorted(provider.calls) == ["AAPL", "AAPL", "MSFT"]
+
+    # Completed calls are not cached: a later identical request fetches again
+    _run(provider, [{**BASE, "ticker": "MSFT"}])
+    assert provider.calls.count("MSFT") == 2
+
+
+def test_errors_are_shared():
+    provider = SlowFakeProvider(delay=0.2, empty=True)
+    responses = _run(provider, [{**BASE, "ticker": "NOPE"}] * 4)
+    assert [r.status_code for r in responses] == [404] * 4
+    assert provider.calls == ["NOPE"]
+
+
+def test_cancelled_waiter_does_not_cancel_flight():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        await asyncio.sleep(0.1)
+        runs.append(1)
+        return 42
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 42
+    assert runs == [1]
+    assert flight.stats() == {'calls': 2, 'executions': 1, 'coalesced': 1, 'in_flight': 0}
+
+
+if __name__ == "__main__":
+    test_concurrent_identical_requests_share_one_fetch()
+    test_distinct_requests_are_not_coalesced()
+    test_errors_are_shared()
+    test_cancelled_waiter_does_not_cancel_flight()
+    print("[SUCCESS] Request coalescing tests passed.")
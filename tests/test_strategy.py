@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from core.features import add_technical_indicators
+from core.strategy import compute_signals, evaluate_market_condition
+from core.synthetic import generate_ohlcv
+
+
+def _reference(df):
+    signals = df.apply(lambda row: evaluate_market_condition(row), axis=1)
+    return [x[0] for x in signals], [x[1] for x in signals]
+
+
+def test_signals_match_reference_on_edge_values():
+    # Thresholds, ties, NaNs and missing MA all have to follow the row-wise rules
+    rsi = [29.999, 30.0, 50.0, 50.001, 70.0, 70.001, np.nan, 10.0, 90.0]
+    df = pd.DataFrame({
+        'rsi': rsi,
+        'macd': [0.0, -1.0, 1.0, 0.5, np.nan, -0.2, 1.0, 2.0, -2.0],
+        'close': [10.0] * len(rsi),
+        'ma_50': [10.0, 9.0, 11.0, 9.0, 9.0, np.nan, 9.0, 9.0, 11.0],
+    })
+    sentiment, action = compute_signals(df)
+    ref_sentiment, ref_action = _reference(df)
+    assert list(sentiment) == ref_sentiment
+    assert list(action) == ref_action
+
+
+def test_signals_default_missing_columns():
+    df = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+    sentiment, action = compute_signals(df)
+    ref_sentiment, ref_action = _reference(df)
+    assert list(sentiment) == ref_sentiment
+    assert list(action) == ref_action
+
+
+def test_signals_match_reference_on_pipeline_output():
+    df = add_technical_indicators(generate_ohlcv(1500, seed=7))
+    ref_sentiment, ref_action = _reference(df.drop(columns=['sentiment', 'action']))
+    assert list(df['sentiment']) == ref_sentiment
+    assert list(df['action']) == ref_action
+    assert isinstance(df['action'].dtype, pd.CategoricalDtype)
+
+
+if __name__ == "__main__":
+    test_signals_match_reference_on_edge_values()
+    test_signals_default_missing_columns()
+    test_signals_match_reference_on_pipeline_output()
+    print("[SUCCESS] Vectorized signals match evaluate_market_condition.")
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from api.streaming import encode_event
+from core.data_loader import set_provider
+from core.synthetic import SyntheticProvider
+from ui.stream import StreamError, StreamedAnalysis, iter_events
+
+client = TestClient(app)
+
+BODY = {"ticker": "STRM", "start_date": "2023-01-03", "end_date": "2023-09-29", "language": "en", "precision": 6}
+
+
+def _stream(body, protocol='ndjson'):
+    with client.stream("POST", "/api/analyze/stream", json=dict(body, protocol=protocol)) as res:
+        assert res.status_code == 200
+        return res.headers['content-type'], list(iter_events(res.iter_lines(), protocol))
+
+
+def test_stream_matches_plain_response():
+    set_provider(SyntheticProvider())
+    try:
+        content_type, events = _stream(dict(BODY, chunk_size=50))
+        assert content_type.startswith('application/x-ndjson')
+        names = [name for name, _ in events]
+        assert names[:4] == ['meta', 'progress', 'progress', 'progress'] and names[-1] == 'summary'
+        assert [p['stage'] for n, p in events if n == 'progress'] == ['fetched', 'features', 'anomalies']
+        chunks = [p for n, p in events if n == 'rows']
+        assert len(chunks) > 1 and all(len(p['data']['date']) <= 50 for p in chunks)
+        assert [p['offset'] for p in chunks] == list(range(0, chunks[0]['total'], 50))
+
+        analysis = StreamedAnalysis()
+        for name, payload in events:
+            analysis.feed(name, payload)
+        streamed = analysis.result()
+        plain = client.post("/api/analyze", json=dict(BODY, format="columnar")).json()
+        assert streamed['data'] == plain['data']
+        for key in ('handle', 'anomalies_count', 'llm_analysis', 'sentiment', 'action'):
+            assert streamed[key] == plain[key]
+
+        # Same events as Server-Sent Events
+        content_type, sse_events = _stream(dict(BODY, chunk_size=50), protocol='sse')
+        assert content_type.startswith('text/event-stream') and sse_events == events
+    finally:
+        set_provider(None)
+
+
+def test_stream_errors():
+    set_provider(SyntheticProvider())
+    try:
+        assert client.post("/api/analyze/stream", json=dict(BODY, chunk_size=0)).status_code == 422
+        assert client.post("/api/analyze/stream", json=dict(BODY, protocol="websocket")).status_code == 422
+        assert client.post("/api/analyze/stream", json=dict(BODY, fields=["nope"])).status_code == 422
+
+        # Failures once the stream has started arrive as an event
+        _, events = _stream(dict(BODY, start_date="1980-01-01", end_date="1985-01-01"))
+        assert [name for name, _ in events] == ['meta', 'error'] and events[-1][1]['status_code'] == 404
+        analysis = StreamedAnalysis()
+        with pytest.raises(StreamError):
+            for name, payload in events:
+                analysis.feed(name, payload)
+    finally:
+        set_provider(None)
+
+
+def test_event_framing():
+    assert encode_event('rows', {'offset': 0}) == b'{"event":"rows","offset":0}\n'
+    assert encode_event('rows', {'offset': 0}, 'sse') == b'event: rows\ndata: {"offset":0}\n\n'
+    lines = b'event: a\ndata: {"x":1}\n\nevent: b\ndata: {"y":2}\n\n'.split(b'\n')
+    assert list(iter_events(lines, 'sse')) == [('a', {'x': 1}), ('b', {'y': 2})]
+
+
+if __name__ == "__main__":
+    test_stream_matches_plain_response()
+    test_stream_errors()
+    test_event_framing()
+    print("[SUCCESS] Streaming tests passed.")
@@ -0,0 +1,54 @@
+from core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_stats():
+    evicted = []
+    cache = TTLCache(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1          # 'a' becomes most recent
+    cache.set('c', 3)                   # evicts 'b'
+    assert evicted == ['b']
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_ttl_and_per_entry_override():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl=10, clock=clock)
+    cache.set('short', 1)
+    cache.set('long', 2, ttl=100)
+    clock.now = 50
+    assert 'short' not in cache
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+    assert cache.stats()['expirations'] == 1
+    clock.now = 200
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+
+
+def test_byte_budget():
+    cache = TTLCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.set('x', b'12345')
+    cache.set('y', b'12345')
+    cache.set('z', b'1')
+    assert 'x' not in cache and cache.bytes == 6
+    assert cache.pop('y') == b'12345' and cache.bytes == 1
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_stats()
+    test_ttl_and_per_entry_override()
+    test_byte_budget()
+    print("[SUCCESS] TTLCache tests passed.")
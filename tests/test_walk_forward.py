@@ -0,0 +1,104 @@
+from multiprocessing import shared_memory
+import numpy as np
+from fastapi.testclient import TestClient
+from api.main import app
+from core import config
+from core.data_loader import DataProvider, set_provider
+from core.pipeline import _run_shared, compute_features, map_shared
+from core.synthetic import SyntheticProvider, generate_ohlcv
+from core.walk_forward import detect_anomalies_walk_forward, walk_forward_blocks
+
+client = TestClient(app)
+
+
+class RecordingProvider(DataProvider):
+    def __init__(self):
+        self.inner = SyntheticProvider()
+        self.calls = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        return self.inner.fetch(ticker, start_date, end_date)
+
+
+def test_blocks_cover_history_without_look_ahead():
+    blocks = walk_forward_blocks(1000, window=200, refit_every=30)
+    assert blocks[0] == (0, 50, 0, 50)  # burn-in, scored in-sample
+    scored = np.concatenate([np.arange(lo, hi) for _, _, lo, hi in blocks])
+    assert np.array_equal(scored, np.arange(1000))
+    for train_lo, train_hi, lo, hi in blocks[1:]:
+        assert train_hi == lo and train_hi - train_lo <= 200 and hi - lo <= 30
+    assert walk_forward_blocks(40, 200, 30) == [(0, 40, 0, 40)]
+
+
+def test_future_bars_do_not_change_past_scores():
+    df = compute_features(generate_ohlcv(600, seed=11))
+    scored = detect_anomalies_walk_forward(df.copy(), 0.05, window=100, refit_every=50, max_workers=1)
+    # Same history cut short: every bar keeps the score it had
+    head = detect_anomalies_walk_forward(df.iloc[:300].copy(), 0.05, window=100, refit_every=50, max_workers=1)
+    np.testing.assert_array_equal(head['anomaly_score'], scored['anomaly_score'].iloc[:300])
+    assert set(scored['anomaly'].unique()) <= {-1, 1} and (scored['anomaly'] == -1).any()
+    assert np.array_equal(scored['anomaly'] == -1, scored['anomaly_score'] < 0)
+    # Raw scores are the block models' score_samples, below the scores by each model's offset
+    block_offsets = scored['anomaly_raw'] - scored['anomaly_score']
+    assert scored['anomaly_raw'].notna().all() and (scored['anomaly_raw'] < 0).all()
+    assert block_offsets.iloc[100:150].nunique() == 1
+
+    short = detect_anomalies_walk_forward(df.iloc[:40].copy(), 0.05, max_workers=1)
+    assert (short['anomaly_raw'] == 0.0).all()
+
+
+def test_process_pool_matches_serial():
+    df = compute_features(generate_ohlcv(600, seed=12))
+    serial = detect_anomalies_walk_forward(df.copy(), 0.05, window=100, refit_every=50, max_workers=1)
+    pooled = detect_anomalies_walk_forward(df.copy(), 0.05, window=100, refit_every=50, max_workers=2)
+    np.testing.assert_allclose(pooled['anomaly_score'], serial['anomaly_score'])
+    np.testing.assert_allclose(pooled['anomaly_raw'], serial['anomaly_raw'])
+
+
+def test_shared_array_helpers():
+    X = np.arange(12, dtype=np.float64).reshape(3, 4)
+    assert map_shared(X, np.sum, [(), (0,), (1,)], max_workers=2)[0] == 66
+
+    # A mapping that fails in the worker raises its own error, not one from the cleanup
+    shm = shared_memory.SharedMemory(create=True, size=8)
+    try:
+        _run_shared(shm.name, (1000,), '<f8', np.sum, ())
+    except TypeError as e:
+        assert 'buffer is too small' in str(e)
+    else:
+        raise AssertionError("expected a TypeError")
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_analyze_mode():
+    saved = config.WALK_FORWARD_WINDOW, config.WALK_FORWARD_REFIT_EVERY, config.BATCH_MAX_WORKERS
+    config.WALK_FORWARD_WINDOW, config.WALK_FORWARD_REFIT_EVERY, config.BATCH_MAX_WORKERS = 100, 50, 1
+    provider = RecordingProvider()
+    set_provider(provider)
+    try:
+        body = {"ticker": "WALK", "start_date": "2023-01-03", "end_date": "2023-06-30", "language": "en"}
+        full = client.post("/api/analyze", json=body)
+        walk = client.post("/api/analyze", json=dict(body, mode="walk_forward"))
+        assert full.status_code == 200 and walk.status_code == 200
+        # Extra training window fetched before the range; same bars returned
+        assert provider.calls[1][0] < provider.calls[0][0]
+        assert [p['date'] for p in walk.json()['data']] == [p['date'] for p in full.json()['data']]
+        assert walk.json()['handle'] != full.json()['handle']
+        assert all(p['anomaly_raw'] is not None for p in walk.json()['data'])
+
+        assert client.post("/api/analyze", json=dict(body, mode="bogus")).status_code == 422
+    finally:
+        set_provider(None)
+        config.WALK_FORWARD_WINDOW, config.WALK_FORWARD_REFIT_EVERY, config.BATCH_MAX_WORKERS = saved
+
+
+if __name__ == "__main__":
+    test_blocks_cover_history_without_look_ahead()
+    test_future_bars_do_not_change_past_scores()
+    test_process_pool_matches_serial()
+    test_shared_array_helpers()
+    test_analyze_mode()
+    print("[SUCCESS] Walk-forward tests passed.")
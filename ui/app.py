@@ -1,15 +1,124 @@
 import streamlit as st
 import requests
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
 from datetime import date, timedelta
 import json
+import time
+from charts import build_figures, downsample
+from stream import StreamError, StreamedAnalysis, iter_events
 
 # Configuration
 API_URL = "http://localhost:8000/api"
+# Seconds an /analyze result is reused for an identical request without asking the API
+ANALYSIS_CACHE_TTL = 300
+# Anomaly detectors offered (see core.detectors.METHODS)
+DETECTORS = ['isolation_forest', 'robust_z', 'hbos', 'hst']
+# Sensitivity slider steps: thresholds for all of them come with every analysis, so moving
+# the slider reclassifies the anomalies locally instead of asking for a refit
+SENSITIVITY_LEVELS = [round(0.01 * k, 2) for k in range(1, 11)]
+# Streamed analyses: rows per event, and the shortest interval between preview redraws
+STREAM_CHUNK_ROWS = 2000
+STREAM_REDRAW_SECONDS = 0.5
 
 st.set_page_config(page_title="StockGuard AI", layout="wide")
 
+
+@st.cache_resource
+def http_session() -> requests.Session:
+    """
+    Shared keep-alive session: one connection pool for all reruns and users.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def validators() -> dict:
+    # Request key -> (ETag, result) of the last download, for revalidation once the cache expired
+    return {}
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, max_entries=32, show_spinner=False)
+def fetch_analysis(request_key: str) -> tuple:
+    """
+    POST /analyze, cached per request (the JSON payload with sorted keys).
+    A previously seen result is revalidated with If-None-Match instead of downloaded again.
+
+    Returns:
+        (ETag, result)
+    """
+    etag, previous = validators().get(request_key, (None, None))
+    headers = {'If-None-Match': etag} if etag else {}
+    response = http_session().post(f"{API_URL}/analyze", json=json.loads(request_key), headers=headers)
+    response.raise_for_status()
+    if response.status_code == 304 and previous is not None:
+        return etag, previous
+
+    result = response.json()
+    etag = response.headers.get('ETag')
+    store = validators()
+    store.pop(request_key, None)
+    store[request_key] = (etag, result)
+    while len(store) > 32:
+        store.pop(next(iter(store)))
+    return etag, result
+
+
+def stream_analysis(payload: dict, labels: dict) -> dict:
+    """
+    POST /analyze/stream, showing the pipeline stage and a preview of the close
+    while rows arrive. Returns the result in the shape fetch_analysis gives.
+    """
+    body = {k: v for k, v in payload.items() if k != 'format'}
+    body.update(protocol='ndjson', chunk_size=STREAM_CHUNK_ROWS)
+    progress = st.progress(0.0, text=labels['stream_started'])
+    preview = st.empty()
+    analysis = StreamedAnalysis()
+    last_draw = 0.0
+
+    with http_session().post(f"{API_URL}/analyze/stream", json=body, stream=True) as response:
+        response.raise_for_status()
+        for event, data in iter_events(response.iter_lines(chunk_size=65536)):
+            analysis.feed(event, data)
+            if event == 'progress':
+                progress.progress(0.0, text=labels['stream_' + data['stage']])
+            elif event == 'rows':
+                progress.progress(analysis.progress(), text=f"{labels['stream_rows']} {analysis.rows}/{analysis.total}")
+                if time.monotonic() - last_draw >= STREAM_REDRAW_SECONDS:
+                    frame = analysis.frame()
+                    frame = downsample(frame.assign(date=pd.to_datetime(frame['date'])), 'close', 1000)
+                    preview.line_chart(frame, x='date', y='close')
+                    last_draw = time.monotonic()
+
+    progress.empty()
+    preview.empty()
+    return analysis.result()
+
+
+# Derived data is keyed by the result version (request + ETag) and built once per version.
+# cache_resource hands out the same objects without copying; they are never modified.
+@st.cache_resource(max_entries=8, show_spinner=False)
+def analysis_frame(version: str, _result: dict) -> pd.DataFrame:
+    return pd.DataFrame(_result['data'])
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def reclassified_frame(version: str, level: float, _data: pd.DataFrame, _thresholds: dict) -> pd.DataFrame:
+    # Anomaly labels at another sensitivity, from the one fit's raw scores
+    threshold = _thresholds[f"{level:g}"]
+    return _data.assign(anomaly=np.where(_data['anomaly_raw'] < threshold, -1, 1))
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def analysis_figures(version: str, rsi_title: str, _data: pd.DataFrame) -> dict:
+    # Downsampled (LTTB) and WebGL above the size threshold, see charts.py
+    return build_figures(_data, rsi_title)
+
 # Localization Dictionary
 TRANSLATIONS = {
     'pl': {
@@ -27,6 +136,24 @@ TRANSLATIONS = {
         'end_date': "Data Końcowa",
         'sensitivity': "Czułość na Anomalie",
         'sensitivity_help': "Określa procent danych, które mają być uznane za anomalie. Wyższa wartość (np. 0.1) oznacza więcej wykrytych anomalii (bardziej czuły), niższa (np. 0.01) oznacza tylko najbardziej ekstremalne przypadki.",
+        'reclassified': "Anomalie przeliczone lokalnie dla czułości {level:g}; interpretacja AI dotyczy czułości {fetched:g}.",
+        'method': "Detektor anomalii",
+        'method_help': "Isolation Forest jest najdokładniejszy. Pozostałe detektory działają w czasie liniowym i są znacznie szybsze przy przeglądaniu wielu spółek.",
+        'method_isolation_forest': "Isolation Forest",
+        'method_robust_z': "Kroczący z-score (mediana/MAD)",
+        'method_hbos': "Histogramy (HBOS)",
+        'method_hst': "Half-space trees (strumieniowo)",
+        'walk_forward': "Tryb walk-forward",
+        'stream': "Pokazuj postęp na bieżąco",
+        'stream_help': "Wyniki są przesyłane partiami: widać etap analizy i podgląd wykresu, zanim dotrze całość. Przydatne dla długich zakresów i świec śróddziennych.",
+        'stream_started': "Rozpoczynanie analizy...",
+        'stream_fetched': "Dane pobrane, liczenie wskaźników...",
+        'stream_features': "Wskaźniki gotowe, wykrywanie anomalii...",
+        'stream_anomalies': "Anomalie wykryte, przesyłanie danych...",
+        'stream_rows': "Odebrane wiersze:",
+        'interval': "Interwał świec",
+        'interval_help': "Świece śróddzienne są dostępne tylko dla ostatnich dni (1m: 30 dni, 2m-30m: 60 dni, 1h: 730 dni); starszy zakres jest przycinany.",
+        'walk_forward_help': "Model jest trenowany tylko na danych sprzed ocenianego dnia (okno kroczące, ponowne trenowanie co kilka sesji). Bez zaglądania w przyszłość, ale wolniej.",
         'analyze_btn': "Analizuj",
         'analysis_header': "Analiza dla",
         'sentiment': "Sentyment Rynkowy",
@@ -58,6 +185,24 @@ TRANSLATIONS = {
         'end_date': "End Date",
         'sensitivity': "Anomaly Sensitivity",
         'sensitivity_help': "Determines the percentage of data to be flagged as anomalies. Higher value (e.g., 0.1) means more anomalies detected (more sensitive), lower (e.g., 0.01) means only the most extreme cases.",
+        'reclassified': "Anomalies reclassified locally at sensitivity {level:g}; the AI interpretation refers to sensitivity {fetched:g}.",
+        'method': "Anomaly detector",
+        'method_help': "Isolation Forest is the most thorough. The other detectors run in linear time and are much faster for screening many tickers.",
+        'method_isolation_forest': "Isolation Forest",
+        'method_robust_z': "Rolling z-score (median/MAD)",
+        'method_hbos': "Histograms (HBOS)",
+        'method_hst': "Half-space trees (streaming)",
+        'walk_forward': "Walk-forward mode",
+        'stream': "Show progress while loading",
+        'stream_help': "Results arrive in chunks: the analysis stage and a chart preview are shown before everything has arrived. Useful for long ranges and intraday bars.",
+        'stream_started': "Starting analysis...",
+        'stream_fetched': "Data fetched, computing indicators...",
+        'stream_features': "Indicators ready, detecting anomalies...",
+        'stream_anomalies': "Anomalies detected, receiving data...",
+        'stream_rows': "Rows received:",
+        'interval': "Bar interval",
+        'interval_help': "Intraday bars only reach back a limited time (1m: 30 days, 2m-30m: 60 days, 1h: 730 days); older parts of the range are skipped.",
+        'walk_forward_help': "The model is trained only on data before the scored day (trailing window, refitted every few sessions). No look-ahead, but slower.",
         'analyze_btn': "Analyze Stock",
         'analysis_header': "Analysis for",
         'sentiment': "Market Sentiment",
@@ -103,35 +248,74 @@ else:
 today = date.today()
 start_date = st.sidebar.date_input(t['start_date'], value=today - timedelta(days=365))
 end_date = st.sidebar.date_input(t['end_date'], value=today)
-contamination = st.sidebar.slider(t['sensitivity'], 0.01, 0.1, 0.05, 0.01, help=t['sensitivity_help'])
+interval = st.sidebar.selectbox(t['interval'], ['1d', '1h', '30m', '15m', '5m', '1m'], help=t['interval_help'])
+contamination = round(st.sidebar.slider(t['sensitivity'], 0.01, 0.1, 0.05, 0.01, help=t['sensitivity_help']), 2)
+method = st.sidebar.selectbox(t['method'], DETECTORS, format_func=lambda m: t[f'method_{m}'], help=t['method_help'])
+# Walk-forward refits Isolation Forests
+walk_forward = st.sidebar.checkbox(t['walk_forward'], value=False, help=t['walk_forward_help'],
+                                   disabled=method != 'isolation_forest')
+stream_results = st.sidebar.checkbox(t['stream'], value=False, help=t['stream_help'])
+
+mode = "walk_forward" if walk_forward and method == 'isolation_forest' else "full"
+payload = {
+    "ticker": ticker,
+    "start_date": str(start_date),
+    "end_date": str(end_date),
+    "contamination": contamination,
+    "mode": mode,
+    "method": method,
+    "interval": interval,
+    "language": lang,
+    # One array per field: smaller payload, read directly by pd.DataFrame
+    "format": "columnar",
+    "precision": 6
+}
+if mode == "full":
+    # Walk-forward fits a model per window, so only there does the sensitivity need a new request
+    payload["levels"] = SENSITIVITY_LEVELS
+# The same analysis at another sensitivity: reclassified from the thresholds already received
+analysis_key = json.dumps({k: v for k, v in payload.items() if k != 'contamination'}, sort_keys=True)
 
+# Only the slider skips the request; a click always asks (revalidated cheaply when unchanged)
 if st.sidebar.button(t['analyze_btn']):
-    with st.spinner("Fetching data and analyzing..."):
-        try:
-            payload = {
-                "ticker": ticker,
-                "start_date": str(start_date),
-                "end_date": str(end_date),
-                "contamination": contamination,
-                "language": lang
-            }
-            response = requests.post(f"{API_URL}/analyze", json=payload)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            # Store data in session state for report generation
-            st.session_state['analysis_result'] = result
-            st.session_state['ticker'] = ticker
-            
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error connecting to API: {e}")
-            st.stop()
+    try:
+        request_key = json.dumps(payload, sort_keys=True)
+        if stream_results:
+            # Progressive: stage, progress and a preview while the rows arrive
+            result = stream_analysis(payload, t)
+            version = f"{request_key}|{result['handle']}"
+        else:
+            with st.spinner("Fetching data and analyzing..."):
+                # Identical requests are answered from the cache (or revalidated with the API)
+                etag, result = fetch_analysis(request_key)
+            version = f"{request_key}|{etag}"
+
+        # Store data in session state for report generation
+        st.session_state['analysis_result'] = result
+        st.session_state['analysis_version'] = version
+        st.session_state['analysis_key'] = analysis_key
+        st.session_state['analysis_contamination'] = contamination
+        st.session_state['ticker'] = ticker
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error connecting to API: {e}")
+        st.stop()
+    except StreamError as e:
+        st.error(f"Analysis failed: {e.detail}")
+        st.stop()
 
 # Display Results if available
 if 'analysis_result' in st.session_state:
     result = st.session_state['analysis_result']
-    data = pd.DataFrame(result['data'])
+    version = st.session_state['analysis_version']
+    data = analysis_frame(version, result)
+    fetched = st.session_state['analysis_contamination']
+    # Moving the slider: the anomalies at the new sensitivity, without a round trip
+    reclassify = st.session_state['analysis_key'] == analysis_key and result.get('thresholds')
+    level = contamination if reclassify and contamination != fetched else None
+    if level is not None:
+        data = reclassified_frame(version, level, data, result['thresholds'])
+        version = f"{version}|{level:g}"
     
     if data.empty:
         st.warning("No data available for the selected period after processing. Please try a longer date range.")
@@ -156,7 +340,9 @@ if 'analysis_result' in st.session_state:
     col2.metric(label="Algorithmic Action", value=action)
     col2.markdown(f":{a_color}[{action}]")
     
-    col3.metric(label="Anomalies Detect", value=result['anomalies_count'])
+    col3.metric(label="Anomalies Detect", value=int((data['anomaly'] == -1).sum()))
+    if level is not None:
+        st.caption(t['reclassified'].format(level=level, fetched=fetched))
 
     # 1. Visualization
     st.markdown("---")
@@ -165,105 +351,18 @@ if 'analysis_result' in st.session_state:
     # Tabs for visualization
     tab1, tab2 = st.tabs(["Price & Base Indicators", "Technical Momentum"])
 
+    figures = analysis_figures(version, f"RSI with Algo Signals ({t['action']})", data)
+    anomalies = data[data['anomaly'] == -1]
+
     with tab1:
-        # Create Candlestick with Bollinger Bands
-        fig = go.Figure()
-        
-        # Candles
-        fig.add_trace(go.Candlestick(
-            x=data['date'],
-            open=data['open'],
-            high=data['high'],
-            low=data['low'],
-            close=data['close'],
-            name='Price'
-        ))
-        
-        # Bollinger Bands
-        if 'bb_upper' in data.columns and 'bb_lower' in data.columns:
-            fig.add_trace(go.Scatter(x=data['date'], y=data['bb_upper'], line=dict(color='gray', width=1, dash='dash'), name='BB Upper'))
-            fig.add_trace(go.Scatter(x=data['date'], y=data['bb_lower'], line=dict(color='gray', width=1, dash='dash'), name='BB Lower', fill='tonexty', fillcolor='rgba(200,200,200,0.1)'))
-        
-        # 50d MA
-        if 'ma_50' in data.columns:
-             fig.add_trace(go.Scatter(x=data['date'], y=data['ma_50'], line=dict(color='orange', width=2), name='MA 50'))
-
-        # Add Anomalies
-        anomalies = data[data['anomaly'] == -1]
-        if not anomalies.empty:
-            fig.add_trace(go.Scatter(
-                x=anomalies['date'],
-                y=anomalies['close'],
-                mode='markers',
-                marker=dict(color='red', size=8, symbol='x'),
-                name='Anomaly'
-            ))
-        
-        fig.update_layout(xaxis_rangeslider_visible=False, height=600, title="Price Action with Bollinger Bands & MA50")
-        st.plotly_chart(fig, width='stretch')
+        # Candlesticks with MA50 and anomalies (a WebGL close line for long ranges)
+        st.plotly_chart(figures['price'], width='stretch')
 
     with tab2:
-        # RSI Chart
-        if 'rsi' in data.columns:
-            fig_rsi = go.Figure(go.Scatter(x=data['date'], y=data['rsi'], name='RSI', line=dict(color='purple')))
-            fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-            fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-            fig_rsi.update_layout(height=300, title="Relative Strength Index (RSI)")
-            st.plotly_chart(fig_rsi, width='stretch')
-
-        # MACD Chart
-        if 'macd' in data.columns:
-            fig_macd = go.Figure()
-            # Assuming 'macd' col is the Histogram or Difference for now based on features.py
-            fig_macd.add_trace(go.Bar(x=data['date'], y=data['macd'], name='MACD Hist'))
-            fig_macd.update_layout(height=300, title="MACD Histogram")
-            st.plotly_chart(fig_macd, width='stretch')
-        
-        # ADX
-        if 'adx' in data.columns:
-            fig_adx = go.Figure(go.Scatter(x=data['date'], y=data['adx'], name='ADX', line=dict(color='blue')))
-            fig_adx.add_hline(y=25, line_dash="dot", annotation_text="Strong Trend")
-            fig_adx.update_layout(height=300, title="ADX (Trend Strength)")
-            st.plotly_chart(fig_adx, width='stretch')
-            
-        # Transaction Points on Tech Charts (RSI as canvas)
-        # We can also add a dedicated "Signals" chart or overlay on RSI
-        if 'action' in data.columns:
-            # Filter buy/sell
-            buys = data[data['action'] == 'BUY']
-            sells = data[data['action'] == 'SELL']
-            
-            if 'rsi' in data.columns:
-                # Add markers to RSI chart (re-using fig_rsi if possible, but streamlits runs sequentially)
-                # We need to modify the RSI chart creation block above or add a new one. 
-                # Let's add a Plotly overlay here for Signals if we want specific visibility.
-                # Actually, best to add to the RSI figure above. simpler to just add markers here?
-                # No, fig_rsi is local to that if block. 
-                # Let's add a separate "Signals" track or just modify RSI block source?
-                pass 
-                
-            # Let's re-create the RSI chart with signals properly
-            if 'rsi' in data.columns:
-                fig_sig = go.Figure()
-                fig_sig.add_trace(go.Scatter(x=data['date'], y=data['rsi'], name='RSI', line=dict(color='purple')))
-                fig_sig.add_hline(y=70, line_dash="dash", line_color="red")
-                fig_sig.add_hline(y=30, line_dash="dash", line_color="green")
-                
-                # Add Buy markers
-                if not buys.empty:
-                    fig_sig.add_trace(go.Scatter(
-                        x=buys['date'], y=buys['rsi'], mode='markers', 
-                        marker=dict(color='green', size=10, symbol='triangle-up'), name='Buy Signal'
-                    ))
-                # Add Sell markers
-                if not sells.empty:
-                    fig_sig.add_trace(go.Scatter(
-                        x=sells['date'], y=sells['rsi'], mode='markers', 
-                        marker=dict(color='red', size=10, symbol='triangle-down'), name='Sell Signal'
-                    ))
-                    
-                fig_sig.update_layout(height=350, title=f"RSI with Algo Signals ({t['action']})")
-                st.plotly_chart(fig_sig, width='stretch')
+        # RSI with the buy/sell signals, MACD histogram, ADX
+        for name in ('rsi', 'macd', 'adx'):
+            if name in figures:
+                st.plotly_chart(figures[name], width='stretch')
     
     # 2. LLM Analysis
     st.subheader("🤖 AI Analyst Interpretation")
@@ -283,16 +382,32 @@ if 'analysis_result' in st.session_state:
     if st.button(t['generate_pdf']):
         with st.spinner("Generating PDF..."):
             try:
-                # Filter anomalies again to send to report (simplified)
-                anomalies_json = anomalies.to_json(orient='records')
-                
-                report_payload = {
+                fallback_payload = {
                     "ticker": st.session_state['ticker'],
                     "analysis": result['llm_analysis'],
-                    "anomalies_json": anomalies_json
+                    "anomalies_json": anomalies.to_json(orient='records')
                 }
+                # The analysis is stored server-side: reference it by handle (it holds the
+                # anomalies at the fetched sensitivity, not a locally reclassified one)
+                report_payload = {"handle": result.get('handle')} if level is None else fallback_payload
+                
+                # Rendered in the background: submit, poll, then download
+                session = http_session()
+                job_res = session.post(f"{API_URL}/report/jobs", json=report_payload)
+                if job_res.status_code in (404, 422):
+                    # Handle expired: send the anomalies along instead
+                    job_res = session.post(f"{API_URL}/report/jobs", json=fallback_payload)
+                job_res.raise_for_status()
+                job_id = job_res.json()['job_id']
+                
+                status = job_res.json()['status']
+                while status in ('queued', 'running'):
+                    time.sleep(0.2)
+                    status_res = session.get(f"{API_URL}/report/jobs/{job_id}")
+                    status_res.raise_for_status()
+                    status = status_res.json()['status']
                 
-                report_res = requests.post(f"{API_URL}/report", json=report_payload)
+                report_res = session.get(f"{API_URL}/report/jobs/{job_id}/download")
                 report_res.raise_for_status()
                 
                 st.download_button(
@@ -0,0 +1,173 @@
+"""
+Plotly figures for the dashboard, kept free of Streamlit so they can be tested and timed.
+
+Long series are reduced with LTTB (Largest-Triangle-Three-Buckets) before plotting; rows
+that carry an anomaly or a buy/sell signal are always kept. Above `webgl_threshold` rows
+traces are drawn with WebGL (`Scattergl`) instead of SVG.
+"""
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Points per line trace after downsampling
+MAX_POINTS = 2000
+# Rows above which traces switch to WebGL (candles become a close line)
+WEBGL_THRESHOLD = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the `threshold` points LTTB selects (always including the first and last).
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+
+    # Inner points split into threshold - 2 buckets; each bucket is compared with the
+    # average of the next one (the last point for the final bucket)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[-1])[1:]
+    avg_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[-1])[1:]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Point of this bucket forming the largest triangle with the previous pick and that average
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(data: pd.DataFrame, column: str, max_points: int = MAX_POINTS,
+               keep: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Rows LTTB picks for `column`, plus every row where `keep` is True.
+    Frames with at most `max_points` rows are returned unchanged.
+    """
+    if len(data) <= max_points:
+        return data
+    x = pd.to_datetime(data['date']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    indices = lttb_indices(x, data[column].to_numpy(dtype=np.float64), max_points)
+    if keep is not None:
+        indices = np.union1d(indices, np.flatnonzero(keep.to_numpy()))
+    return data.iloc[indices]
+
+
+def _scatter(webgl: bool):
+    return go.Scattergl if webgl else go.Scatter
+
+
+def price_figure(data: pd.DataFrame, max_points: int = MAX_POINTS, webgl_threshold: int = WEBGL_THRESHOLD) -> go.Figure:
+    anomalies = data[data['anomaly'] == -1]
+    webgl = len(data) > webgl_threshold
+    Scatter = _scatter(webgl)
+    fig = go.Figure()
+
+    if webgl:
+        # Candlesticks have no WebGL version: draw the (downsampled) close instead
+        line = downsample(data, 'close', max_points, keep=data['anomaly'] == -1)
+        fig.add_trace(Scatter(x=line['date'], y=line['close'], line=dict(color='#1f77b4', width=1), name='Close'))
+    else:
+        line = data
+        fig.add_trace(go.Candlestick(
+            x=data['date'],
+            open=data['open'],
+            high=data['high'],
+            low=data['low'],
+            close=data['close'],
+            name='Price'
+        ))
+
+    # Bollinger Bands
+    if 'bb_upper' in data.columns and 'bb_lower' in data.columns:
+        fig.add_trace(Scatter(x=line['date'], y=line['bb_upper'], line=dict(color='gray', width=1, dash='dash'), name='BB Upper'))
+        fig.add_trace(Scatter(x=line['date'], y=line['bb_lower'], line=dict(color='gray', width=1, dash='dash'), name='BB Lower', fill='tonexty', fillcolor='rgba(200,200,200,0.1)'))
+
+    # 50d MA
+    if 'ma_50' in data.columns:
+        fig.add_trace(Scatter(x=line['date'], y=line['ma_50'], line=dict(color='orange', width=2), name='MA 50'))
+
+    # Anomalies (never downsampled)
+    if not anomalies.empty:
+        fig.add_trace(Scatter(
+            x=anomalies['date'],
+            y=anomalies['close'],
+            mode='markers',
+            marker=dict(color='red', size=8, symbol='x'),
+            name='Anomaly'
+        ))
+
+    fig.update_layout(xaxis_rangeslider_visible=False, height=600, title="Price Action with Bollinger Bands & MA50")
+    return fig
+
+
+def rsi_figure(data: pd.DataFrame, title: str, max_points: int = MAX_POINTS, webgl_threshold: int = WEBGL_THRESHOLD) -> go.Figure:
+    """
+    RSI with the 30/70 bands and the buy/sell signals as markers (one figure).
+    """
+    Scatter = _scatter(len(data) > webgl_threshold)
+    signals = data['action'].isin(['BUY', 'SELL']) if 'action' in data.columns else None
+    line = downsample(data, 'rsi', max_points, keep=signals)
+
+    fig = go.Figure(Scatter(x=line['date'], y=line['rsi'], name='RSI', line=dict(color='purple')))
+    fig.add_hline(y=70, line_dash="dash", line_color="red")
+    fig.add_hline(y=30, line_dash="dash", line_color="green")
+
+    if signals is not None:
+        buys = data[data['action'] == 'BUY']
+        sells = data[data['action'] == 'SELL']
+        if not buys.empty:
+            fig.add_trace(Scatter(
+                x=buys['date'], y=buys['rsi'], mode='markers',
+                marker=dict(color='green', size=10, symbol='triangle-up'), name='Buy Signal'
+            ))
+        if not sells.empty:
+            fig.add_trace(Scatter(
+                x=sells['date'], y=sells['rsi'], mode='markers',
+                marker=dict(color='red', size=10, symbol='triangle-down'), name='Sell Signal'
+            ))
+
+    fig.update_layout(height=350, title=title)
+    return fig
+
+
+def macd_figure(data: pd.DataFrame, max_points: int = MAX_POINTS, webgl_threshold: int = WEBGL_THRESHOLD) -> go.Figure:
+    fig = go.Figure()
+    if len(data) > webgl_threshold:
+        # Thousands of SVG bars are the slowest trace to draw: filled WebGL line instead
+        line = downsample(data, 'macd', max_points)
+        fig.add_trace(go.Scattergl(x=line['date'], y=line['macd'], fill='tozeroy', name='MACD Hist'))
+    else:
+        fig.add_trace(go.Bar(x=data['date'], y=data['macd'], name='MACD Hist'))
+    fig.update_layout(height=300, title="MACD Histogram")
+    return fig
+
+
+def adx_figure(data: pd.DataFrame, max_points: int = MAX_POINTS, webgl_threshold: int = WEBGL_THRESHOLD) -> go.Figure:
+    line = downsample(data, 'adx', max_points)
+    fig = go.Figure(_scatter(len(data) > webgl_threshold)(x=line['date'], y=line['adx'], name='ADX', line=dict(color='blue')))
+    fig.add_hline(y=25, line_dash="dot", annotation_text="Strong Trend")
+    fig.update_layout(height=300, title="ADX (Trend Strength)")
+    return fig
+
+
+def build_figures(data: pd.DataFrame, rsi_title: str, max_points: int = MAX_POINTS,
+                  webgl_threshold: int = WEBGL_THRESHOLD) -> Dict[str, go.Figure]:
+    """
+    Every dashboard figure for one analysis: 'price', and 'rsi', 'macd', 'adx' when present.
+    """
+    figures = {'price': price_figure(data, max_points, webgl_threshold)}
+    if 'rsi' in data.columns:
+        figures['rsi'] = rsi_figure(data, rsi_title, max_points, webgl_threshold)
+    if 'macd' in data.columns:
+        figures['macd'] = macd_figure(data, max_points, webgl_threshold)
+    if 'adx' in data.columns:
+        figures['adx'] = adx_figure(data, max_points, webgl_threshold)
+    return figures
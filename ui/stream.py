@@ -0,0 +1,102 @@
+"""
+Client side of /api/analyze/stream, kept free of Streamlit so it can be tested.
+
+`iter_events` turns the response lines (NDJSON or Server-Sent Events) into
+(event, payload) pairs; `StreamedAnalysis` collects them into the same result a
+columnar /api/analyze response gives.
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+
+
+class StreamError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def iter_events(lines: Iterable, protocol: str = 'ndjson') -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parses response lines (bytes or str, without line endings) into (event, payload).
+    """
+    name, data = None, []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if protocol == 'ndjson':
+            if line.strip():
+                payload = json.loads(line)
+                yield payload.pop('event'), payload
+            continue
+        # SSE: fields until a blank line ends the event
+        if not line:
+            if name is not None:
+                yield name, json.loads('\n'.join(data))
+            name, data = None, []
+        elif line.startswith('event:'):
+            name = line[len('event:'):].strip()
+        elif line.startswith('data:'):
+            data.append(line[len('data:'):].strip())
+
+
+class StreamedAnalysis:
+    """
+    Accumulates the events of one streamed analysis.
+    """
+
+    def __init__(self):
+        self.meta: Dict[str, Any] = {}
+        self.stage: Optional[str] = None
+        self.total: Optional[int] = None
+        self.summary: Optional[Dict[str, Any]] = None
+        self._chunks: List[Dict[str, list]] = []
+        self.rows = 0
+
+    def feed(self, event: str, payload: Dict[str, Any]) -> None:
+        if event == 'meta':
+            self.meta = payload
+        elif event == 'progress':
+            self.stage = payload['stage']
+        elif event == 'rows':
+            self.total = payload['total']
+            self._chunks.append(payload['data'])
+            self.rows += len(next(iter(payload['data'].values()), []))
+        elif event == 'summary':
+            self.summary = payload
+        elif event == 'error':
+            raise StreamError(payload['status_code'], payload['detail'])
+
+    @property
+    def done(self) -> bool:
+        return self.summary is not None
+
+    def progress(self) -> float:
+        """
+        Share of the rows received (0 until the first chunk arrives).
+        """
+        if self.done:
+            return 1.0
+        return self.rows / self.total if self.total else 0.0
+
+    def columns(self) -> Dict[str, list]:
+        # Chunks are joined per column only when asked for, not on every event
+        if len(self._chunks) > 1:
+            joined = {col: [v for chunk in self._chunks for v in chunk[col]] for col in self._chunks[0]}
+            self._chunks = [joined]
+        return self._chunks[0] if self._chunks else {}
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns())
+
+    def result(self) -> Dict[str, Any]:
+        """
+        The analysis in the shape of a columnar /api/analyze response.
+        """
+        if not self.done:
+            raise StreamError(0, "Stream ended before the summary.")
+        result = {k: v for k, v in self.summary.items() if k != 'rows'}
+        result['format'] = 'columnar'
+        result['data'] = self.columns()
+        return result